@@ -1,6 +1,7 @@
 # app/algorithm.py
 from __future__ import annotations
 
+from bisect import bisect_left
 from dataclasses import dataclass, field
 from typing import List, Dict, Iterable, Optional, Tuple
 
@@ -70,18 +71,74 @@ def pick_best_section(
 
     def score(sec: Section) -> Tuple[int, int, str]:
         # 더 큰 점수가 앞에 오도록 (정렬에서 reverse=True)
-        by_instructor = 1 if sec.instructor in prefer else 0
-        by_dept = 1 if (prefer_dept_only and "dept-only" in sec.tags) else 0
         # tie-break: section_id 사전순
-        return (by_instructor, by_dept, sec.section_id)
+        return section_preference(sec, prefer, prefer_dept_only) + (sec.section_id,)
 
     return sorted(course.sections, key=score, reverse=True)
 
 
+def section_preference(
+    sec: Section, prefer: Iterable[str], prefer_dept_only: bool
+) -> Tuple[int, int]:
+    """(선호 교수 여부, 학과 전용 선호 여부) - 클수록 좋은 분반"""
+    by_instructor = 1 if sec.instructor in prefer else 0
+    by_dept = 1 if (prefer_dept_only and "dept-only" in sec.tags) else 0
+    return (by_instructor, by_dept)
+
+
 def no_conflict(sections: List[Section], candidate: Section) -> bool:
     return all(not s.conflicts_with(candidate) for s in sections)
 
 
+class TimeIndex:
+    """배치한 분반들의 요일별 시간 구간 인덱스 (분 단위, 시작 시각 순 정렬).
+    구간끼리 겹치지 않게 유지하므로 끝 시각도 정렬되어 있고,
+    겹침 확인은 TimeSlot마다 bisect 한 번 (O(log n)). add/remove로 되돌리기 가능."""
+
+    def __init__(self):
+        self._starts: Dict[str, List[int]] = {}
+        self._ends: Dict[str, List[int]] = {}
+
+    def _overlaps(self, t: TimeSlot) -> bool:
+        starts = self._starts.get(t.day)
+        if not starts:
+            return False
+        # t.end_min 전에 시작하는 구간 중 가장 늦게 끝나는 것 = 바로 앞 구간
+        i = bisect_left(starts, t.end_min)
+        return i > 0 and self._ends[t.day][i - 1] > t.start_min
+
+    def conflicts(self, sec: Section) -> bool:
+        return any(self._overlaps(t) for t in sec.times)
+
+    def add(self, sec: Section):
+        """sec의 시간을 추가. 이미 있는 구간과 겹치면 ValueError"""
+        if self.conflicts(sec):
+            raise ValueError(f"section {sec.section_id} overlaps the index")
+        for t in sec.times:
+            starts = self._starts.setdefault(t.day, [])
+            ends = self._ends.setdefault(t.day, [])
+            i = bisect_left(starts, t.start_min)
+            starts.insert(i, t.start_min)
+            ends.insert(i, t.end_min)
+
+    def remove(self, sec: Section):
+        """add(sec)를 되돌림. sec의 시간이 인덱스에 없으면 ValueError"""
+        for t in sec.times:
+            starts = self._starts.get(t.day, [])
+            ends = self._ends.get(t.day, [])
+            i = bisect_left(starts, t.start_min)
+            if i == len(starts) or starts[i] != t.start_min or ends[i] != t.end_min:
+                raise ValueError(f"section {sec.section_id} is not in the index")
+            del starts[i]
+            del ends[i]
+
+    def copy(self) -> "TimeIndex":
+        out = TimeIndex()
+        out._starts = {d: list(v) for d, v in self._starts.items()}
+        out._ends = {d: list(v) for d, v in self._ends.items()}
+        return out
+
+
 # ---------- Greedy recommender (데모용) ----------
 @dataclass
 class RecommendInput:
@@ -108,6 +165,7 @@ def greedy_recommend(catalog: List[Course], req: RecommendInput) -> RecommendRes
     """
     by_code = {c.code: c for c in catalog}
     picked: List[Tuple[Course, Section]] = []
+    taken = TimeIndex()
     cur_credits = 0
     reason_log = []
 
@@ -120,8 +178,9 @@ def greedy_recommend(catalog: List[Course], req: RecommendInput) -> RecommendRes
         for sec in pick_best_section(
             course, req.prefer_instructors, req.prefer_dept_only
         ):
-            if no_conflict([s for _, s in picked], sec):
+            if not taken.conflicts(sec):
                 picked.append((course, sec))
+                taken.add(sec)
                 cur_credits += course.credits
                 reason_log.append(f"[ADD] 필수 {course.name} ({sec.section_id})")
                 break
@@ -129,14 +188,8 @@ def greedy_recommend(catalog: List[Course], req: RecommendInput) -> RecommendRes
             reason_log.append(f"[FAIL] 필수 '{course.name}' 시간 충돌로 미배치")
 
     # 2) 선택 과목(카테고리 우선 순서를 주고 싶으면 여기서 정렬/가중치 추가)
-    remain_codes: List[str] = []
-    for _, codes in req.selected_courses.items():
-        for code in codes:
-            if code not in req.major_required:
-                remain_codes.append(code)
-
     # 중복 제거, 존재하는 것만
-    remain_codes = [c for c in dict.fromkeys(remain_codes) if c in by_code]
+    remain_codes = _recommend_codes(by_code, req)
 
     for code in remain_codes:
         if cur_credits >= req.target_credits:
@@ -145,8 +198,9 @@ def greedy_recommend(catalog: List[Course], req: RecommendInput) -> RecommendRes
         for sec in pick_best_section(
             course, req.prefer_instructors, req.prefer_dept_only
         ):
-            if no_conflict([s for _, s in picked], sec):
+            if not taken.conflicts(sec):
                 picked.append((course, sec))
+                taken.add(sec)
                 cur_credits += course.credits
                 reason_log.append(f"[ADD] 선택 {course.name} ({sec.section_id})")
                 break
@@ -158,6 +212,105 @@ def greedy_recommend(catalog: List[Course], req: RecommendInput) -> RecommendRes
     )
 
 
+def _recommend_codes(by_code: Dict[str, Course], req: RecommendInput) -> List[str]:
+    """greedy_recommend와 같은 선택 과목 순서 (필수 제외, 중복 제거, 카탈로그에 있는 것만)"""
+    remain_codes: List[str] = []
+    for _, codes in req.selected_courses.items():
+        for code in codes:
+            if code not in req.major_required:
+                remain_codes.append(code)
+    return [c for c in dict.fromkeys(remain_codes) if c in by_code]
+
+
+def beam_recommend(
+    catalog: List[Course], req: RecommendInput, beam_width: int = 8, k: int = 3
+) -> List[RecommendResult]:
+    """greedy_recommend의 빔 탐색 버전: 과목마다 (분반 하나 또는 건너뜀)으로 펼친
+    부분 시간표 중 점수 상위 beam_width개만 유지하고, 최종 상위 k개를 반환.
+    앞에서 고른 분반 때문에 뒤의 필수 과목이 막히는 경우를 피할 수 있다.
+
+    점수 (클수록 좋음, 사전순): (배치한 필수 과목 수, 목표까지 채운 학점,
+    -목표 초과 학점, 선호 교수 분반 수, 학과 전용 분반 수).
+    greedy와 같이 목표 학점을 채운 뒤에는 선택 과목을 더 넣지 않는다.
+    비용: 과목 수 * beam_width * 분반 수"""
+    by_code = {c.code: c for c in catalog}
+    prefer = set(req.prefer_instructors or [])
+    target = req.target_credits
+
+    # 상태: (picked, credits, 필수 배치 수, 선호 점수 합, log, 시간 인덱스)
+    State = Tuple[
+        List[Tuple[Course, Section]], int, int, Tuple[int, int], List[str], TimeIndex
+    ]
+
+    def score(st: State) -> Tuple[int, int, int, int, int]:
+        _, credits, required, pref, _, _ = st
+        return (
+            required,
+            min(credits, target),
+            -max(0, credits - target),
+            pref[0],
+            pref[1],
+        )
+
+    def expand(
+        beam: List[State], course: Course, is_required: bool, kind: str
+    ) -> List[State]:
+        nxt: List[State] = []
+        for st in beam:
+            picked, credits, required, pref, log, taken = st
+            if not is_required and credits >= target:
+                nxt.append(st)
+                continue
+            placed = False
+            for sec in pick_best_section(
+                course, req.prefer_instructors, req.prefer_dept_only
+            ):
+                if taken.conflicts(sec):
+                    continue
+                placed = True
+                sp = section_preference(sec, prefer, req.prefer_dept_only)
+                # 자식 상태마다 인덱스 사본 (빔 폭만큼만 살아남음)
+                child = taken.copy()
+                child.add(sec)
+                nxt.append(
+                    (
+                        picked + [(course, sec)],
+                        credits + course.credits,
+                        required + (1 if is_required else 0),
+                        (pref[0] + sp[0], pref[1] + sp[1]),
+                        log + [f"[ADD] {kind} {course.name} ({sec.section_id})"],
+                        child,
+                    )
+                )
+            if is_required:
+                # 필수는 건너뛰면 실패로 기록 (다른 분반 조합이 있으면 점수에서 밀림)
+                if not placed:
+                    log = log + [f"[FAIL] 필수 '{course.name}' 시간 충돌로 미배치"]
+                nxt.append((picked, credits, required, pref, log, taken))
+            else:
+                nxt.append(st)
+        # sorted는 안정 정렬이라 점수가 같으면 greedy 순서(선호 분반, 먼저 펼친 상태)가 앞
+        return sorted(nxt, key=score, reverse=True)[:beam_width]
+
+    beam: List[State] = [([], 0, 0, (0, 0), [], TimeIndex())]
+    for code in req.major_required:
+        course = by_code.get(code)
+        if not course:
+            beam = [
+                (p, c, r, pr, log + [f"[SKIP] 필수 '{code}'가 카탈로그에 없음"], t)
+                for p, c, r, pr, log, t in beam
+            ]
+            continue
+        beam = expand(beam, course, True, "필수")
+    for code in _recommend_codes(by_code, req):
+        beam = expand(beam, by_code[code], False, "선택")
+
+    return [
+        RecommendResult(picked=picked, total_credits=credits, reason="\n".join(log))
+        for picked, credits, _, _, log, _ in beam[:k]
+    ]
+
+
 # ---------- For template (시간표 그리기용) ----------
 def to_calendar_blocks(
     sections: List[Section],
@@ -669,10 +822,39 @@ def package_for_template(items: _List[_Dict[str, _Any]]) -> _List[_Dict[str, _An
 
 # ====== planner 상수에서 추가된 함수들 ======
 # planner 상수의 복잡한 추천 로직을 위한 함수들
+import ctypes as _ctypes
 import json as _json_module
+from ctypes import util as _ctypes_util
 from pathlib import Path as _Path_module
 import re as _re_module
-from typing import Any, Set
+import hashlib as _hashlib
+import heapq as _heapq
+import logging as _logging
+import math as _math
+import mmap as _mmap
+import multiprocessing as _multiprocessing
+import random as _random
+import select as _select
+import struct as _struct
+import sys as _sys
+import queue as _queue
+import threading as _threading
+import time as _time
+import unicodedata as _unicodedata
+from collections import OrderedDict as _OrderedDict
+from collections.abc import Mapping as _Mapping
+from dataclasses import asdict as _dc_asdict, fields as _dc_fields
+from dataclasses import replace as _dc_replace
+from concurrent.futures import (
+    ProcessPoolExecutor as _ProcessPoolExecutor,
+    wait as _futures_wait,
+)
+from concurrent.futures.process import BrokenProcessPool as _BrokenProcessPool
+from typing import Any, Callable, Iterator, Set
+
+import numpy as _np
+
+_log = _logging.getLogger(__name__)
 
 # 경로 상수 (planner 상수 방식)
 _DATA_DIR = _Path_module(__file__).resolve().parents[1] / "data"
@@ -682,9 +864,12 @@ _COMMON_DIR_PLANNER = _DATA_DIR / "common_subjects_json"
 
 
 # planner 상수 방식의 Section 클래스 (기존 Section과 구분)
-@dataclass
+@dataclass(eq=False, slots=True)
 class SectionFromFile:
-    """planner 상수 방식의 Section 클래스 (JSON 파일에서 로드)"""
+    """planner 상수 방식의 Section 클래스 (JSON 파일에서 로드)
+
+    __slots__ 레코드. load_section은 문자열을 intern하고 같은 강의시간 문자열의
+    meetings/mask를 공유한다. sid는 file_id별 정수 id로, 같음/해시 비교에 쓰인다."""
 
     file_id: str
     course_id: str
@@ -701,15 +886,75 @@ class SectionFromFile:
     etc_pct: float
     time_raw: str
     is_web: bool
-    meetings: List[Tuple[int, int, int, str]] = field(
-        default_factory=list
-    )  # (day, start_slot, end_slot, room)
+    meetings: Tuple[
+        Tuple[int, int, int, str], ...
+    ] = ()  # (day, start_slot, end_slot, room)
+    # 주간 점유 비트마스크 (요일 × 30분 슬롯). 웹강의는 0 (충돌 없음)
+    mask: int = field(default=0, repr=False)
+    sid: int = field(default=-1, repr=False)
+
+    def __post_init__(self):
+        if not isinstance(self.meetings, tuple):
+            self.meetings = tuple(self.meetings)
+        if self.sid < 0:
+            self.sid = section_id(self.file_id)
+        if not self.mask and not self.is_web:
+            self.mask = _meetings_to_mask(self.meetings)
+
+    def __eq__(self, other):
+        if not isinstance(other, SectionFromFile):
+            return NotImplemented
+        return self.sid == other.sid
+
+    def __hash__(self):
+        return self.sid
+
+
+# file_id -> 정수 section id (프로세스 안에서 고정, 처음 본 순서대로 부여)
+_SECTION_IDS: Dict[str, int] = {}
+_SECTION_IDS_LOCK = _threading.Lock()
+
+
+def section_id(file_id: str) -> int:
+    sid = _SECTION_IDS.get(file_id)
+    if sid is None:
+        with _SECTION_IDS_LOCK:
+            sid = _SECTION_IDS.setdefault(file_id, len(_SECTION_IDS))
+    return sid
 
 
 # planner 상수 방식의 DAY_MAP
 _DAY_MAP = {"월": 0, "화": 1, "수": 2, "목": 3, "금": 4, "토": 5}
 _SLOT_START_HOUR = 9  # 1=09:00-09:30
 _SLOT_MIN = 30  # minutes per slot
+_SLOTS_PER_DAY = 30  # 09:00 ~ 24:00, 요일당 비트 수
+
+
+def time_window_mask(
+    blocked: Iterable[Tuple[int, int, int]] = (), free_days: Iterable[int] = ()
+) -> int:
+    """제외할 시간대 -> 주간 비트마스크 (generate_schedules의 blocked_mask).
+    blocked: (요일, 시작 슬롯, 끝 슬롯(미포함)), free_days: 수업이 없어야 하는 요일"""
+    mask = _meetings_to_mask([(day, start, end, "") for day, start, end in blocked])
+    for day in free_days:
+        mask |= ((1 << _SLOTS_PER_DAY) - 1) << (day * _SLOTS_PER_DAY)
+    return mask
+
+
+def _meetings_to_mask(meetings: List[Tuple[int, int, int, str]]) -> int:
+    """meetings -> 주간 비트마스크 (bit = day * _SLOTS_PER_DAY + slot - 1)"""
+    mask = 0
+    for day, start, end, _ in meetings:
+        start = max(start, 1)
+        end = min(end, _SLOTS_PER_DAY + 1)
+        if end <= start:
+            continue
+        mask |= ((1 << (end - start)) - 1) << (day * _SLOTS_PER_DAY + start - 1)
+    return mask
+
+
+# 평가 비율 값은 종류가 몇 개 안 되므로 같은 float 객체를 공유
+_FLOAT_INTERN: Dict[float, float] = {}
 
 
 def _safe_float_planner(x: Any) -> float:
@@ -717,9 +962,10 @@ def _safe_float_planner(x: Any) -> float:
     try:
         if isinstance(x, str):
             x = x.strip().replace("%", "").replace(" ", "")
-        return float(x)
+        x = float(x)
     except Exception:
-        return 0.0
+        x = 0.0
+    return _FLOAT_INTERN.setdefault(x, x)
 
 
 def _safe_int_credits_planner(x: Any) -> int:
@@ -734,11 +980,6 @@ def _safe_int_credits_planner(x: Any) -> int:
         return 0
 
 
-def _iter_subject_files_for_planner(course_id: str) -> List[_Path_module]:
-    """planner 상수 방식의 파일 반복"""
-    return sorted(_SUBJECT_DIR_PLANNER.glob(f"{course_id}*.json"))
-
-
 def _parse_time_slots_planner(
     time_text: str,
 ) -> Tuple[bool, List[Tuple[int, int, int, str]]]:
@@ -783,17 +1024,38 @@ def _parse_time_slots_planner(
     return False, meetings
 
 
-def load_section(file_path: _Path_module) -> Optional[SectionFromFile]:
-    """planner 상수 방식의 load_section"""
+# 강의시간 문자열 -> (is_web, meetings, mask). 같은 시간 문자열의 분반들이 공유
+_TIME_PARSE_CACHE: Dict[
+    str, Tuple[bool, Tuple[Tuple[int, int, int, str], ...], int]
+] = {}
+
+
+def _parse_time_cached_planner(
+    time_raw: str,
+) -> Tuple[bool, Tuple[Tuple[int, int, int, str], ...], int]:
+    hit = _TIME_PARSE_CACHE.get(time_raw)
+    if hit is None:
+        is_web, meetings = _parse_time_slots_planner(time_raw)
+        meetings = tuple(
+            (day, start, end, _sys.intern(room)) for day, start, end, room in meetings
+        )
+        hit = (is_web, meetings, 0 if is_web else _meetings_to_mask(meetings))
+        _TIME_PARSE_CACHE[_sys.intern(time_raw)] = hit
+    return hit
+
+
+def _parse_section_file(file_path: _Path_module) -> Optional[SectionFromFile]:
+    """subject_json 파일 하나를 SectionFromFile로 파싱. 읽을 수 없으면 None"""
     try:
         d = _json_module.loads(file_path.read_text(encoding="utf-8"))
     except Exception:
         return None
-    course_name = d.get("강의명", "")
-    prof = d.get("교수명", "")
+    intern = _sys.intern
+    course_name = intern(str(d.get("강의명", "")))
+    prof = intern(str(d.get("교수명", "")))
     credit = _safe_int_credits_planner(d.get("학점", 0))
-    time_raw = d.get("강의시간", "") or ""
-    eval_type = d.get("평가방식", "전체")
+    time_raw = intern(str(d.get("강의시간", "") or ""))
+    eval_type = intern(str(d.get("평가방식", "전체")))
 
     mid = _safe_float_planner(d.get("중간고사", 0))
     final = _safe_float_planner(d.get("기말고사", 0))
@@ -803,8 +1065,8 @@ def load_section(file_path: _Path_module) -> Optional[SectionFromFile]:
     discuss = _safe_float_planner(d.get("토론", 0))
     etc = _safe_float_planner(d.get("기타", 0))
 
-    is_web, meetings = _parse_time_slots_planner(time_raw)
-    course_id = file_path.name.split(".")[0]
+    is_web, meetings, mask = _parse_time_cached_planner(time_raw)
+    course_id = intern(file_path.name.split(".")[0])
 
     return SectionFromFile(
         file_id=file_path.name,
@@ -823,23 +1085,607 @@ def load_section(file_path: _Path_module) -> Optional[SectionFromFile]:
         time_raw=time_raw,
         is_web=is_web,
         meetings=meetings,
+        mask=mask,
+    )
+
+
+# ---------- 분반 카탈로그 (메모리) ----------
+class SectionCatalog:
+    """subject_json 전체를 한 번 파싱한 스냅샷.
+    by_file: {file_id: 분반}, by_course: {course_id: [분반] (file_id 순)}
+    bundle: 카탈로그 번들에서 읽었으면 그 번들 (depart/common JSON도 번들에서 읽음)
+    curriculum: 학과 커리큘럼 (학기, 종류) 색인 (설치할 때 만듦, CurriculumIndex)
+    common: 교양 과목 색인 (설치할 때 만듦, CommonSubjects)"""
+
+    def __init__(self, sections: Iterable[SectionFromFile], version: int):
+        self.version = version
+        self.bundle: Optional[_CatalogBundle] = None
+        self.curriculum: Optional[CurriculumIndex] = None
+        self.common: Optional[CommonSubjects] = None
+        self.by_file: _Mapping = {}
+        self.by_course: _Mapping = {}
+        for sec in sorted(sections, key=lambda x: x.file_id):
+            self.by_file[sec.file_id] = sec
+            self.by_course.setdefault(sec.course_id, []).append(sec)
+        # 학수번호 접두사 조회용 (예전 glob f"{course_id}*.json"과 같은 결과)
+        self._course_ids = sorted(self.by_course)
+
+    @classmethod
+    def from_bundle(cls, bundle: "_CatalogBundle") -> "SectionCatalog":
+        """번들 기반 카탈로그. 분반 객체는 처음 조회할 때 만든다"""
+        catalog = cls((), bundle.versions[0])
+        catalog.bundle = bundle
+        catalog.by_file = bundle.by_file
+        catalog.by_course = bundle.by_course
+        catalog._course_ids = sorted(bundle.by_course)
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self.by_file)
+
+    def sections_with_prefix(self, prefix: str) -> List[SectionFromFile]:
+        out: List[SectionFromFile] = []
+        i = bisect_left(self._course_ids, prefix)
+        while i < len(self._course_ids) and self._course_ids[i].startswith(prefix):
+            out.extend(self.by_course[self._course_ids[i]])
+            i += 1
+        return sorted(out, key=lambda x: x.file_id)
+
+
+_CATALOG: Optional[SectionCatalog] = None
+_CATALOG_LOCK = _threading.Lock()
+
+
+# ---------- 카탈로그 번들 (scripts/build_catalog_bundle.py로 생성) ----------
+# subject_json/depart_json/common_subjects_json을 파일 하나로 묶은 것. 읽기 전용 mmap이라
+# worker 프로세스들이 OS 페이지 캐시를 공유하고, 시작할 때 JSON 수백 개를 읽지 않는다.
+#   헤더 | 문자열 오프셋 표 (u32 * (문자열 수 + 1)) | 문자열 풀 (UTF-8, 중복 제거)
+#   | 분반 표 (고정 길이 레코드, file_id 순) | 문서 표 ((이름, 오프셋, 길이) * 문서 수) | 문서 바이트
+_BUNDLE_PATH = _DATA_DIR / "catalog.bundle"
+_BUNDLE_MAGIC = b"CBN1"
+# magic, 분반 수, 문자열 수, 문서 수, 오프셋 표/풀/분반 표/문서 표 위치, 데이터 버전 3개
+_BUNDLE_HEADER = _struct.Struct("<4sIIIQQQQqqq")
+# file_id, course_id, 강의명, 교수명, 평가방식, 강의시간 (문자열 번호), 학점,
+# 과제/퀴즈/중간/기말/출석/토론/기타 비율
+_BUNDLE_SECTION = _struct.Struct("<6Ii7d")
+_BUNDLE_DOC = _struct.Struct("<IQQ")
+# 번들에 넣는 JSON 문서 디렉토리 (data/ 기준 상대 경로로 저장)
+_BUNDLE_DOC_DIRS = (_DEPART_PATH_PLANNER.parent, _COMMON_DIR_PLANNER)
+
+
+def _dir_fingerprint(directory: _Path_module) -> int:
+    """directory/*.json 파일별 (이름, mtime_ns, 크기)를 해시한 64비트 버전 (없으면 0).
+    디렉토리 mtime은 파일 내용만 고쳐 저장하면 그대로라서 파일마다 본다"""
+    try:
+        with _os.scandir(directory) as it:
+            entries = sorted(
+                (e.name, e.stat().st_mtime_ns, e.stat().st_size)
+                for e in it
+                if e.name.endswith(".json") and not e.name.startswith(".")
+            )
+    except OSError:
+        return 0
+    h = _hashlib.blake2b(digest_size=8)
+    for name, mtime, size in entries:
+        h.update(f"{name}\0{mtime}\0{size}\n".encode("utf-8"))
+    return int.from_bytes(h.digest(), "little", signed=True)
+
+
+def _data_versions() -> Tuple[int, int, int]:
+    """(subject_json, depart_json, common_subjects_json) 버전 (_dir_fingerprint)"""
+    return tuple(
+        _dir_fingerprint(d) for d in (_SUBJECT_DIR_PLANNER,) + _BUNDLE_DOC_DIRS
+    )
+
+
+class _BundleSections(_Mapping):
+    """번들의 file_id -> 분반. 처음 조회할 때 레코드에서 SectionFromFile을 만들어 보관"""
+
+    def __init__(self, bundle: "_CatalogBundle", rows: Dict[str, int]):
+        self._bundle = bundle
+        self._rows = rows
+        self._made: Dict[str, SectionFromFile] = {}
+
+    def __getitem__(self, file_id: str) -> SectionFromFile:
+        sec = self._made.get(file_id)
+        if sec is None:
+            sec = self._bundle.section(self._rows[file_id])
+            self._made[file_id] = sec
+        return sec
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+class _BundleCourses(_Mapping):
+    """번들의 course_id -> [분반]. 같은 과목의 레코드는 file_id 순으로 연속"""
+
+    def __init__(self, by_file: _BundleSections, ranges: Dict[str, Tuple[int, int]]):
+        self._by_file = by_file
+        self._ranges = ranges
+
+    def __getitem__(self, course_id: str) -> List[SectionFromFile]:
+        start, end = self._ranges[course_id]
+        fids = self._by_file._bundle.file_ids
+        return [self._by_file[fids[i]] for i in range(start, end)]
+
+    def __iter__(self):
+        return iter(self._ranges)
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+
+class _CatalogBundle:
+    """카탈로그 번들 파일 (읽기 전용 mmap)"""
+
+    def __init__(self, path: _Path_module):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ)
+        (
+            magic,
+            n_sections,
+            n_strings,
+            n_docs,
+            offsets_at,
+            pool_at,
+            sections_at,
+            docs_at,
+            *versions,
+        ) = _BUNDLE_HEADER.unpack_from(self._mm, 0)
+        if magic != _BUNDLE_MAGIC:
+            raise ValueError(f"not a catalog bundle: {path}")
+        self.versions = tuple(versions)
+        view = memoryview(self._mm)
+        self._offsets = view[offsets_at : offsets_at + 4 * (n_strings + 1)].cast("I")
+        self._pool_at = pool_at
+        self._sections_at = sections_at
+        self._strings: Dict[int, str] = {}
+
+        # file_id/course_id 색인만 미리 만듦 (나머지 필드는 조회할 때 읽음)
+        self.file_ids: List[str] = []
+        ranges: Dict[str, Tuple[int, int]] = {}
+        for row in range(n_sections):
+            fid_i, cid_i = _struct.unpack_from(
+                "<2I", self._mm, sections_at + row * _BUNDLE_SECTION.size
+            )
+            self.file_ids.append(self.string(fid_i))
+            cid = self.string(cid_i)
+            start = ranges.get(cid, (row, row))[0]
+            ranges[cid] = (start, row + 1)
+        self.by_file = _BundleSections(
+            self, {fid: i for i, fid in enumerate(self.file_ids)}
+        )
+        self.by_course = _BundleCourses(self.by_file, ranges)
+
+        self.docs: Dict[str, Tuple[int, int]] = {}
+        for i in range(n_docs):
+            name_i, at, size = _BUNDLE_DOC.unpack_from(
+                self._mm, docs_at + i * _BUNDLE_DOC.size
+            )
+            self.docs[self.string(name_i)] = (at, size)
+
+    def string(self, i: int) -> str:
+        s = self._strings.get(i)
+        if s is None:
+            a, b = self._offsets[i], self._offsets[i + 1]
+            raw = self._mm[self._pool_at + a : self._pool_at + b]
+            s = _sys.intern(raw.decode("utf-8"))
+            self._strings[i] = s
+        return s
+
+    def section(self, row: int) -> SectionFromFile:
+        rec = _BUNDLE_SECTION.unpack_from(
+            self._mm, self._sections_at + row * _BUNDLE_SECTION.size
+        )
+        fid, cid, name, prof, eval_type, time_raw = (self.string(i) for i in rec[:6])
+        credit = rec[6]
+        assign, quiz, mid, final, attend, discuss, etc = (
+            _safe_float_planner(x) for x in rec[7:]
+        )
+        is_web, meetings, mask = _parse_time_cached_planner(time_raw)
+        return SectionFromFile(
+            file_id=fid,
+            course_id=cid,
+            course_name=name,
+            prof=prof,
+            credit=credit,
+            eval_type=eval_type,
+            assign_pct=assign,
+            quiz_pct=quiz,
+            mid_pct=mid,
+            final_pct=final,
+            attend_pct=attend,
+            discuss_pct=discuss,
+            etc_pct=etc,
+            time_raw=time_raw,
+            is_web=is_web,
+            meetings=meetings,
+            mask=mask,
+        )
+
+    def doc(self, name: str) -> Optional[bytes]:
+        """data/ 기준 상대 경로의 문서 바이트. 없으면 None"""
+        hit = self.docs.get(name)
+        if hit is None:
+            return None
+        at, size = hit
+        return self._mm[at : at + size]
+
+
+def write_catalog_bundle(path: Optional[_Path_module] = None) -> int:
+    """현재 데이터 디렉토리로 카탈로그 번들을 만들어 저장. 분반 수를 반환"""
+    path = path or _BUNDLE_PATH
+    versions = _data_versions()
+    sections = sorted(build_catalog().by_file.values(), key=lambda x: x.file_id)
+    strings: Dict[str, int] = {}
+
+    def sid(text: str) -> int:
+        i = strings.get(text)
+        if i is None:
+            i = strings[text] = len(strings)
+        return i
+
+    records = b"".join(
+        _BUNDLE_SECTION.pack(
+            sid(s.file_id),
+            sid(s.course_id),
+            sid(s.course_name),
+            sid(s.prof),
+            sid(s.eval_type),
+            sid(s.time_raw),
+            s.credit,
+            s.assign_pct,
+            s.quiz_pct,
+            s.mid_pct,
+            s.final_pct,
+            s.attend_pct,
+            s.discuss_pct,
+            s.etc_pct,
+        )
+        for s in sections
     )
+    docs: List[Tuple[int, bytes]] = []
+    for d in _BUNDLE_DOC_DIRS:
+        for p in sorted(d.glob("*.json")):
+            docs.append((sid(p.relative_to(_DATA_DIR).as_posix()), p.read_bytes()))
+
+    encoded = [text.encode("utf-8") for text in strings]
+    offsets = [0]
+    for raw in encoded:
+        offsets.append(offsets[-1] + len(raw))
+    offsets_at = _BUNDLE_HEADER.size
+    pool_at = offsets_at + 4 * len(offsets)
+    sections_at = pool_at + offsets[-1]
+    docs_at = sections_at + len(records)
+    doc_bytes_at = docs_at + _BUNDLE_DOC.size * len(docs)
+
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(
+            _BUNDLE_HEADER.pack(
+                _BUNDLE_MAGIC,
+                len(sections),
+                len(encoded),
+                len(docs),
+                offsets_at,
+                pool_at,
+                sections_at,
+                docs_at,
+                *versions,
+            )
+        )
+        f.write(_struct.pack(f"<{len(offsets)}I", *offsets))
+        f.writelines(encoded)
+        f.write(records)
+        at = doc_bytes_at
+        for name_i, raw in docs:
+            f.write(_BUNDLE_DOC.pack(name_i, at, len(raw)))
+            at += len(raw)
+        f.writelines(raw for _, raw in docs)
+    _os.replace(tmp, path)
+    return len(sections)
+
+
+def _open_bundle(path: Optional[_Path_module] = None) -> Optional[_CatalogBundle]:
+    """번들이 있고 데이터 파일들과 버전이 같으면 연다. 아니면 None (JSON에서 읽음).
+    load_catalog()가 (watcher 재로드 포함) 부를 때마다 버전을 다시 계산해 비교한다"""
+    path = path or _BUNDLE_PATH
+    if not path.exists():
+        return None
+    try:
+        bundle = _CatalogBundle(path)
+    except (OSError, ValueError, _struct.error) as e:
+        _log.warning("catalog bundle %s unreadable: %s", path, e)
+        return None
+    if bundle.versions != _data_versions():
+        _log.warning("catalog bundle %s is stale, rebuild it", path)
+        return None
+    return bundle
+
+
+def _read_catalog() -> SectionCatalog:
+    bundle = _open_bundle()
+    if bundle is not None:
+        catalog = SectionCatalog.from_bundle(bundle)
+    else:
+        catalog = build_catalog()
+    catalog.curriculum = CurriculumIndex(_load_depart_from(catalog), catalog)
+    catalog.common = CommonSubjects(catalog)
+    return catalog
+
+
+def _data_file_text(
+    path: _Path_module, catalog: Optional[SectionCatalog] = None
+) -> str:
+    """data/ 아래 JSON 파일 내용. 카탈로그(기본: 현재)가 번들이면 번들에서 읽음"""
+    # 빈 카탈로그도 False가 되므로 is None으로 비교 (만드는 중에 get_catalog를 부르면 안 됨)
+    bundle = (catalog if catalog is not None else get_catalog()).bundle
+    if bundle is not None:
+        raw = bundle.doc(path.relative_to(_DATA_DIR).as_posix())
+        if raw is not None:
+            return raw.decode("utf-8")
+    return path.read_text(encoding="utf-8")
+
+
+def _data_dir_files(
+    directory: _Path_module, catalog: Optional[SectionCatalog] = None
+) -> List[_Path_module]:
+    """directory/*.json 목록 (glob 대신). 카탈로그(기본: 현재)가 번들이면 번들의 문서 목록"""
+    bundle = (catalog if catalog is not None else get_catalog()).bundle
+    if bundle is not None:
+        prefix = directory.relative_to(_DATA_DIR).as_posix() + "/"
+        return [
+            _DATA_DIR / name
+            for name in sorted(bundle.docs)
+            if name.startswith(prefix) and "/" not in name[len(prefix) :]
+        ]
+    return sorted(directory.glob("*.json"))
+
+
+def build_catalog(directory: Optional[_Path_module] = None) -> SectionCatalog:
+    """subject_json 디렉토리 전체를 파싱 (설치하지는 않음)"""
+    directory = directory or _SUBJECT_DIR_PLANNER
+    # 파일보다 먼저 읽어서, 읽는 도중 바뀌면 다음 확인 때 다른 버전이 보이게
+    version = _dir_fingerprint(directory)
+    sections = (_parse_section_file(p) for p in sorted(directory.glob("*.json")))
+    return SectionCatalog((s for s in sections if s), version)
+
+
+def load_catalog() -> SectionCatalog:
+    """카탈로그를 다시 만들어 교체하고 시간표 캐시를 비움 (서버 시작/데이터 갱신 시 호출).
+    새 카탈로그를 다 만든 뒤 참조 하나만 바꾸므로, 읽는 쪽은 잠그지 않고
+    get_catalog()로 받은 스냅샷을 끝까지 쓸 수 있다"""
+    global _CATALOG, _CONFLICT_MATRIX
+    # 동시에 다시 읽어도 나중에 시작한 것이 마지막에 설치되도록 직렬화
+    with _CATALOG_LOCK:
+        catalog = _read_catalog()
+        # 충돌 비트셋은 버전이 정확히 같을 때만 유지. 새 카탈로그보다 먼저 내려야
+        # 새 분반을 옛 비트셋으로 판정하는 순간이 없다
+        matrix = _CONFLICT_MATRIX
+        stale = matrix is not None and matrix.version != catalog.version
+        if stale:
+            _CONFLICT_MATRIX = None
+        _CATALOG = catalog
+        if stale:
+            # 쓰던 비트셋이면 같은 파일에 새 카탈로그로 다시 만들어 올림
+            _CONFLICT_MATRIX = _rebuild_conflict_matrix(matrix.path, catalog)
+    invalidate_schedule_cache()
+    _log.info(
+        "section catalog loaded: %d sections%s",
+        len(catalog),
+        " (bundle)" if catalog.bundle is not None else "",
+    )
+    return catalog
+
+
+def get_catalog() -> SectionCatalog:
+    """현재 카탈로그. 아직 없으면 처음 한 번 만든다"""
+    global _CATALOG
+    if _CATALOG is None:
+        with _CATALOG_LOCK:
+            if _CATALOG is None:
+                _CATALOG = _read_catalog()
+    return _CATALOG
+
+
+def section_by_file_id(file_id: str) -> Optional[SectionFromFile]:
+    return get_catalog().by_file.get(file_id)
+
+
+def load_section(file_path: _Path_module) -> Optional[SectionFromFile]:
+    """planner 상수 방식의 load_section. subject_json 파일이면 카탈로그에서 가져옴"""
+    if file_path.parent == _SUBJECT_DIR_PLANNER:
+        return section_by_file_id(file_path.name)
+    return _parse_section_file(file_path)
 
 
 def sections_for_course(course_id: str) -> List[SectionFromFile]:
-    """planner 상수 방식의 sections_for_course"""
-    out: List[SectionFromFile] = []
-    for p in _iter_subject_files_for_planner(course_id):
-        s = load_section(p)
-        if s:
-            out.append(s)
-    return sorted(out, key=lambda x: x.file_id)
+    """planner 상수 방식의 sections_for_course (카탈로그에서 학수번호 접두사로 조회)"""
+    return get_catalog().sections_with_prefix(course_id)
+
+
+# ---------- 데이터 변경 감시 (hot reload) ----------
+# 감시 디렉토리. 바뀌면 load_catalog()로 다시 읽음
+_WATCH_DIRS = (
+    _SUBJECT_DIR_PLANNER,
+    _DEPART_PATH_PLANNER.parent,
+    _COMMON_DIR_PLANNER,
+)
+# mtime polling 주기 (초). inotify에서는 stop 확인 주기
+_WATCH_INTERVAL = float(_os.getenv("PLANNER_WATCH_INTERVAL", "2"))
+# 마지막 변경 후 이 시간(초) 동안 조용해야 다시 읽음 (파일 여러 개 복사 중 재로드 방지)
+_WATCH_DEBOUNCE = 1.0
+
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+# IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_IN_WATCH_MASK = 0x002 | 0x004 | 0x008 | 0x040 | 0x080 | 0x100 | 0x200
+
+
+class _InotifyWatch:
+    """Linux inotify (ctypes). 쓸 수 없는 환경이면 생성할 때 OSError"""
+
+    def __init__(self, dirs: Iterable[_Path_module]):
+        if not _sys.platform.startswith("linux"):
+            raise OSError("inotify is Linux only")
+        libc = _ctypes.CDLL(
+            _ctypes_util.find_library("c") or "libc.so.6", use_errno=True
+        )
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(_ctypes.get_errno(), "inotify_init1 failed")
+        for d in dirs:
+            if not d.is_dir():
+                continue
+            if libc.inotify_add_watch(self.fd, _os.fsencode(d), _IN_WATCH_MASK) < 0:
+                err = _ctypes.get_errno()
+                self.close()
+                raise OSError(err, f"inotify_add_watch failed: {d}")
+
+    def wait(self, timeout: float) -> bool:
+        """timeout(초) 안에 변경 이벤트가 오면 True (이벤트 내용은 읽어서 버림)"""
+        ready, _, _ = _select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        while True:
+            try:
+                if not _os.read(self.fd, 65536):
+                    break
+            except BlockingIOError:
+                break
+        return True
+
+    def close(self):
+        if self.fd >= 0:
+            _os.close(self.fd)
+            self.fd = -1
+
+
+class _PollWatch:
+    """디렉토리별 (파일명, mtime, 크기) 목록을 주기적으로 비교"""
+
+    def __init__(self, dirs: Iterable[_Path_module], stop: _threading.Event):
+        self.dirs = list(dirs)
+        self.stop = stop
+        self.state = self._scan()
+
+    def _scan(self) -> Tuple[Tuple[str, int, int], ...]:
+        out = []
+        for d in self.dirs:
+            try:
+                with _os.scandir(d) as it:
+                    for e in it:
+                        st = e.stat()
+                        out.append((e.path, st.st_mtime_ns, st.st_size))
+            except OSError:
+                continue
+        return tuple(sorted(out))
+
+    def wait(self, timeout: float) -> bool:
+        self.stop.wait(timeout)
+        state = self._scan()
+        changed = state != self.state
+        self.state = state
+        return changed
+
+    def close(self):
+        pass
+
+
+class CatalogWatcher:
+    """데이터 디렉토리가 바뀌면 백그라운드 스레드에서 load_catalog()를 다시 실행.
+    Linux에서는 inotify, 아니면 (또는 use_inotify=False) mtime polling"""
+
+    def __init__(
+        self,
+        dirs: Optional[Iterable[_Path_module]] = None,
+        interval: float = _WATCH_INTERVAL,
+        debounce: float = _WATCH_DEBOUNCE,
+        use_inotify: bool = True,
+    ):
+        self.dirs = list(dirs or _WATCH_DIRS)
+        self.interval = interval
+        self.debounce = debounce
+        self.use_inotify = use_inotify
+        self.reloads = 0
+        self._stop = _threading.Event()
+        self._thread: Optional[_threading.Thread] = None
+
+    def _open(self):
+        if self.use_inotify:
+            try:
+                return _InotifyWatch(self.dirs)
+            except (OSError, AttributeError) as e:
+                # AttributeError: libc에 inotify 함수가 없음
+                _log.info("inotify unavailable (%s), polling data dirs", e)
+        return _PollWatch(self.dirs, self._stop)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        # 감시는 스레드 시작 전에 열어야 start() 직후의 변경도 놓치지 않음
+        watch = self._open()
+        self._thread = _threading.Thread(
+            target=self._run, args=(watch,), name="catalog-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self, watch):
+        try:
+            while not self._stop.is_set():
+                if not watch.wait(self.interval):
+                    continue
+                while not self._stop.is_set() and watch.wait(self.debounce):
+                    pass
+                if self._stop.is_set():
+                    break
+                try:
+                    load_catalog()
+                    self.reloads += 1
+                except Exception:
+                    _log.exception("catalog reload failed, keeping previous catalog")
+        finally:
+            watch.close()
+
+
+_CATALOG_WATCHER: Optional[CatalogWatcher] = None
+
+
+def start_catalog_watcher(**kwargs) -> CatalogWatcher:
+    """데이터 변경 감시 시작 (서버 시작 시 호출). 이미 돌고 있으면 그대로 반환"""
+    global _CATALOG_WATCHER
+    if _CATALOG_WATCHER is None:
+        _CATALOG_WATCHER = CatalogWatcher(**kwargs)
+        _CATALOG_WATCHER.start()
+    return _CATALOG_WATCHER
+
+
+def stop_catalog_watcher():
+    global _CATALOG_WATCHER
+    if _CATALOG_WATCHER is not None:
+        _CATALOG_WATCHER.stop()
+        _CATALOG_WATCHER = None
 
 
 def load_depart() -> List[dict]:
     """학과 커리큘럼 로드"""
+    return _load_depart_from(None)
+
+
+def _load_depart_from(catalog: Optional[SectionCatalog]) -> List[dict]:
     try:
-        return _json_module.loads(_DEPART_PATH_PLANNER.read_text(encoding="utf-8"))
+        return _json_module.loads(_data_file_text(_DEPART_PATH_PLANNER, catalog))
     except Exception:
         return []
 
@@ -900,81 +1746,136 @@ def _match_isusigi(semester_token: str, isusigi: Any) -> bool:
     return want_term in terms
 
 
+# 커리큘럼 종류 -> 행 조건 (학수번호가 있는 행만)
+_CURRICULUM_KINDS: Dict[str, Callable[[dict], bool]] = {
+    "major_required": lambda d: _normalize_text_planner(d.get("종 별")) == "전공필수",
+    "major_elective": lambda d: _normalize_text_planner(d.get("종 별")) == "전공선택",
+    "basic_focus": lambda d: d.get("세부구분") in ("기초교양", "중점교양"),
+}
+SEMESTER_TOKENS = tuple(f"{y}-{t}" for y in range(1, 5) for t in (1, 2))
+
+
+def _scan_curriculum(rows: List[dict], semester_token: str, kind: str) -> List[dict]:
+    """rows에서 kind 종류이고 semester_token에 듣는 행 (학과 JSON 순서)"""
+    cond = _CURRICULUM_KINDS[kind]
+    return [
+        d
+        for d in rows
+        if cond(d)
+        and _match_isusigi(semester_token, d.get("이수시기"))
+        and _normalize_text_planner(d.get("학수번호"))
+    ]
+
+
+class CurriculumIndex:
+    """학과 커리큘럼 색인: (학기, 종류) -> 행 목록, 종류 -> 개설 분반이 있는 학기들.
+    카탈로그를 읽을 때 한 번 만들어서 step 2~4는 조회만 한다"""
+
+    def __init__(self, rows: List[dict], catalog: SectionCatalog):
+        self.rows = rows
+        self.by_semester: Dict[Tuple[str, str], List[dict]] = {}
+        self.semesters_with_sections: Dict[str, Tuple[str, ...]] = {}
+        for kind in _CURRICULUM_KINDS:
+            have = []
+            for sem in SEMESTER_TOKENS:
+                found = _scan_curriculum(rows, sem, kind)
+                self.by_semester[(sem, kind)] = found
+                if any(
+                    catalog.sections_with_prefix(str(d.get("학수번호")).strip())
+                    for d in found
+                ):
+                    have.append(sem)
+            self.semesters_with_sections[kind] = tuple(have)
+
+    def lookup(self, semester_token: str, kind: str) -> List[dict]:
+        found = self.by_semester.get((semester_token, kind))
+        if found is None:
+            # 색인에 없는 학기 토큰은 예전처럼 훑음
+            return _scan_curriculum(self.rows, semester_token, kind)
+        return list(found)
+
+
+def curriculum_semesters(kind: str) -> Tuple[str, ...]:
+    """kind 종류 과목 중 개설 분반이 하나라도 있는 학기들 (SEMESTER_TOKENS 순서)"""
+    return get_catalog().curriculum.semesters_with_sections.get(kind, ())
+
+
 def list_major_required(semester_token: str) -> List[dict]:
     """전공필수 목록"""
-    lst = []
-    for d in load_depart():
-        if _normalize_text_planner(d.get("종 별")) == "전공필수" and _match_isusigi(
-            semester_token, d.get("이수시기")
-        ):
-            if _normalize_text_planner(d.get("학수번호")):
-                lst.append(d)
-    return lst
+    return get_catalog().curriculum.lookup(semester_token, "major_required")
 
 
 def list_major_elective(semester_token: str) -> List[dict]:
     """전공선택 목록"""
-    lst = []
-    for d in load_depart():
-        if _normalize_text_planner(d.get("종 별")) == "전공선택" and _match_isusigi(
-            semester_token, d.get("이수시기")
-        ):
-            if _normalize_text_planner(d.get("학수번호")):
-                lst.append(d)
-    return lst
+    return get_catalog().curriculum.lookup(semester_token, "major_elective")
 
 
 def list_basic_focus(semester_token: str) -> List[dict]:
     """기초/중점 교양 목록"""
-    lst = []
-    for d in load_depart():
-        if d.get("세부구분") in ("기초교양", "중점교양") and _match_isusigi(
-            semester_token, d.get("이수시기")
-        ):
-            if _normalize_text_planner(d.get("학수번호")):
-                lst.append(d)
-    return lst
-
+    return get_catalog().curriculum.lookup(semester_token, "basic_focus")
 
-def core_category_map() -> Dict[Any, List[str]]:
-    """핵심교양 카테고리 맵핑"""
-    mapping: Dict[Any, List[str]] = {i: [] for i in range(1, 7)}
 
-    # 핵심교양 1~6
-    import unicodedata as _unicodedata
+class CommonSubjects:
+    """교양 과목(common_subjects_json) 색인. 카탈로그를 읽을 때 파일마다 한 번만 파싱
+    (파일명은 NFC로 정규화해서 분류). 데이터가 바뀌어 카탈로그를 다시 읽을 때만 새로 만든다.
+    core_rows / general_rows: step 5 / 6 목록 (행마다 _source_file)
+    category_map: 핵심교양 1~6, '창의', 'SW.AI' -> 학수번호 목록 (순서 유지, 중복 제거)
+    core_category_by_code: 학수번호 -> 핵심교양 카테고리 번호 (1~6 중 처음)"""
 
-    try:
-        for p in _COMMON_DIR_PLANNER.glob("*.json"):
+    def __init__(self, catalog: SectionCatalog):
+        self.core_rows: List[dict] = []
+        self.general_rows: List[dict] = []
+        mapping: Dict[Any, List[str]] = {i: [] for i in range(1, 7)}
+        sw_ai: Optional[List[str]] = None
+        try:
+            files = _data_dir_files(_COMMON_DIR_PLANNER, catalog)
+        except Exception:
+            files = []
+        for p in files:
             filename = p.name
-            # 유니코드 정규화 후 비교 (NFC)
             filename_nfc = _unicodedata.normalize("NFC", filename)
             # "핵심교양"이 포함되어 있고 공학인증이 아닌 경우
-            if "핵심교양" not in filename_nfc or "공학인증" in filename_nfc:
+            is_core = "핵심교양" in filename_nfc and "공학인증" not in filename_nfc
+            is_general = "일반교양" in filename_nfc
+            # 일반교양-7.SW·AI.json -> 'SW.AI'
+            is_sw_ai = "일반교양-7" in filename_nfc or (
+                is_general
+                and "7" in filename_nfc
+                and "SW" in filename_nfc
+                and "AI" in filename_nfc
+            )
+            if not (is_core or is_general):
                 continue
-            name = filename_nfc
-            # 정규식으로 카테고리 번호 추출 (핵심교양-1, 핵심교양-2 등)
-            mm = _re_module.search(r"핵심교양[^\d]*(\d)", name)
-            if not mm:
+            try:
+                arr = _json_module.loads(_data_file_text(p, catalog))
+            except Exception:
                 continue
-            cat = int(mm.group(1))
+            # 학수번호가 유효한 항목만 포함
+            rows = []
             try:
-                arr = _json_module.loads(p.read_text(encoding="utf-8"))
                 for d in arr:
-                    code = _normalize_text_planner(
-                        d.get("학수번호") or d.get("code") or d.get("course_code")
-                    )
+                    code = _common_code(d)
                     if code:
-                        mapping[cat].append(code)
+                        d["_source_file"] = filename
+                        rows.append((code, d))
             except Exception:
                 continue
-    except Exception:
-        pass
-
-    # 창의.json -> '창의'
-    creative_file = _COMMON_DIR_PLANNER / "창의.json"
-    if creative_file.exists():
+            if is_core:
+                self.core_rows.extend(d for _, d in rows)
+                # 정규식으로 카테고리 번호 추출 (핵심교양-1, 핵심교양-2 등)
+                mm = _re_module.search(r"핵심교양[^\d]*(\d)", filename_nfc)
+                if mm and int(mm.group(1)) in mapping:
+                    mapping[int(mm.group(1))].extend(code for code, _ in rows)
+            if is_general:
+                self.general_rows.extend(d for _, d in rows)
+            if is_sw_ai:
+                sw_ai = (sw_ai or []) + [code for code, _ in rows]
+
+        # 창의.json -> '창의' (파일이 없으면 FileNotFoundError로 건너뜀)
         try:
-            arr = _json_module.loads(creative_file.read_text(encoding="utf-8"))
+            arr = _json_module.loads(
+                _data_file_text(_COMMON_DIR_PLANNER / "창의.json", catalog)
+            )
             mapping.setdefault("창의", [])
             for d in arr:
                 code = str(
@@ -984,109 +1885,41 @@ def core_category_map() -> Dict[Any, List[str]]:
                     mapping["창의"].append(code)
         except Exception:
             pass
+        if sw_ai is not None:
+            mapping["SW.AI"] = sw_ai
 
-    # 일반교양-7.SW·AI.json -> 'SW.AI'
-    import unicodedata as _unicodedata_swai
+        # Deduplicate preserving order for all keys
+        self.category_map = {k: list(dict.fromkeys(v)) for k, v in mapping.items()}
+        self.core_category_by_code: Dict[str, int] = {}
+        for cat in range(1, 7):
+            for code in self.category_map[cat]:
+                self.core_category_by_code.setdefault(code, cat)
 
-    try:
-        for p in _COMMON_DIR_PLANNER.glob("*.json"):
-            filename = p.name
-            # 유니코드 정규화 후 비교
-            filename_nfc = _unicodedata_swai.normalize("NFC", filename)
-            # "일반교양-7"이 포함되고 "SW"와 "AI"가 모두 포함된 경우
-            if "일반교양-7" in filename_nfc or (
-                "일반교양" in filename_nfc
-                and "7" in filename_nfc
-                and "SW" in filename_nfc
-                and "AI" in filename_nfc
-            ):
-                try:
-                    arr = _json_module.loads(p.read_text(encoding="utf-8"))
-                    mapping.setdefault("SW.AI", [])
-                    for d in arr:
-                        code = _normalize_text_planner(
-                            d.get("학수번호") or d.get("code") or d.get("course_code")
-                        )
-                        if code:
-                            mapping["SW.AI"].append(code)
-                except Exception:
-                    continue
-    except Exception:
-        pass
 
-    # Deduplicate preserving order for all keys
-    for k in list(mapping.keys()):
-        seen = set()
-        uniq = []
-        for c in mapping[k]:
-            if c not in seen:
-                seen.add(c)
-                uniq.append(c)
-        mapping[k] = uniq
+def _common_code(d: dict) -> str:
+    return _normalize_text_planner(
+        d.get("학수번호") or d.get("code") or d.get("course_code")
+    )
+
+
+def core_category_map() -> Dict[Any, List[str]]:
+    """핵심교양 카테고리 맵핑"""
+    return {k: list(v) for k, v in get_catalog().common.category_map.items()}
+
 
-    return mapping
+def core_category_of(code: str) -> Optional[int]:
+    """학수번호의 핵심교양 카테고리 번호 (1~6). 핵심교양이 아니면 None"""
+    return get_catalog().common.core_category_by_code.get(code)
 
 
 def list_core_common() -> List[dict]:
     """핵심교양 목록"""
-    out: List[dict] = []
-    # 모든 JSON 파일을 검사하여 핵심교양 파일 찾기
-    import unicodedata as _unicodedata
-
-    try:
-        for p in _COMMON_DIR_PLANNER.glob("*.json"):
-            filename = p.name
-            # 유니코드 정규화 후 비교 (NFC)
-            filename_nfc = _unicodedata.normalize("NFC", filename)
-            # "핵심교양"이 포함되어 있고 공학인증이 아닌 경우
-            if "핵심교양" in filename_nfc and "공학인증" not in filename_nfc:
-                try:
-                    arr = _json_module.loads(p.read_text(encoding="utf-8"))
-                    for d in arr:
-                        # 학수번호가 유효한 항목만 포함
-                        code = _normalize_text_planner(
-                            d.get("학수번호") or d.get("code") or d.get("course_code")
-                        )
-                        if not code:
-                            continue
-                        d["_source_file"] = filename
-                        out.append(d)
-                except Exception:
-                    continue
-    except Exception:
-        pass
-    return out
+    return list(get_catalog().common.core_rows)
 
 
 def list_general_common() -> List[dict]:
     """일반교양 목록"""
-    out: List[dict] = []
-    # 모든 JSON 파일을 검사하여 일반교양 파일 찾기
-    import unicodedata as _unicodedata
-
-    try:
-        for p in _COMMON_DIR_PLANNER.glob("*.json"):
-            filename = p.name
-            # 유니코드 정규화 후 비교 (NFC)
-            filename_nfc = _unicodedata.normalize("NFC", filename)
-            # "일반교양"이 포함된 경우
-            if "일반교양" in filename_nfc:
-                try:
-                    arr = _json_module.loads(p.read_text(encoding="utf-8"))
-                    for d in arr:
-                        # 학수번호가 유효한 항목만 포함
-                        code = _normalize_text_planner(
-                            d.get("학수번호") or d.get("code") or d.get("course_code")
-                        )
-                        if not code:
-                            continue
-                        d["_source_file"] = filename
-                        out.append(d)
-                except Exception:
-                    continue
-    except Exception:
-        pass
-    return out
+    return list(get_catalog().common.general_rows)
 
 
 def normalize_eval_filters(eval_choice: str, assign_choice: str, quiz_choice: str):
@@ -1141,25 +1974,126 @@ def filter_and_sort_sections(
     return out
 
 
-# 시간표 생성
-def _conflicts_planner(a: SectionFromFile, b: SectionFromFile) -> bool:
-    """시간 충돌 확인"""
-    if a.is_web or b.is_web:
+# ---------- 분반 쌍 충돌 비트셋 (scripts/build_conflict_matrix.py로 생성) ----------
+_CONFLICT_MATRIX_PATH = _DATA_DIR / "section_conflicts.bin"
+_CONFLICT_MAGIC = b"SCM1"
+# 헤더: magic, 분반 수, 행 바이트 수, file_id 목록 바이트 수,
+# 카탈로그 버전 (subject_json 파일별 stat 해시, _dir_fingerprint)
+_CONFLICT_HEADER = _struct.Struct("<4sIIIq")
+
+
+class _ConflictMatrix:
+    """분반×분반 시간 충돌 비트셋 파일 (읽기 전용 mmap이라 worker 프로세스들이 페이지를 공유).
+    행 i의 j번째 비트 = i번째 분반과 j번째 분반이 겹침 (file_id 정렬 순서)"""
+
+    def __init__(self, path: _Path_module):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ)
+        magic, n, row_bytes, ids_len, version = _CONFLICT_HEADER.unpack_from(
+            self._mm, 0
+        )
+        if magic != _CONFLICT_MAGIC:
+            raise ValueError(f"not a conflict matrix file: {path}")
+        start = _CONFLICT_HEADER.size
+        ids = self._mm[start : start + ids_len].decode("utf-8").split("\n") if n else []
+        self.version = version
+        self.row_bytes = row_bytes
+        self.base = start + ids_len
+        # section id -> 행 번호
+        self.row_of = {section_id(fid): i for i, fid in enumerate(ids)}
+
+    def conflicts(self, a_sid: int, b_sid: int) -> Optional[bool]:
+        """두 분반의 충돌 여부. 파일에 없는 분반이면 None"""
+        i = self.row_of.get(a_sid)
+        j = self.row_of.get(b_sid)
+        if i is None or j is None:
+            return None
+        return bool(self._mm[self.base + i * self.row_bytes + (j >> 3)] >> (j & 7) & 1)
+
+
+_CONFLICT_MATRIX: Optional[_ConflictMatrix] = None
+
+
+def write_conflict_matrix(
+    path: Optional[_Path_module] = None, catalog: Optional[SectionCatalog] = None
+) -> int:
+    """subject_json 전체의 분반 쌍 충돌 비트셋을 파일로 저장. 분반 수를 반환.
+    catalog를 주지 않으면 현재 카탈로그"""
+    path = path or _CONFLICT_MATRIX_PATH
+    catalog = catalog or get_catalog()
+    sections = list(catalog.by_file.values())
+    n = len(sections)
+    row_bytes = (n + 7) // 8
+    # 같은 시간 분반이 많으므로 서로 다른 mask끼리만 비교
+    members: Dict[int, int] = {}
+    for j, s in enumerate(sections):
+        members[s.mask] = members.get(s.mask, 0) | (1 << j)
+    rows: Dict[int, bytes] = {}
+    for m in members:
+        bits = 0
+        for m2, group in members.items():
+            if m & m2:
+                bits |= group
+        rows[m] = bits.to_bytes(row_bytes, "little")
+    ids = "\n".join(s.file_id for s in sections).encode("utf-8")
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        f.write(
+            _CONFLICT_HEADER.pack(
+                _CONFLICT_MAGIC, n, row_bytes, len(ids), catalog.version
+            )
+        )
+        f.write(ids)
+        for s in sections:
+            f.write(rows[s.mask])
+    _os.replace(tmp, path)
+    return n
+
+
+def load_conflict_matrix(path: Optional[_Path_module] = None) -> bool:
+    """충돌 비트셋 파일을 mmap (서버 시작 시 호출). 파일이 없거나 카탈로그보다
+    오래됐으면 False이고, 충돌 확인은 주간 비트마스크로 대신한다"""
+    global _CONFLICT_MATRIX
+    path = path or _CONFLICT_MATRIX_PATH
+    _CONFLICT_MATRIX = None
+    if not path.exists():
         return False
-    for d1, s1, e1, _ in a.meetings:
-        for d2, s2, e2, _ in b.meetings:
-            if d1 != d2:
-                continue
-            if not (e1 <= s2 or e2 <= s1):
-                return True
-    return False
+    try:
+        matrix = _ConflictMatrix(path)
+    except (OSError, ValueError, _struct.error) as e:
+        _log.warning("conflict matrix %s unreadable: %s", path, e)
+        return False
+    if matrix.version != _catalog_version():
+        _log.warning("conflict matrix %s is stale, rebuild it", path)
+        return False
+    _CONFLICT_MATRIX = matrix
+    return True
+
+
+def _rebuild_conflict_matrix(
+    path: _Path_module, catalog: SectionCatalog
+) -> Optional[_ConflictMatrix]:
+    """카탈로그가 바뀐 뒤 충돌 비트셋 파일을 다시 써서 mmap. 실패하면 None
+    (충돌 확인은 주간 비트마스크로 대신)"""
+    try:
+        n = write_conflict_matrix(path, catalog)
+        matrix = _ConflictMatrix(path)
+    except (OSError, ValueError, _struct.error) as e:
+        _log.warning("conflict matrix %s rebuild failed: %s", path, e)
+        return None
+    _log.info("conflict matrix rebuilt after catalog reload: %d sections", n)
+    return matrix
 
 
-def _can_place_planner(current: List[SectionFromFile], cand: SectionFromFile) -> bool:
-    """배치 가능 여부 확인"""
-    return all(not _conflicts_planner(cand, x) for x in current)
+def sections_conflict(file_id_a: str, file_id_b: str) -> Optional[bool]:
+    """file_id로 두 분반의 시간 충돌 확인 (충돌 비트셋 조회). 비트셋이 없으면 None"""
+    if _CONFLICT_MATRIX is None:
+        return None
+    return _CONFLICT_MATRIX.conflicts(section_id(file_id_a), section_id(file_id_b))
 
 
+# 시간표 생성
 def _group_by_course_planner(
     sections: List[SectionFromFile],
 ) -> Dict[str, List[SectionFromFile]]:
@@ -1172,159 +2106,1713 @@ def _group_by_course_planner(
     return groups
 
 
+def _flatten_courses_planner(
+    by_priority: Dict[int, List[SectionFromFile]],
+) -> List[Tuple[str, List[Tuple[SectionFromFile, int]]]]:
+    """priority 순서대로 과목을 펼침 -> [(course_id, [(section, priority), ...]), ...]
+    같은 학수번호가 여러 priority에 있으면 하나의 과목으로 합침 (한 번만 수강)"""
+    courses: Dict[str, List[Tuple[SectionFromFile, int]]] = {}
+    seen: Set[int] = set()
+    for p in sorted(by_priority.keys()):
+        for cid, secs in _group_by_course_planner(by_priority[p]).items():
+            opts = courses.setdefault(cid, [])
+            for s in secs:
+                if s.sid in seen:
+                    continue
+                seen.add(s.sid)
+                opts.append((s, p))
+    return [(cid, opts) for cid, opts in courses.items() if opts]
+
+
+def _collapse_equivalent_planner(
+    courses: List[Tuple[str, List[Tuple[SectionFromFile, int]]]],
+) -> Tuple[
+    List[Tuple[str, List[Tuple[SectionFromFile, int]]]],
+    Dict[str, List[SectionFromFile]],
+]:
+    """시간/학점/priority가 같은 분반(교수·평가 방식만 다른 분반)을 하나로 묶음.
+    탐색은 대표 분반(file_id가 가장 앞선 분반)으로만 하고,
+    나머지는 대표 file_id -> [동일 시간 분반들] 맵으로 돌려준다."""
+    collapsed: List[Tuple[str, List[Tuple[SectionFromFile, int]]]] = []
+    alternatives: Dict[str, List[SectionFromFile]] = {}
+    for cid, opts in courses:
+        reps: Dict[Tuple[int, int, int], SectionFromFile] = {}
+        kept: List[Tuple[SectionFromFile, int]] = []
+        for s, p in opts:
+            key = (s.mask, s.credit, p)
+            rep = reps.get(key)
+            if rep is None:
+                reps[key] = s
+                kept.append((s, p))
+            else:
+                alternatives.setdefault(rep.file_id, []).append(s)
+        collapsed.append((cid, kept))
+    return collapsed, alternatives
+
+
+# ---------- 학점 도달 가능성 (subset-sum DP) ----------
+# (총 학점, 핵심교양 학점) 쌍의 도달 가능 집합을 하나의 int 비트셋으로 표현한다.
+# bit index = total * width + core. 핵심교양 목표가 없으면 core 축은 항상 0.
+def _credit_options_planner(
+    opts: List[Tuple[SectionFromFile, int]], track_core: bool
+) -> Set[Tuple[int, int]]:
+    """과목 하나가 더할 수 있는 (학점, 핵심교양 학점) 쌍"""
+    return {(s.credit, s.credit if (track_core and p == 4) else 0) for s, p in opts}
+
+
+def _reach_step_planner(
+    bits: int, options: Iterable[Tuple[int, int]], width: int, valid: int
+) -> int:
+    """과목 하나를 건너뛰거나 options 중 하나를 더했을 때의 도달 가능 집합"""
+    out = bits
+    for credit, core in options:
+        out |= bits << (credit * width + core)
+    return out & valid
+
+
+def _reach_has_planner(bits: int, total: int, core: int, width: int) -> bool:
+    if total < 0 or core < 0 or core >= width:
+        return False
+    return bool((bits >> (total * width + core)) & 1)
+
+
 @dataclass
 class ScheduleFromFile:
     """시간표 스케줄"""
 
     sections: List[SectionFromFile]
     total_credits: int
+    # 분반 file_id -> 시간/학점이 같은 다른 분반들 (교수·평가 방식만 다름)
+    alternatives: Dict[str, List[SectionFromFile]] = field(default_factory=dict)
+    # 주간 점유 비트마스크 (분반 mask의 OR). 주지 않으면 sections에서 계산
+    mask: int = field(default=0, repr=False)
 
+    def __post_init__(self):
+        if not self.mask:
+            for s in self.sections:
+                self.mask |= s.mask
 
-def generate_schedules(
-    by_priority: Dict[int, List[SectionFromFile]],
-    target_credits: int,
-    core_credit_target: Optional[int] = None,
-    limit: int = 30,
-) -> List[ScheduleFromFile]:
-    """시간표 생성"""
-    # 빈 priority 제거 (효율성 향상)
-    by_priority = {p: secs for p, secs in by_priority.items() if secs}
-    if not by_priority:
-        return []
-
-    grouped = {p: _group_by_course_planner(secs) for p, secs in by_priority.items()}
-    priorities = sorted(grouped.keys())
-    best: List[ScheduleFromFile] = []
 
-    # 디버깅: 입력 데이터 확인
-    print(f"[DEBUG generate_schedules] Priorities: {priorities}")
-    print(
-        f"[DEBUG generate_schedules] Target credits: {target_credits}, Core target: {core_credit_target}"
-    )
-    for p in priorities:
-        print(f"[DEBUG generate_schedules] Priority {p}: {len(grouped[p])} courses")
-
-    def dfs(
-        pi_idx: int,
-        current: List[SectionFromFile],
-        taken_courses: Set[str],
-        total_credits: int,
-        core_credits: int,
+@dataclass
+class SearchMetrics:
+    """시간표 탐색 카운터 (탐색 1번 또는 여러 번의 합)"""
+
+    nodes: int = 0  # 방문한 탐색 노드 수
+    leaves_accepted: int = 0  # 조건을 만족한 시간표 수 (top-K 힙에 못 들어간 것 포함)
+    rejected_credits: int = 0  # 총 학점이 맞지 않아 버린 leaf
+    rejected_core: int = 0  # 핵심교양 학점이 맞지 않아 버린 leaf
+    conflict_prunes: int = 0  # 시간 충돌로 제외한 분반 선택
+    reach_prunes: int = 0  # 학점 도달 불가능으로 잘라낸 분기
+    bound_prunes: int = 0  # top-K 상한으로 잘라낸 서브트리
+    nogood_hits: int = 0  # nogood 테이블로 건너뛴 상태
+    wall_time: float = 0.0  # 초
+
+    def add(self, other: "SearchMetrics"):
+        for f in _dc_fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return _dc_asdict(self)
+
+
+class ScheduleResults(list):
+    """generate_schedules 결과 (list[ScheduleFromFile]).
+    partial=True면 시간 제한/취소로 탐색이 중간에 멈춘 결과 (지금까지 찾은 최선).
+    metrics: 이번 탐색의 SearchMetrics (캐시에서 가져온 결과면 None)"""
+
+    def __init__(
+        self,
+        schedules: Iterable[ScheduleFromFile] = (),
+        partial: bool = False,
+        metrics: Optional[SearchMetrics] = None,
+    ):
+        super().__init__(schedules)
+        self.partial = partial
+        self.metrics = metrics
+
+
+class SearchCancelToken:
+    """탐색 취소 토큰. cancel()로 직접 취소하거나, poll 콜백이 True를 반환하면 취소됨
+    (예: HTTP 클라이언트 연결 끊김). poll은 poll_interval초에 한 번만 호출"""
+
+    def __init__(self, poll=None, poll_interval: float = 0.2):
+        self._cancelled = False
+        self._poll = poll
+        self._poll_interval = poll_interval
+        self._last_poll = 0.0
+
+    def cancel(self):
+        self._cancelled = True
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._cancelled and self._poll is not None:
+            now = _time.monotonic()
+            if now - self._last_poll >= self._poll_interval:
+                self._last_poll = now
+                try:
+                    if self._poll():
+                        self._cancelled = True
+                except Exception:
+                    pass
+        return self._cancelled
+
+
+# 선택한 분반 수가 이 값 이상이면 ordering="auto"가 MRV 탐색을 사용
+_MRV_AUTO_THRESHOLD = 30
+# 시간 제한/취소 확인 주기 (탐색 노드 수)
+_STOP_CHECK_EVERY = 256
+# 막다른 상태(nogood) 테이블 최대 크기. 넘으면 가장 오래 안 쓴 상태부터 버림 (LRU)
+_NOGOOD_TABLE_SIZE = 50_000
+# count_schedules 부분 문제 메모 최대 크기 (호출마다). 넘으면 더 저장하지 않고 계속 셈
+_COUNT_MEMO_SIZE = 200_000
+# 탐색 상세 추적(leaf마다 debug 로그)을 켤 호출 비율 (0~1). 로거가 DEBUG일 때만 적용
+_TRACE_SAMPLE_RATE = float(_os.getenv("PLANNER_TRACE_SAMPLE", "0"))
+# 탐색 공간 추정치(과목별 (분반 수 + 1)의 곱)가 10**이 값 이상이면 ordering="auto"가
+# 전수 탐색 대신 시뮬레이티드 어닐링을 사용
+_ANNEAL_AUTO_LOG10 = 20.0
+# 어닐링 시간 (초). time_budget이 있으면 그 _ANNEAL_BUDGET_SHARE 비율과 중 작은 값
+_ANNEAL_TIME_BUDGET = float(_os.getenv("PLANNER_ANNEAL_BUDGET", "2"))
+_ANNEAL_BUDGET_SHARE = 0.9
+# 한 번의 냉각(T0 -> T1) 반복 수. 끝나면 새 초기해에서 다시 시작
+_ANNEAL_CYCLE = 20_000
+_ANNEAL_T0 = 2.0
+_ANNEAL_T1 = 0.02
+# 이 반복 수 동안 새 시간표를 못 찾으면 종료
+_ANNEAL_STALL = 3 * _ANNEAL_CYCLE
+# 에너지에서 배치한 과목 하나의 보상 = 이 값 * 2**(5 - priority) (top-K의 priority 사전순에
+# 가깝게). 학점 1 차이 벌점은 1
+_ANNEAL_PRIORITY_WEIGHT = 0.1
+
+
+class _ScheduleSearch:
+    """generate_schedules의 백트래킹 탐색 상태
+
+    - static: courses 순서대로 분기, 접미사 학점 도달 가능성 테이블로 가지치기
+    - mrv: 남은 호환 분반이 가장 적은 과목부터 분기하고, 배치할 때마다 다른
+      미배정 과목의 도메인에서 충돌 분반을 제거 (forward checking).
+      남은 도메인으로 목표 학점에 도달할 수 없으면 (= 꼭 들어가야 할 과목의
+      도메인이 비면) 즉시 되돌아감
+
+    top_k=True면 (priority_counts, total_credits) 기준 상위 limit개를 힙으로 유지하고,
+    남은 과목을 모두 넣어도 현재 limit번째 시간표를 이길 수 없는 서브트리는 잘라낸다
+    (branch-and-bound). False면 먼저 찾은 limit개에서 멈춘다.
+
+    anneal_budget(초)이 주어지면 전수 탐색 대신 시뮬레이티드 어닐링 (_run_anneal)."""
+
+    def __init__(
+        self,
+        courses: List[Tuple[str, List[Tuple[SectionFromFile, int]]]],
+        target_credits: int,
+        core_credit_target: Optional[int],
+        limit: int,
+        mrv: bool = False,
+        alternatives: Optional[Dict[str, List[SectionFromFile]]] = None,
+        top_k: bool = True,
+        deadline: Optional[float] = None,
+        cancel_token: Optional[SearchCancelToken] = None,
+        anneal_budget: Optional[float] = None,
     ):
-        nonlocal best
-        if len(best) >= limit:
+        self.courses = courses
+        self.alternatives = alternatives or {}
+        self.n = len(courses)
+        self.target_credits = target_credits
+        self.core_credit_target = core_credit_target
+        self.limit = limit
+        self.mrv = mrv
+        self.top_k = top_k
+        self.found: List[ScheduleFromFile] = []
+        # top-K 힙: (rank key, -발견 순서, schedule). 힙의 최소값 = 현재 limit번째
+        self.heap: List[Tuple[Tuple[Tuple[int, ...], int], int, ScheduleFromFile]] = []
+        self.seq = 0
+        self.current: List[SectionFromFile] = []
+        self.counts = [0, 0, 0, 0, 0]  # priority별 배치 과목 수
+        # deadline: time.monotonic() 기준 마감 시각
+        self.deadline = deadline
+        self.cancel_token = cancel_token
+        self.anneal_budget = anneal_budget
+        self.stopped = False
+        self.metrics = SearchMetrics()
+        # True면 leaf마다 debug 로그 (_TRACE_SAMPLE_RATE 비율로 샘플링)
+        self.trace = False
+        # 시간표를 찾을 때마다 호출 (top_k=False에서만, iter_schedules 스트리밍용)
+        self.on_leaf: Optional[Callable[[ScheduleFromFile], None]] = None
+        # nogood 테이블: 조건을 만족하는 시간표가 하나도 없던 서브트리의 상태
+        # (static: (idx, occ, 학점, 핵심교양 학점), mrv: (미배정 과목들, ...)).
+        # 같은 상태에 다른 선택 순서로 다시 도달하면 탐색하지 않음
+        self.nogoods: "_OrderedDict[Any, None]" = _OrderedDict()
+
+        # 핵심교양 목표가 설정되면(0 포함) priority 4 학점 합계가 정확히 목표와 같아야 함
+        self.track_core = core_credit_target is not None
+        self.core_need = max(0, core_credit_target) if self.track_core else 0
+        self.options = [
+            _credit_options_planner(opts, self.track_core) for _, opts in courses
+        ]
+        max_core_step = max((c for o in self.options for _, c in o), default=0)
+        self.width = self.core_need + 1 + max_core_step
+        max_total = sum(max(cr for cr, _ in o) for o in self.options)
+        row = (1 << (self.core_need + 1)) - 1
+        self.valid = 0
+        for t in range(max_total + 1):
+            self.valid |= row << (t * self.width)
+
+        # reach[i]: courses[i:]로 더 만들 수 있는 (학점, 핵심교양 학점) 집합
+        self.reach = [0] * (self.n + 1)
+        self.reach[self.n] = 1
+        for i in range(self.n - 1, -1, -1):
+            self.reach[i] = _reach_step_planner(
+                self.reach[i + 1], self.options[i], self.width, self.valid
+            )
+
+        achievable = [
+            t
+            for t in range(max_total + 1)
+            if _reach_has_planner(self.reach[0], t, self.core_need, self.width)
+        ]
+        # bands: 도달 가능한 총 학점을 목표와의 차이 순으로 묶은 것. 시간 충돌은 DP에서
+        # 보지 못하므로, 지금 band로 시간표가 하나도 없으면 다음 band로 넓혀 다시 탐색
+        # (widen). accept = 지금 받는 총 학점들
+        gaps = sorted({abs(t - target_credits) for t in achievable})
+        self.bands = [
+            [t for t in achievable if abs(t - target_credits) == g] for g in gaps
+        ]
+        self.band = 0
+        self.accept: List[int] = self.bands[0] if self.bands else []
+
+        self.min_priority = [min(p for _, p in opts) for _, opts in courses]
+        # suffix_pc[i][p-1]: courses[i:] 중 priority p 분반을 가진 과목 수 (상한 계산용)
+        self.suffix_pc = [[0, 0, 0, 0, 0] for _ in range(self.n + 1)]
+        for i in range(self.n - 1, -1, -1):
+            row_pc = list(self.suffix_pc[i + 1])
+            for p in {p for _, p in courses[i][1]}:
+                row_pc[p - 1] += 1
+            self.suffix_pc[i] = row_pc
+
+    def use_band(self, band: int):
+        """accept를 bands[band]로 바꿈. nogood는 accept에 따라 달라지므로 비움"""
+        self.band = band
+        self.accept = self.bands[band]
+        self.nogoods.clear()
+
+    def widen(self) -> bool:
+        """다음으로 가까운 총 학점들로 넓힘. 더 없으면 False"""
+        if self.band + 1 >= len(self.bands):
+            return False
+        _log.debug(
+            "no schedule at %s credits (time conflicts), trying %s",
+            self.accept,
+            self.bands[self.band + 1],
+        )
+        self.use_band(self.band + 1)
+        return True
+
+    def _core_of(self, s: SectionFromFile, p: int) -> int:
+        return s.credit if (self.track_core and p == 4) else 0
+
+    def _bits_ok(self, bits: int, credits: int, core_cr: int) -> bool:
+        return any(
+            _reach_has_planner(bits, a - credits, self.core_need - core_cr, self.width)
+            for a in self.accept
+        )
+
+    def _done(self) -> bool:
+        self.metrics.nodes += 1
+        if self.metrics.nodes % _STOP_CHECK_EVERY == 0 and not self.stopped:
+            if self.deadline is not None and _time.monotonic() >= self.deadline:
+                self.stopped = True
+            elif self.cancel_token is not None and self.cancel_token.cancelled:
+                self.stopped = True
+        if self.stopped:
+            return True
+        return not self.top_k and len(self.found) >= self.limit
+
+    def _can_beat(self, extra: List[int]) -> bool:
+        """현재 counts에 extra(남은 과목 수 상한)를 더한 낙관적 키가 limit번째를 이기는지"""
+        if not self.top_k or len(self.heap) < self.limit:
+            return True
+        if not self.heap:  # limit <= 0: 어떤 시간표도 남지 않음
+            return False
+        bound = (tuple(c + e for c, e in zip(self.counts, extra)), max(self.accept))
+        # 같은 키면 먼저 찾은 시간표가 이기므로, 엄격히 커야 함
+        if bound > self.heap[0][0]:
+            return True
+        self.metrics.bound_prunes += 1
+        return False
+
+    def _is_nogood(self, key: Any) -> bool:
+        if key in self.nogoods:
+            self.nogoods.move_to_end(key)
+            self.metrics.nogood_hits += 1
+            return True
+        return False
+
+    def _mark(self) -> Tuple[int, int]:
+        return self.metrics.leaves_accepted, self.metrics.bound_prunes
+
+    def _record_nogood(self, key: Any, mark: Tuple[int, int]):
+        # 중단됐거나 bound로 잘린 서브트리는 '해가 없음'이 확정이 아니므로 기록하지 않음
+        if self.stopped or self._mark() != mark:
+            return
+        self.nogoods[key] = None
+        if len(self.nogoods) > _NOGOOD_TABLE_SIZE:
+            self.nogoods.popitem(last=False)
+
+    def run(
+        self, start: int = 0, prefix: Iterable[Tuple[SectionFromFile, int]] = ()
+    ) -> List[ScheduleFromFile]:
+        """courses[:start]를 prefix(배치한 (분반, priority)들, 나머지는 건너뜀)로 고정하고
+        courses[start:]를 탐색"""
+        if self.limit <= 0:
+            return []
+        if self.anneal_budget is not None:
+            end = _time.monotonic() + self.anneal_budget
+            while True:
+                found = self._run_anneal(end)
+                if found or self.stopped or _time.monotonic() >= end:
+                    break
+                if not self.widen():
+                    break
+            # 어닐링은 시간표를 전부 찾았다는 보장이 없으므로 항상 중간 결과
+            # (partial, 캐시 안 함)
+            self.stopped = True
+            return found
+        while True:
+            found = self._run_band(start, prefix)
+            # 서브트리 하나(start > 0)가 비었다고 전체가 빈 것은 아니므로
+            # 넓히는 것은 전체 탐색에서만 (병렬 탐색은 호출자가 넓힘)
+            if found or self.stopped or start > 0 or not self.widen():
+                return found
+
+    def _run_band(
+        self, start: int, prefix: Iterable[Tuple[SectionFromFile, int]]
+    ) -> List[ScheduleFromFile]:
+        credits = core_cr = occ = 0
+        for s, p in prefix:
+            credits += s.credit
+            core_cr += self._core_of(s, p)
+            occ |= s.mask
+            self.current.append(s)
+            self.counts[p - 1] += 1
+        if not self.accept or not self._bits_ok(self.reach[start], credits, core_cr):
+            return []
+        if self.mrv:
+            domains = {
+                i: [o for o in self.courses[i][1] if not (o[0].mask & occ)]
+                for i in range(start, self.n)
+            }
+            self._search_mrv(list(range(start, self.n)), domains, credits, core_cr, occ)
+        else:
+            self._search_static(start, credits, core_cr, occ)
+        return [e[2] for e in self.entries()]
+
+    def _run_anneal(self, end: float, seed: int = 0) -> List[ScheduleFromFile]:
+        """시뮬레이티드 어닐링: 과목마다 (분반 하나 또는 건너뜀)을 고른 배정을 국소 이동.
+        이동 = 과목 하나의 선택을 바꾸고, 새 분반과 시간이 겹치는 과목은 빼기.
+        그래서 배정은 항상 충돌이 없고, 에너지는 학점/핵심교양 학점 차이 벌점에서
+        priority 보상을 뺀 값. 학점 조건까지 맞는 배정을 만날 때마다 _leaf로 기록한다.
+        end(time.monotonic 시각)이 지나거나 _ANNEAL_STALL번 동안 새 시간표가 없으면 종료"""
+        if self.n == 0:
+            return []
+        rng = _random.Random(seed)
+        opts_of = [opts for _, opts in self.courses]
+        max_accept = max(self.accept)
+        choice = [-1] * self.n  # opts_of[i]의 인덱스, -1 = 건너뜀
+        state = {"occ": 0, "credits": 0, "core": 0, "reward": 0.0}
+        seen: Set[frozenset] = set()
+
+        def place(i: int, k: int):
+            s, p = opts_of[i][k]
+            choice[i] = k
+            state["occ"] |= s.mask
+            state["credits"] += s.credit
+            state["core"] += self._core_of(s, p)
+            state["reward"] += _ANNEAL_PRIORITY_WEIGHT * (1 << (5 - p))
+            self.counts[p - 1] += 1
+
+        def remove(i: int):
+            s, p = opts_of[i][choice[i]]
+            choice[i] = -1
+            # 배정은 충돌이 없으므로 분반 mask끼리 겹치지 않음
+            state["occ"] ^= s.mask
+            state["credits"] -= s.credit
+            state["core"] -= self._core_of(s, p)
+            state["reward"] -= _ANNEAL_PRIORITY_WEIGHT * (1 << (5 - p))
+            self.counts[p - 1] -= 1
+
+        def energy() -> float:
+            e = min(abs(state["credits"] - a) for a in self.accept)
+            if self.track_core:
+                e += abs(state["core"] - self.core_need)
+            return e - state["reward"]
+
+        def restart():
+            # 무작위 순서의 greedy 초기해 (학점/핵심교양 학점 상한을 넘지 않게)
+            for i in range(self.n):
+                if choice[i] >= 0:
+                    remove(i)
+            order = list(range(self.n))
+            rng.shuffle(order)
+            for i in order:
+                ks = list(range(len(opts_of[i])))
+                rng.shuffle(ks)
+                for k in ks:
+                    s, p = opts_of[i][k]
+                    if (
+                        s.mask & state["occ"]
+                        or state["credits"] + s.credit > max_accept
+                    ):
+                        continue
+                    if state["core"] + self._core_of(s, p) > self.core_need:
+                        continue
+                    place(i, k)
+                    break
+
+        def record():
+            if state["credits"] not in self.accept:
+                return
+            if self.track_core and state["core"] != self.core_need:
+                return
+            key = frozenset(
+                opts_of[i][k][0].sid for i, k in enumerate(choice) if k >= 0
+            )
+            if key in seen:
+                return
+            seen.add(key)
+            self.current = [opts_of[i][k][0] for i, k in enumerate(choice) if k >= 0]
+            self._leaf(state["credits"], state["core"], state["occ"])
+            self.current = []
+
+        restart()
+        e = energy()
+        record()
+        step = 0
+        last_found = 0
+        while not self._done():
+            if self.metrics.nodes % _STOP_CHECK_EVERY == 0 and _time.monotonic() >= end:
+                break
+            step += 1
+            if step - last_found > _ANNEAL_STALL:
+                break
+            phase = step % _ANNEAL_CYCLE
+            if phase == 0:
+                restart()
+                e = energy()
+                record()
+                continue
+            temp = _ANNEAL_T0 * (_ANNEAL_T1 / _ANNEAL_T0) ** (phase / _ANNEAL_CYCLE)
+
+            i = rng.randrange(self.n)
+            k = rng.randrange(len(opts_of[i]) + 1) - 1
+            if k == choice[i]:
+                continue
+            undo: List[Tuple[int, int]] = []
+            if choice[i] >= 0:
+                undo.append((i, choice[i]))
+                remove(i)
+            if k >= 0:
+                mask = opts_of[i][k][0].mask
+                if mask & state["occ"]:
+                    for j in range(self.n):
+                        if choice[j] >= 0 and opts_of[j][choice[j]][0].mask & mask:
+                            undo.append((j, choice[j]))
+                            remove(j)
+                place(i, k)
+            new_e = energy()
+            if new_e <= e or rng.random() < _math.exp((e - new_e) / temp):
+                e = new_e
+                before = self.metrics.leaves_accepted
+                record()
+                if self.metrics.leaves_accepted != before:
+                    last_found = step
+            else:
+                if k >= 0:
+                    remove(i)
+                for j, kk in reversed(undo):
+                    place(j, kk)
+        self.counts = [0, 0, 0, 0, 0]
+        return [e[2] for e in self.entries()]
+
+    def entries(self) -> List[Tuple[Any, int, ScheduleFromFile]]:
+        """(rank key, 발견 순서, schedule) 목록. top-K면 랭킹 순서, 아니면 발견 순서"""
+        if self.top_k:
+            ranked = sorted(self.heap, key=lambda e: (e[0], e[1]), reverse=True)
+            return [(key, -neg_seq, sc) for key, neg_seq, sc in ranked]
+        return [(None, i, sc) for i, sc in enumerate(self.found)]
+
+    def partition(
+        self, want: int, max_depth: int = 3
+    ) -> List[Tuple[int, List[Tuple[SectionFromFile, int]]]]:
+        """앞쪽 과목 max_depth개까지의 분기(분반 선택/건너뜀)로 탐색 트리를 나눔.
+        순차 DFS와 같은 순서의 (start, prefix) 목록을 반환"""
+        frontier: List[Tuple[int, List[Tuple[SectionFromFile, int]]]] = [(0, [])]
+        for depth in range(min(max_depth, self.n)):
+            if len(frontier) >= want:
+                break
+            nxt = self.reach[depth + 1]
+            expanded = []
+            for start, prefix in frontier:
+                credits = sum(s.credit for s, _ in prefix)
+                core_cr = sum(self._core_of(s, p) for s, p in prefix)
+                occ = 0
+                for s, _ in prefix:
+                    occ |= s.mask
+                for s, p in self.courses[depth][1]:
+                    if s.mask & occ:
+                        continue
+                    if self._bits_ok(
+                        nxt, credits + s.credit, core_cr + self._core_of(s, p)
+                    ):
+                        expanded.append((depth + 1, prefix + [(s, p)]))
+                if self._bits_ok(nxt, credits, core_cr):
+                    expanded.append((depth + 1, prefix))
+            frontier = expanded
+        return frontier
+
+    def _leaf(self, credits: int, core_cr: int, occ: int):
+        # 핵심교양 학점 조건 확인: 설정된 경우 정확히 목표 학점이어야 함
+        if self.track_core and core_cr != self.core_need:
+            self.metrics.rejected_core += 1
+            if self.trace:
+                _log.debug(
+                    "rejected: core credits %d != target %s, total_credits=%d",
+                    core_cr,
+                    self.core_credit_target,
+                    credits,
+                )
             return
-        # 목표 학점을 초과하는 경우는 제외 (하지만 아직 priority를 다 처리하지 않았으면 계속 탐색 가능)
-        # 단, 이미 너무 많이 초과했으면 제외 (목표 학점 + 3학점 이내는 허용)
-        if total_credits > target_credits + 3:
+        # 총 학점 조건 확인: 목표 학점(또는 가장 가까운 도달 가능 학점)이어야 함
+        if credits not in self.accept:
+            self.metrics.rejected_credits += 1
+            if self.trace:
+                _log.debug(
+                    "rejected: total_credits %d != target %d, core_credits=%d",
+                    credits,
+                    self.target_credits,
+                    core_cr,
+                )
             return
-        if pi_idx >= len(priorities):
-            # 현재 선택된 핵심교양 강의의 학점 합계 계산 (priority 4)
-            current_core_credits = 0
-            for s in current:
-                for p, secs in by_priority.items():
-                    if p == 4 and s in secs:
-                        current_core_credits += s.credit
-                        break
-
-            # 핵심교양 학점 조건 확인: 설정된 경우 정확히 목표 학점이어야 함
-            if core_credit_target is not None and core_credit_target > 0:
-                if current_core_credits != core_credit_target:
-                    print(
-                        f"[DEBUG] Rejected: core credits {current_core_credits} != target {core_credit_target}, total_credits={total_credits}"
+
+        # 모든 조건을 만족하면 시간표 추가
+        self.metrics.leaves_accepted += 1
+        if self.trace:
+            _log.debug("accepted: total_credits=%d, core_credits=%d", credits, core_cr)
+        schedule = ScheduleFromFile(
+            sections=list(self.current),
+            total_credits=credits,
+            mask=occ,
+            alternatives={
+                s.file_id: self.alternatives[s.file_id]
+                for s in self.current
+                if s.file_id in self.alternatives
+            },
+        )
+        if not self.top_k:
+            self.found.append(schedule)
+            if self.on_leaf is not None:
+                self.on_leaf(schedule)
+            return
+        self.seq += 1
+        entry = ((tuple(self.counts), credits), -self.seq, schedule)
+        if len(self.heap) < self.limit:
+            _heapq.heappush(self.heap, entry)
+        elif self.heap and entry[:2] > self.heap[0][:2]:
+            _heapq.heapreplace(self.heap, entry)
+
+    def count(self, memo_size: int = _COUNT_MEMO_SIZE) -> Optional[int]:
+        """조건을 만족하는 시간표 수 (시간표 객체를 만들지 않음).
+        (idx, occ, 학점, 핵심교양 학점)별 부분 문제 결과를 메모하고, 동치류로 묶인
+        분반은 묶인 개수만큼 곱한다. 시간 제한/취소로 멈추면 None"""
+        # future[i]: courses[i:]가 쓸 수 있는 시간 칸. occ 중 이 밖의 칸은 결과와 무관
+        future = [0] * (self.n + 1)
+        for i in range(self.n - 1, -1, -1):
+            future[i] = future[i + 1]
+            for s, _ in self.courses[i][1]:
+                future[i] |= s.mask
+        weight = {
+            s.sid: 1 + len(self.alternatives.get(s.file_id, ()))
+            for _, opts in self.courses
+            for s, _ in opts
+        }
+        memo: Dict[Tuple[int, int, int, int], int] = {}
+
+        def rec(idx: int, credits: int, core_cr: int, occ: int) -> int:
+            if self._done():
+                return 0
+            if idx >= self.n:
+                if self.track_core and core_cr != self.core_need:
+                    return 0
+                return 1 if credits in self.accept else 0
+            key = (idx, occ & future[idx], credits, core_cr)
+            if key in memo:
+                return memo[key]
+            total = 0
+            nxt = self.reach[idx + 1]
+            for s, p in self.courses[idx][1]:
+                if s.mask & occ:
+                    continue
+                new_credits = credits + s.credit
+                new_core = core_cr + self._core_of(s, p)
+                if self._bits_ok(nxt, new_credits, new_core):
+                    total += weight[s.sid] * rec(
+                        idx + 1, new_credits, new_core, occ | s.mask
                     )
-                    return
+            if self._bits_ok(nxt, credits, core_cr):
+                total += rec(idx + 1, credits, core_cr, occ)
+            if not self.stopped and len(memo) < memo_size:
+                memo[key] = total
+            return total
+
+        while True:
+            if not self.accept or not self._bits_ok(self.reach[0], 0, 0):
+                return 0
+            total = rec(0, 0, 0, 0)
+            if self.stopped:
+                return None
+            # 부분 문제 결과는 accept에 따라 달라지므로 넓힐 때 메모도 비움
+            if total or not self.widen():
+                return total
+            memo.clear()
+
+    # occ: 현재까지 배치된 분반들의 주간 비트마스크 OR (배치 = AND 1번 + OR 1번)
+    def _search_static(self, idx: int, credits: int, core_cr: int, occ: int):
+        if self._done() or not self._can_beat(self.suffix_pc[idx]):
+            return
+        if idx >= self.n:
+            self._leaf(credits, core_cr, occ)
+            return
+        key = (idx, occ, credits, core_cr)
+        if self._is_nogood(key):
+            return
+        mark = self._mark()
 
-            # 총 학점 조건 확인: 정확히 목표 학점이어야 함
-            if total_credits != target_credits:
-                print(
-                    f"[DEBUG] Rejected: total_credits {total_credits} != target {target_credits}, core_credits={current_core_credits}"
+        _, sec_list = self.courses[idx]
+        nxt = self.reach[idx + 1]
+        for s, p in sec_list:
+            if s.mask & occ:
+                self.metrics.conflict_prunes += 1
+                continue
+            new_credits = credits + s.credit
+            new_core = core_cr + self._core_of(s, p)
+            # 남은 과목으로 목표 학점/핵심교양 학점에 도달할 수 없으면 가지치기
+            if not self._bits_ok(nxt, new_credits, new_core):
+                self.metrics.reach_prunes += 1
+                continue
+            self.current.append(s)
+            self.counts[p - 1] += 1
+            self._search_static(idx + 1, new_credits, new_core, occ | s.mask)
+            self.counts[p - 1] -= 1
+            self.current.pop()
+
+        # skip this course
+        if self._bits_ok(nxt, credits, core_cr):
+            self._search_static(idx + 1, credits, core_cr, occ)
+        else:
+            self.metrics.reach_prunes += 1
+        self._record_nogood(key, mark)
+
+    def _domains_reach(
+        self,
+        unassigned: List[int],
+        domains: Dict[int, List[Tuple[SectionFromFile, int]]],
+    ) -> int:
+        bits = 1
+        for k in unassigned:
+            dom = domains[k]
+            if dom:
+                bits = _reach_step_planner(
+                    bits,
+                    {(s.credit, self._core_of(s, p)) for s, p in dom},
+                    self.width,
+                    self.valid,
                 )
+        return bits
+
+    def _search_mrv(
+        self,
+        unassigned: List[int],
+        domains: Dict[int, List[Tuple[SectionFromFile, int]]],
+        credits: int,
+        core_cr: int,
+        occ: int,
+    ):
+        if self._done():
+            return
+        if self.top_k and len(self.heap) >= self.limit:
+            extra = [0, 0, 0, 0, 0]
+            for k in unassigned:
+                for p in {p for _, p in domains[k]}:
+                    extra[p - 1] += 1
+            if not self._can_beat(extra):
                 return
+        if not unassigned:
+            self._leaf(credits, core_cr, occ)
+            return
+        # 도메인은 미배정 과목 집합과 occ로 결정되므로 상태 키에 도메인은 불필요
+        key = (tuple(unassigned), occ, credits, core_cr)
+        if self._is_nogood(key):
+            return
+        mark = self._mark()
 
-            # 모든 조건을 만족하면 시간표 추가
-            print(
-                f"[DEBUG] Accepted schedule: total_credits={total_credits}, core_credits={current_core_credits}"
+        # MRV: 남은 호환 분반이 가장 적은 과목 (동률이면 원래 순서).
+        # top-K에서는 랭킹 키가 priority 사전순이므로 가장 높은 priority 과목들 안에서 고름
+        if self.top_k:
+            j = min(
+                unassigned, key=lambda k: (self.min_priority[k], len(domains[k]), k)
             )
-            best.append(
-                ScheduleFromFile(sections=list(current), total_credits=total_credits)
+        else:
+            j = min(unassigned, key=lambda k: (len(domains[k]), k))
+        rest = [k for k in unassigned if k != j]
+        rest_size = sum(len(domains[k]) for k in rest)
+
+        for s, p in domains[j]:
+            new_credits = credits + s.credit
+            new_core = core_cr + self._core_of(s, p)
+            # forward checking: 미배정 과목 도메인에서 s와 충돌하는 분반 제거
+            new_domains = {
+                k: [o for o in domains[k] if not (o[0].mask & s.mask)] for k in rest
+            }
+            self.metrics.conflict_prunes += rest_size - sum(
+                len(new_domains[k]) for k in rest
             )
-            return
+            if not self._bits_ok(
+                self._domains_reach(rest, new_domains), new_credits, new_core
+            ):
+                self.metrics.reach_prunes += 1
+                continue
+            self.current.append(s)
+            self.counts[p - 1] += 1
+            self._search_mrv(rest, new_domains, new_credits, new_core, occ | s.mask)
+            self.counts[p - 1] -= 1
+            self.current.pop()
+
+        # skip this course
+        if self._bits_ok(self._domains_reach(rest, domains), credits, core_cr):
+            self._search_mrv(rest, domains, credits, core_cr, occ)
+        else:
+            self.metrics.reach_prunes += 1
+        self._record_nogood(key, mark)
+
+
+# ---------- 병렬 탐색 (ProcessPoolExecutor) ----------
+# 분반 수가 이 값보다 적으면 프로세스 풀 오버헤드가 더 커서 순차 탐색
+_PARALLEL_MIN_SECTIONS = 30
+_PLANNER_POOL: Optional[_ProcessPoolExecutor] = None
+_PLANNER_POOL_WORKERS = 0
+_PLANNER_POOL_LOCK = _threading.Lock()
+# 요청별 취소 플래그 (worker와 공유하는 메모리, 풀을 만들 때 상속).
+# 요청은 빈 칸 하나에 새 세대 번호를 쓰고, 끝날 때(완료/시간 초과/취소/오류) 지운다.
+# worker는 칸의 값이 자기 세대와 다르면 멈추므로 요청이 돌아간 뒤 남은 서브트리가 돌지 않는다
+_PLANNER_CANCEL_SLOTS = 64
+_PLANNER_CANCEL_FLAGS = None
+_PLANNER_FREE_SLOTS: List[int] = []
+_PLANNER_GENERATION = 0
+# worker 프로세스 쪽 (_init_partition_worker가 설정)
+_WORKER_CANCEL_FLAGS = None
+
+
+def _init_partition_worker(flags) -> None:
+    global _WORKER_CANCEL_FLAGS
+    _WORKER_CANCEL_FLAGS = flags
+
+
+def _planner_mp_context():
+    """worker 시작 방식. 서버 프로세스에는 스레드(요청, 카탈로그 감시)가 떠 있어서
+    fork하면 잠긴 lock까지 복사될 수 있으므로 forkserver (없는 플랫폼은 spawn)"""
+    if "forkserver" in _multiprocessing.get_all_start_methods():
+        return _multiprocessing.get_context("forkserver")
+    return _multiprocessing.get_context("spawn")
+
+
+def _get_planner_pool(workers: int) -> _ProcessPoolExecutor:
+    """프로세스 풀은 요청마다 만들지 않고 재사용 (worker 수가 바뀌면 새로 만듦).
+    여러 요청 스레드가 동시에 불러도 풀을 하나만 만들도록 잠금"""
+    global _PLANNER_POOL, _PLANNER_POOL_WORKERS, _PLANNER_CANCEL_FLAGS
+    with _PLANNER_POOL_LOCK:
+        ctx = _planner_mp_context()
+        if _PLANNER_CANCEL_FLAGS is None:
+            _PLANNER_CANCEL_FLAGS = ctx.Array(
+                "q", [-1] * _PLANNER_CANCEL_SLOTS, lock=False
+            )
+            _PLANNER_FREE_SLOTS[:] = range(_PLANNER_CANCEL_SLOTS)
+        if _PLANNER_POOL is None or _PLANNER_POOL_WORKERS != workers:
+            if _PLANNER_POOL is not None:
+                _PLANNER_POOL.shutdown(wait=False)
+            _PLANNER_POOL = _ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=ctx,
+                initializer=_init_partition_worker,
+                initargs=(_PLANNER_CANCEL_FLAGS,),
+            )
+            _PLANNER_POOL_WORKERS = workers
+        return _PLANNER_POOL
+
+
+def _drop_planner_pool(pool: _ProcessPoolExecutor) -> None:
+    """고장 난 풀을 버림 (다음 요청이 새로 만듦)"""
+    global _PLANNER_POOL
+    with _PLANNER_POOL_LOCK:
+        if _PLANNER_POOL is pool:
+            _PLANNER_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _acquire_cancel_slot() -> Optional[Tuple[int, int]]:
+    """(칸, 세대). 칸이 모두 쓰이는 중이면 None (그 요청의 worker는 deadline으로만 멈춤)"""
+    global _PLANNER_GENERATION
+    with _PLANNER_POOL_LOCK:
+        if not _PLANNER_FREE_SLOTS:
+            return None
+        slot = _PLANNER_FREE_SLOTS.pop()
+        _PLANNER_GENERATION += 1
+        _PLANNER_CANCEL_FLAGS[slot] = _PLANNER_GENERATION
+        return slot, _PLANNER_GENERATION
+
+
+def _release_cancel_slot(slot: Tuple[int, int]) -> None:
+    with _PLANNER_POOL_LOCK:
+        _PLANNER_CANCEL_FLAGS[slot[0]] = -1
+        _PLANNER_FREE_SLOTS.append(slot[0])
+
+
+def _search_partition_worker(
+    args,
+) -> Tuple[List[Tuple[Any, int, ScheduleFromFile]], bool, SearchMetrics]:
+    """worker 프로세스: (start, prefix)로 고정된 서브트리 하나를 탐색.
+    deadline은 요청의 절대 시각 (time.monotonic은 같은 호스트의 프로세스끼리 공유)"""
+    (
+        courses,
+        target,
+        core_target,
+        limit,
+        mrv,
+        top_k,
+        alternatives,
+        deadline,
+        band,
+        slot,
+        start,
+        prefix,
+    ) = args
+    cancel_token = None
+    if slot is not None and _WORKER_CANCEL_FLAGS is not None:
+        flags = _WORKER_CANCEL_FLAGS
+        index, generation = slot
+        cancel_token = SearchCancelToken(poll=lambda: flags[index] != generation)
+    search = _ScheduleSearch(
+        courses,
+        target,
+        core_target,
+        limit,
+        mrv=mrv,
+        alternatives=alternatives,
+        top_k=top_k,
+        deadline=deadline,
+        cancel_token=cancel_token,
+    )
+    search.use_band(band)
+    search.run(start, prefix)
+    return search.entries(), search.stopped, search.metrics
+
+
+def _run_parallel_search(
+    search: _ScheduleSearch,
+    workers: int,
+    cancel_token: Optional[SearchCancelToken],
+) -> Tuple[List[ScheduleFromFile], bool]:
+    """첫 몇 단계의 분기로 서브트리를 나눠 프로세스 풀에서 탐색하고,
+    (rank key, 서브트리 순서, 서브트리 내 발견 순서)로 결정적으로 병합.
+    worker들의 카운터는 모두 성공했을 때만 search.metrics에 더함.
+    worker 오류나 풀 고장은 그대로 올려보내고, 호출자가 순차 탐색으로 대신한다"""
+    parts = search.partition(workers * 4)
+    pool = _get_planner_pool(workers)
+    slot = _acquire_cancel_slot()
+    futures: Dict[Any, int] = {}
+    try:
+        for part_idx, (start, prefix) in enumerate(parts):
+            fut = pool.submit(
+                _search_partition_worker,
+                (
+                    search.courses,
+                    search.target_credits,
+                    search.core_credit_target,
+                    search.limit,
+                    search.mrv,
+                    search.top_k,
+                    search.alternatives,
+                    search.deadline,
+                    search.band,
+                    slot,
+                    start,
+                    prefix,
+                ),
+            )
+            futures[fut] = part_idx
+        merged: List[Tuple[Any, int, int, ScheduleFromFile]] = []
+        part_metrics: List[SearchMetrics] = []
+        stopped = False
+        pending = set(futures)
+        while pending:
+            done, pending = _futures_wait(pending, timeout=0.1)
+            for fut in done:
+                entries, part_stopped, metrics = fut.result()
+                stopped = stopped or part_stopped
+                part_metrics.append(metrics)
+                merged.extend((key, futures[fut], seq, sc) for key, seq, sc in entries)
+            timed_out = (
+                search.deadline is not None and _time.monotonic() >= search.deadline
+            )
+            if pending and (
+                timed_out or (cancel_token is not None and cancel_token.cancelled)
+            ):
+                stopped = True
+                break
+    except _BrokenProcessPool:
+        _drop_planner_pool(pool)
+        raise
+    finally:
+        # 대기 중인 서브트리는 취소하고, 실행 중인 것은 취소 플래그로 멈춤
+        for fut in futures:
+            fut.cancel()
+        if slot is not None:
+            _release_cancel_slot(slot)
+
+    for metrics in part_metrics:
+        search.metrics.add(metrics)
+    if search.top_k:
+        merged.sort(key=lambda e: (_neg_key(e[0]), e[1], e[2]))
+    else:
+        merged.sort(key=lambda e: (e[1], e[2]))
+    return [e[3] for e in merged[: search.limit]], stopped
+
+
+def _neg_key(key: Tuple[Tuple[int, ...], int]) -> Tuple[Tuple[int, ...], int]:
+    """rank key 내림차순 정렬용"""
+    counts, credits = key
+    return tuple(-c for c in counts), -credits
+
+
+# ---------- 다목적 랭킹 (NumPy) ----------
+# 시간표 지표. 가중치 합이 작을수록 좋음 (음수 가중치 = 클수록 좋음)
+#   days: 등교 일수, first_slot: 가장 이른 수업 시작 슬롯, last_slot: 가장 늦은 수업 끝 슬롯,
+#   gap: 하루 첫 수업~마지막 수업 사이 빈 슬롯 합 (공강 시간), longest_block: 가장 긴 연속 수업 슬롯 수
+SCHEDULE_OBJECTIVES = ("days", "first_slot", "last_slot", "gap", "longest_block")
+# objective가 있으면 limit의 몇 배를 후보로 찾아서 다시 정렬할지
+_RANK_POOL_FACTOR = 20
+_WEEK_DAYS = 6  # 월~토
+_WEEK_BYTES = (_WEEK_DAYS * _SLOTS_PER_DAY + 7) // 8
+
+
+def schedule_metrics(schedules: List[ScheduleFromFile]) -> Dict[str, _np.ndarray]:
+    """시간표들의 주간 점유를 (시간표, 요일, 슬롯) bool 행렬로 만들어 지표를 한 번에 계산.
+    슬롯 번호는 1부터 (1 = 09:00-09:30), 수업이 없는 시간표의 first/last_slot은 0"""
+    n = len(schedules)
+    raw = b"".join(sc.mask.to_bytes(_WEEK_BYTES, "little") for sc in schedules)
+    bits = _np.unpackbits(
+        _np.frombuffer(raw, dtype=_np.uint8).reshape(n, _WEEK_BYTES),
+        axis=1,
+        bitorder="little",
+    )
+    grid = (
+        bits[:, : _WEEK_DAYS * _SLOTS_PER_DAY]
+        .reshape(n, _WEEK_DAYS, _SLOTS_PER_DAY)
+        .view(bool)
+    )
+    occupied = grid.sum(axis=2)  # (n, 요일)
+    used = occupied > 0
+    # 요일별 첫/마지막 수업 슬롯 (수업 없는 요일의 값은 아래에서 used로 가림)
+    first = grid.argmax(axis=2) + 1
+    last = _SLOTS_PER_DAY - grid[:, :, ::-1].argmax(axis=2)
+    days = used.sum(axis=1)
+
+    # 가장 긴 연속 블록: 슬롯 축으로 run length를 누적
+    run = _np.zeros((n, _WEEK_DAYS), dtype=_np.int16)
+    longest = _np.zeros((n, _WEEK_DAYS), dtype=_np.int16)
+    for k in range(_SLOTS_PER_DAY):
+        run = (run + 1) * grid[:, :, k]
+        _np.maximum(longest, run, out=longest)
 
-        p = priorities[pi_idx]
-        courses = list(grouped[p].items())  # (course_id, [sections])
+    return {
+        "days": days,
+        "first_slot": _np.where(
+            days > 0, _np.where(used, first, _SLOTS_PER_DAY + 1).min(axis=1), 0
+        ),
+        "last_slot": _np.where(used, last, 0).max(axis=1),
+        "gap": _np.where(used, last - first + 1 - occupied, 0).sum(axis=1),
+        "longest_block": longest.max(axis=1),
+    }
 
-        def backtrack_course(
-            idx: int,
-            curr: List[SectionFromFile],
-            taken: Set[str],
-            credits: int,
-            core_cr: int,
-        ):
-            if len(best) >= limit:
-                return
-            # 목표 학점을 초과하는 경우는 제외 (하지만 아직 course를 다 처리하지 않았으면 계속 탐색 가능)
-            # 단, 이미 너무 많이 초과했으면 제외 (목표 학점 + 3학점 이내는 허용)
-            if credits > target_credits + 3:
-                return
-            if idx >= len(courses):
-                dfs(pi_idx + 1, curr, taken, credits, core_cr)
-                return
 
-            course_id, sec_list = courses[idx]
+def rank_schedules(
+    schedules: List[ScheduleFromFile], weights: Dict[str, float]
+) -> List[ScheduleFromFile]:
+    """가중치 합(Σ weight × 지표)이 작은 순으로 정렬. 같으면 원래 순서 유지.
+    가중치가 nan/inf면 ValueError (점수가 nan이 되면 argsort 순서가 의미 없음)"""
+    unknown = set(weights) - set(SCHEDULE_OBJECTIVES)
+    if unknown:
+        raise ValueError(f"unknown schedule objectives: {sorted(unknown)}")
+    bad = sorted(name for name, w in weights.items() if not _math.isfinite(w))
+    if bad:
+        raise ValueError(f"schedule objective weights must be finite: {bad}")
+    if not schedules:
+        return []
+    metrics = schedule_metrics(schedules)
+    score = _np.zeros(len(schedules))
+    for name, w in weights.items():
+        if w:
+            score += w * metrics[name]
+    return [schedules[i] for i in _np.argsort(score, kind="stable")]
 
-            picked_any = False
-            for s in sec_list:
-                if course_id in taken:
-                    continue
-                if not _can_place_planner(curr, s):
-                    continue
-                new_core = core_cr + (s.credit if p == 4 else 0)
-                # 핵심교양 학점 제한: 설정된 학점을 초과하지 않도록 (탐색 중에는 여유 허용)
-                # 목표: 핵심교양이 정확히 목표 학점이어야 함
-                if (
-                    (p == 4)
-                    and (core_credit_target is not None)
-                    and (new_core > core_credit_target)
-                ):
-                    continue
 
-                curr.append(s)
-                taken.add(course_id)
-                picked_any = True
-                backtrack_course(idx + 1, curr, taken, credits + s.credit, new_core)
-                taken.remove(course_id)
-                curr.pop()
+def _build_schedule_search(
+    by_priority: Dict[int, List[SectionFromFile]],
+    target_credits: int,
+    core_credit_target: Optional[int],
+    limit: int,
+    ordering: str,
+    top_k: bool,
+    time_budget: Optional[float],
+    cancel_token: Optional[SearchCancelToken],
+    blocked_mask: int = 0,
+) -> Optional[_ScheduleSearch]:
+    """입력 정리(제외 시간대 분반 제거, 과목 펼침, 동치류 묶기, ordering 결정) 후
+    탐색 객체 생성. 탐색할 것이 없거나 학점 조건을 만족할 수 없으면 None"""
+    deadline = None if time_budget is None else _time.monotonic() + time_budget
+    if blocked_mask:
+        # 제외 시간대에 걸치는 분반은 탐색 전에 제거 (웹강의는 mask가 0이라 남음)
+        by_priority = {
+            p: [s for s in secs if not (s.mask & blocked_mask)]
+            for p, secs in by_priority.items()
+        }
+    # 빈 priority 제거 (효율성 향상)
+    by_priority = {p: secs for p, secs in by_priority.items() if secs}
+    if not by_priority:
+        return None
 
-            # skip this course
-            backtrack_course(idx + 1, curr, taken, credits, core_cr)
+    courses = _flatten_courses_planner(by_priority)
+    n_sections = sum(len(opts) for _, opts in courses)
+    # 같은 시간의 분반은 하나의 동치류로 묶어서 탐색 (결과에는 대안 분반으로 첨부)
+    courses, alternatives = _collapse_equivalent_planner(courses)
+    if ordering == "auto":
+        space = sum(_math.log10(len(opts) + 1) for _, opts in courses)
+        if space >= _ANNEAL_AUTO_LOG10:
+            ordering = "anneal"
+        else:
+            ordering = "mrv" if n_sections >= _MRV_AUTO_THRESHOLD else "static"
+    anneal_budget = None
+    if ordering == "anneal":
+        anneal_budget = _ANNEAL_TIME_BUDGET
+        if time_budget is not None:
+            anneal_budget = min(anneal_budget, time_budget * _ANNEAL_BUDGET_SHARE)
+
+    _log.debug(
+        "schedule search: priorities=%s target=%s core=%s courses=%d sections=%d ordering=%s",
+        sorted(by_priority),
+        target_credits,
+        core_credit_target,
+        len(courses),
+        n_sections,
+        ordering,
+    )
 
-        backtrack_course(0, current, taken_courses, total_credits, core_credits)
+    search = _ScheduleSearch(
+        courses,
+        target_credits,
+        core_credit_target,
+        limit,
+        mrv=(ordering == "mrv"),
+        alternatives=alternatives,
+        top_k=top_k,
+        deadline=deadline,
+        cancel_token=cancel_token,
+        anneal_budget=anneal_budget,
+    )
+    if not search.accept:
+        _log.debug("no credit combination reaches core target %s", core_credit_target)
+        return None
+    if search.accept != [target_credits]:
+        _log.debug(
+            "%s credits unreachable, using nearest %s", target_credits, search.accept
+        )
+    search.trace = (
+        _TRACE_SAMPLE_RATE > 0
+        and _log.isEnabledFor(_logging.DEBUG)
+        and _random.random() < _TRACE_SAMPLE_RATE
+    )
+    return search
 
-    dfs(0, [], set(), 0, 0)
 
-    print(f"[DEBUG generate_schedules] Found {len(best)} candidate schedules")
-    if len(best) == 0:
-        print(f"[DEBUG generate_schedules] No schedules found. Possible reasons:")
-        print(f"  - Cannot find combination that sums to {target_credits} credits")
-        if core_credit_target:
-            print(
-                f"  - Cannot find combination with exactly {core_credit_target} core credits"
-            )
-        print(f"  - Time conflicts prevent valid combinations")
+def generate_schedules(
+    by_priority: Dict[int, List[SectionFromFile]],
+    target_credits: int,
+    core_credit_target: Optional[int] = None,
+    limit: int = 30,
+    ordering: str = "auto",
+    top_k: bool = True,
+    time_budget: Optional[float] = None,
+    cancel_token: Optional[SearchCancelToken] = None,
+    workers: int = 1,
+    blocked_mask: int = 0,
+    objective: Optional[Dict[str, float]] = None,
+    candidates: Optional[int] = None,
+    pareto: bool = False,
+) -> ScheduleResults:
+    """시간표 생성
+
+    정확히 target_credits를 만들 수 없으면 (학점 조합 때문이든 시간 충돌 때문이든)
+    시간표를 만들 수 있는 가장 가까운 총 학점의 시간표를 대신 반환한다.
+    ordering: "static" (priority/파일 순서), "mrv" (MRV + forward checking),
+    "anneal" (시뮬레이티드 어닐링, 전부 찾는다는 보장이 없어 항상 partial=True),
+    "auto" (탐색 공간이 10**_ANNEAL_AUTO_LOG10 이상이면 anneal,
+    아니면 선택한 분반이 _MRV_AUTO_THRESHOLD개 이상일 때 mrv)
+    top_k: True면 (priority_counts, total_credits) 기준 진짜 상위 limit개,
+    False면 먼저 찾은 limit개를 정렬해서 반환
+    time_budget(초)이 지나거나 cancel_token이 취소되면 지금까지 찾은 최선을
+    partial=True로 반환
+    workers > 1이고 분반이 _PARALLEL_MIN_SECTIONS개 이상이면 프로세스 풀에서 병렬 탐색
+    (결과는 순차 탐색과 같은 순서로 결정적으로 병합)
+    blocked_mask: 제외 시간대 주간 비트마스크 (time_window_mask). 걸치는 분반은 탐색 전에 제외
+    objective: {지표: 가중치} (SCHEDULE_OBJECTIVES). 주면 위 기준 상위 candidates개
+    (기본 limit * _RANK_POOL_FACTOR)를 찾은 뒤 rank_schedules로 다시 정렬해 limit개 반환
+    pareto: 같은 후보들 중 (총 학점, priority 커버리지, 등교 일수, 공강 시간)에서
+    지배되지 않는 시간표만 반환 (pareto_front). objective가 있으면 그 순서로 정렬
+    탐색 카운터는 결과의 .metrics로 반환하고 search_metrics_stats()에 누적
+    limit이 0 이하면 탐색하지 않고 빈 결과"""
+    started = _time.perf_counter()
+    if limit <= 0:
+        return ScheduleResults(metrics=SearchMetrics())
+    by_priority = {p: secs for p, secs in by_priority.items() if secs}
+    search_limit = limit
+    if objective or pareto:
+        search_limit = max(limit, candidates or limit * _RANK_POOL_FACTOR)
+    search = _build_schedule_search(
+        by_priority,
+        target_credits,
+        core_credit_target,
+        search_limit,
+        ordering,
+        top_k,
+        time_budget,
+        cancel_token,
+        blocked_mask,
+    )
+    if search is None:
+        return ScheduleResults(metrics=SearchMetrics())
+    n_sections = sum(len(opts) for _, opts in search.courses) + sum(
+        len(alts) for alts in search.alternatives.values()
+    )
+    if (
+        workers > 1
+        and n_sections >= _PARALLEL_MIN_SECTIONS
+        and search.anneal_budget is None
+    ):
+        try:
+            while True:
+                best, search.stopped = _run_parallel_search(
+                    search, workers, cancel_token
+                )
+                # 서브트리마다는 넓힐 수 없으므로 전체 결과가 비었을 때 여기서 넓힘
+                if best or search.stopped or not search.widen():
+                    break
+        except Exception as e:
+            _log.warning("parallel schedule search failed, running sequentially: %r", e)
+            best = search.run()
+    else:
+        best = search.run()
+    metrics = _finish_search_metrics("generate", search, started)
+    _log.debug("found %d schedules (partial=%s) %s", len(best), search.stopped, metrics)
+    # top_k면 이미 랭킹 순서 (힙에서 정렬됨)
+    if not top_k:
+        _sort_by_priority_counts(best, by_priority)
+    if pareto:
+        best = pareto_front(best, by_priority)
+    if objective:
+        best = rank_schedules(best, objective)
+    if objective or pareto:
+        best = best[:limit]
+    return ScheduleResults(best, partial=search.stopped, metrics=metrics)
+
+
+def _priority_counter(
+    by_priority: Dict[int, List[SectionFromFile]],
+) -> Callable[[ScheduleFromFile], Tuple[int, int, int, int, int]]:
+    """시간표 -> priority별 과목 수 함수 (section id로 O(1) 조회)"""
+    # section id -> priority (여러 priority에 있으면 먼저 나온 것)
+    priority_of: Dict[int, int] = {}
+    for p, secs in by_priority.items():
+        for s in secs:
+            priority_of.setdefault(s.sid, p)
 
     def priority_counts(schedule: ScheduleFromFile) -> Tuple[int, int, int, int, int]:
         counts = [0, 0, 0, 0, 0]
         for s in schedule.sections:
-            for p, secs in by_priority.items():
-                if s in secs:
-                    counts[p - 1] += 1
-                    break
+            counts[priority_of[s.sid] - 1] += 1
         return tuple(counts)
 
+    return priority_counts
+
+
+def pareto_front(
+    schedules: List[ScheduleFromFile], by_priority: Dict[int, List[SectionFromFile]]
+) -> List[ScheduleFromFile]:
+    """(총 학점 ↑, priority 커버리지 ↑, 등교 일수 ↓, 공강 시간 ↓)에서 다른 시간표에
+    지배되지 않는 시간표들 (skyline). 지표가 모두 같은 시간표는 앞의 것 하나만 남김.
+    계산은 _skyline 참고"""
+    if not schedules:
+        return []
+    priority_counts = _priority_counter(by_priority)
+    # priority 커버리지: priority_counts 사전순과 같은 순서의 정수
+    cover = _np.array(
+        [
+            sum(c << (6 * (4 - i)) for i, c in enumerate(priority_counts(sc)))
+            for sc in schedules
+        ],
+        dtype=_np.int64,
+    )
+    metrics = schedule_metrics(schedules)
+    credits = _np.array([sc.total_credits for sc in schedules], dtype=_np.int64)
+    # 모두 클수록 좋은 방향으로
+    vec = _np.stack([cover, credits, -metrics["days"], -metrics["gap"]], axis=1)
+    return [schedules[i] for i in _skyline(vec)]
+
+
+def _staircase_dominated(points, roles) -> List[bool]:
+    """points: 사전순 내림차순으로 정렬된 (x, y, z) 목록.
+    roles[i]: 0 = 질의만, 1 = 추가만, 2 = 질의 후 지배되지 않으면 추가.
+    앞서 추가된 점 중 y, z가 모두 같거나 큰 점이 있으면 True (x는 정렬 순서로 보장).
+
+    추가된 점의 (y, z) 극대점만 y 오름차순(= z 내림차순) 계단으로 유지하므로
+    y 이상인 첫 계단점의 z가 그 범위의 최댓값 -> 질의는 bisect 한 번.
+    계단에서 빠지는 점은 한 번씩만 지워짐 -> 전체 O(n log n) (리스트 삽입 memmove 제외)."""
+    ys: List[int] = []
+    zs: List[int] = []
+    out = [False] * len(points)
+    for i, (_, y, z) in enumerate(points):
+        pos = bisect_left(ys, y)
+        covered = pos < len(ys) and zs[pos] >= z
+        if roles[i] != 1 and covered:
+            out[i] = True
+            continue
+        if roles[i] == 0 or covered:
+            continue
+        # 새 점에 지배되는 계단점(y가 작고 z도 작거나 같음)은 pos 바로 앞에 몰려 있음
+        j = pos
+        while j > 0 and zs[j - 1] <= z:
+            j -= 1
+        stop = pos + 1 if pos < len(ys) and ys[pos] == y else pos
+        ys[j:stop] = [y]
+        zs[j:stop] = [z]
+    return out
+
+
+def _skyline_4d(rows) -> List[int]:
+    """rows: 사전순 내림차순으로 정렬된 4지표 튜플. 남는 위치들 (오름차순).
+
+    분할 정복: 앞 절반은 첫 지표가 모두 같거나 크므로 뒤 절반을 지배할 수만 있다.
+    각 절반의 skyline을 구한 뒤, 뒤 절반에서 앞 절반 skyline에 지배되는 점을
+    나머지 3지표 계단 sweep으로 걸러냄 -> O(n log^2 n)."""
+    n = len(rows)
+    if n <= 1:
+        return list(range(n))
+    mid = n // 2
+    hi = _skyline_4d(rows[:mid])
+    lo = [mid + k for k in _skyline_4d(rows[mid:])]
+    # 나머지 3지표가 같으면 앞 절반 점(추가)이 먼저 와야 뒤 절반 중복이 걸러짐
+    merged = sorted(
+        [(rows[k][1:], 0, k) for k in hi] + [(rows[k][1:], 1, k) for k in lo],
+        key=lambda e: (e[0], -e[1]),
+        reverse=True,
+    )
+    dominated = _staircase_dominated(
+        [e[0] for e in merged], [1 if e[1] == 0 else 0 for e in merged]
+    )
+    gone = {e[2] for e, dead in zip(merged, dominated) if dead}
+    return hi + [k for k in lo if k not in gone]
+
+
+def _skyline(vec) -> List[int]:
+    """vec (n x d, 클수록 좋음)에서 다른 행에 지배되지 않는 행 번호들 (사전순 내림차순).
+    값이 모두 같은 행은 번호가 작은 것 하나만 남김.
+
+    사전순 내림차순으로 정렬하면 지배하는 쪽이 항상 앞에 온다.
+    - 값이 다른 지표가 2개 이하: 두 번째 지표가 앞선 최댓값보다 클 때만 남음
+      -> 정렬 O(n log n) + 누적 최댓값 O(n)
+    - 3개: 나머지 두 지표의 계단을 bisect로 유지 -> O(n log n)
+    - 4개: 첫 지표로 반씩 나누는 분할 정복 -> O(n log^2 n)
+    - 5개 이상: 앞선 skyline 점 전체와 비교 (최악 O(n * skyline 크기))
+    모든 행이 같은 지표(예: 총 학점이 전부 목표 학점)는 먼저 빼고 계산한다."""
+    vec = vec[:, (vec != vec[0]).any(axis=0)]
+    n, d = vec.shape
+    if d == 0:
+        return [0]
+    idx = _np.arange(n)
+    # 같은 벡터끼리는 원래 순서가 앞선 것이 먼저 오도록 -idx를 가장 낮은 키로
+    order = _np.lexsort((-idx,) + tuple(vec[:, k] for k in reversed(range(d))))[::-1]
+
+    if d <= 2:
+        last = vec[order, d - 1]
+        best = _np.maximum.accumulate(last)
+        kept = _np.concatenate(([True], last[1:] > best[:-1]))
+        return [int(i) for i in order[kept]]
+
+    if d <= 4:
+        rows = [tuple(r) for r in vec[order].tolist()]
+        if d == 3:
+            dominated = _staircase_dominated(rows, [2] * n)
+            return [int(i) for i, dead in zip(order, dominated) if not dead]
+        return [int(order[k]) for k in _skyline_4d(rows)]
+
+    front = _np.empty_like(vec)
+    size = 0
+    keep: List[int] = []
+    for i in order:
+        v = vec[i]
+        # 앞선 skyline 점이 모든 지표에서 같거나 좋으면 지배됨 (완전히 같으면 중복)
+        if size and (front[:size] >= v).all(axis=1).any():
+            continue
+        front[size] = v
+        size += 1
+        keep.append(int(i))
+    return keep
+
+
+def _sort_by_priority_counts(
+    best: List[ScheduleFromFile], by_priority: Dict[int, List[SectionFromFile]]
+):
+    """top_k=False 결과 정렬: (priority_counts, total_credits) 내림차순"""
+    priority_counts = _priority_counter(by_priority)
     # Sort by priority counts (desc), then total credits (desc)
     best.sort(key=lambda sc: (priority_counts(sc), sc.total_credits), reverse=True)
-    return best
+
+
+def count_schedules(
+    by_priority: Dict[int, List[SectionFromFile]],
+    target_credits: int,
+    core_credit_target: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    cancel_token: Optional[SearchCancelToken] = None,
+    memo_size: int = _COUNT_MEMO_SIZE,
+    blocked_mask: int = 0,
+) -> Optional[int]:
+    """generate_schedules가 limit 없이 찾을 시간표 개수 (목표 학점을 만들 수 없으면
+    가장 가까운 학점 기준). 시간표 목록은 만들지 않는다.
+    memo_size: 부분 문제 메모 최대 크기, time_budget(초)이 지나거나 취소되면 None"""
+    started = _time.perf_counter()
+    search = _build_schedule_search(
+        by_priority,
+        target_credits,
+        core_credit_target,
+        1,
+        "static",
+        False,
+        time_budget,
+        cancel_token,
+        blocked_mask,
+    )
+    if search is None:
+        return 0
+    total = search.count(memo_size)
+    _finish_search_metrics("count", search, started)
+    return total
+
+
+# ---------- 탐색 지표 집계 ----------
+class _SearchMetricsAggregate:
+    """탐색 종류별 (generate/count/stream) 호출 수, 중단 수, SearchMetrics 합계"""
+
+    def __init__(self):
+        self._lock = _threading.Lock()
+        self._data: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, kind: str, metrics: SearchMetrics, partial: bool):
+        with self._lock:
+            item = self._data.setdefault(
+                kind,
+                {
+                    "calls": 0,
+                    "partial": 0,
+                    "max_wall_time": 0.0,
+                    "totals": SearchMetrics(),
+                },
+            )
+            item["calls"] += 1
+            item["partial"] += int(partial)
+            item["max_wall_time"] = max(item["max_wall_time"], metrics.wall_time)
+            item["totals"].add(metrics)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                kind: {**item, "totals": item["totals"].as_dict()}
+                for kind, item in self._data.items()
+            }
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_SEARCH_METRICS = _SearchMetricsAggregate()
+
+
+def _finish_search_metrics(
+    kind: str, search: _ScheduleSearch, started: float
+) -> SearchMetrics:
+    search.metrics.wall_time = _time.perf_counter() - started
+    _SEARCH_METRICS.record(kind, search.metrics, search.stopped)
+    return search.metrics
+
+
+def search_metrics_stats() -> Dict[str, Dict[str, Any]]:
+    """프로세스 시작 후 누적된 탐색 지표 (metrics 엔드포인트용)"""
+    return _SEARCH_METRICS.stats()
+
+
+def reset_search_metrics():
+    _SEARCH_METRICS.clear()
+
+
+# ---------- 결과 캐시 (사용자 간 공유 LRU + TTL) ----------
+_SCHEDULE_CACHE_SIZE = 256
+_SCHEDULE_CACHE_TTL = 600.0  # 초
+
+
+class _ScheduleCache:
+    """generate_schedules 결과 LRU 캐시 (TTL, 적중/실패 카운터, 스레드 안전)"""
+
+    def __init__(
+        self, maxsize: int = _SCHEDULE_CACHE_SIZE, ttl: float = _SCHEDULE_CACHE_TTL
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = _OrderedDict()  # key -> (저장 시각, schedules)
+        self._lock = _threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[List[ScheduleFromFile]]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or _time.monotonic() - item[0] > self.ttl:
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def put(self, key: str, schedules: List[ScheduleFromFile]):
+        with self._lock:
+            self._data[key] = (_time.monotonic(), schedules)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_SCHEDULE_CACHE = _ScheduleCache()
+
+
+def _catalog_version() -> int:
+    """현재 카탈로그의 subject_json 버전 (_dir_fingerprint)"""
+    return get_catalog().version
+
+
+def _schedule_cache_key(
+    by_priority: Dict[int, List[SectionFromFile]],
+    target_credits: int,
+    core_credit_target: Optional[int],
+    limit: int,
+    blocked_mask: int = 0,
+    objective: Optional[Dict[str, float]] = None,
+    pareto: bool = False,
+    ordering: str = "auto",
+    top_k: bool = True,
+    candidates: Optional[int] = None,
+    catalog_version: Optional[int] = None,
+) -> str:
+    """결과에 영향을 주는 generate_schedules 인자 전부 (priority별 정렬된 file_id, 목표 학점,
+    핵심교양 학점, limit, 제외 시간대, 정렬 기준, 탐색 방식, 후보 수)와 카탈로그 버전의 정규화 해시.
+    catalog_version은 by_priority를 만든 스냅샷의 버전 (None이면 현재 카탈로그).
+    worker 수는 결과를 바꾸지 않으므로 (병렬 탐색도 같은 결과) 넣지 않는다"""
+    canon = {
+        "sel": {
+            str(p): sorted(s.file_id for s in secs)
+            for p, secs in by_priority.items()
+            if secs
+        },
+        "target": target_credits,
+        "core": core_credit_target,
+        "limit": limit,
+        "blocked": blocked_mask,
+        "objective": objective or None,
+        "pareto": pareto,
+        "ordering": ordering,
+        "top_k": top_k,
+        "candidates": candidates,
+        "catalog": (_catalog_version() if catalog_version is None else catalog_version),
+    }
+    raw = _json_module.dumps(canon, sort_keys=True, ensure_ascii=False)
+    return _hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def generate_schedules_cached(
+    by_priority: Dict[int, List[SectionFromFile]],
+    target_credits: int,
+    core_credit_target: Optional[int] = None,
+    limit: int = 30,
+    blocked_mask: int = 0,
+    objective: Optional[Dict[str, float]] = None,
+    pareto: bool = False,
+    ordering: str = "auto",
+    top_k: bool = True,
+    candidates: Optional[int] = None,
+    workers: int = 1,
+    time_budget: Optional[float] = None,
+    cancel_token: Optional[SearchCancelToken] = None,
+    catalog_version: Optional[int] = None,
+) -> ScheduleResults:
+    """캐시를 거치는 generate_schedules. 같은 선택이면 사용자와 관계없이 재사용.
+    time_budget/cancel_token은 키에 넣지 않는다: 중간에 멈춘 결과(partial)는 캐시하지 않으므로
+    캐시에는 끝까지 탐색한 결과만 있다.
+    catalog_version: by_priority를 꺼낸 카탈로그 스냅샷의 버전. 그 사이 카탈로그가 다시
+    로드돼도 옛 분반으로 찾은 결과가 새 버전 키로 저장되지 않도록 호출자가 넘긴다"""
+    key = _schedule_cache_key(
+        by_priority,
+        target_credits,
+        core_credit_target,
+        limit,
+        blocked_mask,
+        objective,
+        pareto,
+        ordering,
+        top_k,
+        candidates,
+        catalog_version,
+    )
+    cached = _SCHEDULE_CACHE.get(key)
+    metrics = None
+    if cached is None:
+        result = generate_schedules(
+            by_priority,
+            target_credits,
+            core_credit_target,
+            limit,
+            ordering=ordering,
+            top_k=top_k,
+            time_budget=time_budget,
+            cancel_token=cancel_token,
+            workers=workers,
+            blocked_mask=blocked_mask,
+            objective=objective,
+            candidates=candidates,
+            pareto=pareto,
+        )
+        if result.partial:
+            return result
+        cached = list(result)
+        metrics = result.metrics
+        _SCHEDULE_CACHE.put(key, cached)
+    # 호출자가 schedule에 속성을 붙이므로 (credits_by_category 등) 사본을 돌려줌
+    return ScheduleResults((_dc_replace(sc) for sc in cached), metrics=metrics)
+
+
+def schedule_cache_stats() -> Dict[str, int]:
+    return _SCHEDULE_CACHE.stats()
+
+
+def invalidate_schedule_cache():
+    """카탈로그(강의 데이터)를 다시 읽었을 때 호출"""
+    _SCHEDULE_CACHE.clear()
+
+
+# 스트리밍: 탐색 스레드 -> 소비자 사이 버퍼 크기 (가득 차면 탐색이 기다림)
+_STREAM_BUFFER = 8
+_STREAM_DONE = object()
+
+
+def iter_schedules(
+    by_priority: Dict[int, List[SectionFromFile]],
+    target_credits: int,
+    core_credit_target: Optional[int] = None,
+    limit: int = 30,
+    ordering: str = "auto",
+    time_budget: Optional[float] = None,
+    cancel_token: Optional[SearchCancelToken] = None,
+    blocked_mask: int = 0,
+) -> Iterator[ScheduleFromFile]:
+    """찾는 즉시 ScheduleFromFile을 하나씩 내보내는 generate_schedules 스트리밍 버전.
+    랭킹 없이 발견 순서로 최대 limit개. 탐색은 별도 스레드에서 돌고,
+    소비자가 generator를 닫으면(close) 탐색도 멈춘다."""
+    if limit <= 0:
+        return
+    started = _time.perf_counter()
+    stop = SearchCancelToken(
+        poll=(lambda: cancel_token.cancelled) if cancel_token is not None else None
+    )
+    search = _build_schedule_search(
+        by_priority,
+        target_credits,
+        core_credit_target,
+        limit,
+        ordering,
+        False,
+        time_budget,
+        stop,
+        blocked_mask,
+    )
+    if search is None:
+        return
+
+    buf: _queue.Queue = _queue.Queue(maxsize=_STREAM_BUFFER)
+
+    def put(item) -> None:
+        while not stop.cancelled:
+            try:
+                buf.put(item, timeout=0.1)
+                return
+            except _queue.Full:
+                continue
+
+    def worker():
+        try:
+            search.run()
+        finally:
+            _finish_search_metrics("stream", search, started)
+            put(_STREAM_DONE)
+
+    search.on_leaf = put
+    thread = _threading.Thread(target=worker, name="iter_schedules", daemon=True)
+    thread.start()
+    try:
+        while True:
+            try:
+                item = buf.get(timeout=0.1)
+            except _queue.Empty:
+                # 취소되면 탐색 스레드는 _STREAM_DONE을 넣지 않고 끝남
+                if not thread.is_alive() and buf.empty():
+                    return
+                continue
+            if item is _STREAM_DONE:
+                return
+            yield item
+    finally:
+        stop.cancel()
+        thread.join(timeout=1.0)
 
 
 def half_slot_to_time(slot_idx: int) -> Tuple[int, int]:
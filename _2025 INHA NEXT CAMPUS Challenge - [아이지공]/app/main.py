@@ -1,9 +1,13 @@
 # app/main.py
 import os
+import json
+import math
+import asyncio
 from datetime import datetime
 from typing import Optional
 from pathlib import Path
 from dotenv import load_dotenv
+import anyio
 
 # .env 파일에서 환경 변수 로드
 load_dotenv()
@@ -77,6 +81,30 @@ def _create_tables():
     Base.metadata.create_all(engine)
 
 
+@app.on_event("startup")
+def _load_catalog():
+    # subject_json 전체를 한 번 파싱해 메모리에 (요청마다 파일을 읽지 않음)
+    algo.load_catalog()
+
+
+@app.on_event("startup")
+def _start_catalog_watcher():
+    # data/ 아래 JSON이 바뀌면 재시작 없이 카탈로그를 다시 읽음 (PLANNER_WATCH=0이면 끔)
+    if os.getenv("PLANNER_WATCH", "1") != "0":
+        algo.start_catalog_watcher()
+
+
+@app.on_event("shutdown")
+def _stop_catalog_watcher():
+    algo.stop_catalog_watcher()
+
+
+@app.on_event("startup")
+def _load_conflict_matrix():
+    # scripts/build_conflict_matrix.py로 만든 분반 충돌 비트셋 (없으면 비트마스크로 대신함)
+    algo.load_conflict_matrix()
+
+
 # ---------------- Helpers ----------------
 def get_current_user(request: Request, db: SASession) -> Optional[User]:
     s_id = current_user_id(request)
@@ -334,6 +362,12 @@ def _ensure_session_state(request: Request):
     s = request.session.get("recommend") or {}
     s.setdefault("target_credits", 16)
     s.setdefault("core_credits", None)
+    # step 1 시간 조건: 공강 요일 [0~4], 제외 시간대 ["요일-시", ...] (예: "0-9" = 월 9시대)
+    s.setdefault("free_days", [])
+    s.setdefault("blocked_periods", [])
+    # step 7 정렬 기준 (RANK_PRESETS 키 또는 "custom"), custom 가중치 {지표: 값}
+    s.setdefault("rank", "priority")
+    s.setdefault("rank_weights", {})
     s.setdefault(
         "selected_sections", {"p1": [], "p2": [], "p3": [], "p4": [], "p5": []}
     )
@@ -344,6 +378,73 @@ def _ensure_session_state(request: Request):
     return s
 
 
+# step 7 시간표 탐색 시간 제한 (초). 초과하면 지금까지 찾은 최선을 부분 결과로 표시
+STEP7_TIME_BUDGET = float(os.getenv("STEP7_TIME_BUDGET", "5"))
+# step 7 병렬 탐색 프로세스 수 (선택 분반이 많은 무거운 요청에만 사용됨).
+# 기본 1 = 순차 탐색. 풀 worker는 forkserver로 시작하므로 (서버 프로세스를 fork하지 않음)
+# 켜면 첫 요청 때 worker 기동 비용이 한 번 듦
+STEP7_WORKERS = int(os.getenv("STEP7_WORKERS", "1"))
+# step 7 "계속 찾기" 스트리밍(/recommend/stream) 시간 제한 (초)과 새로 보낼 최대 시간표 수.
+# 페이지 렌더링과 따로 잡아서, 제한 시간에 걸린 페이지보다 더 오래 찾을 수 있게 함
+STREAM_TIME_BUDGET = float(os.getenv("STREAM_TIME_BUDGET", "20"))
+STREAM_LIMIT = int(os.getenv("STREAM_LIMIT", "100"))
+# step 2~6 가능한 시간표 개수 계산 시간 제한 (초). 초과하면 count=null
+COUNT_TIME_BUDGET = float(os.getenv("COUNT_TIME_BUDGET", "1"))
+
+
+# step 7 정렬 기준: (표시 이름, algo.rank_schedules 가중치). None이면 priority 기준 그대로
+RANK_PRESETS = {
+    "priority": ("우선순위 순", None),
+    "fewest_days": ("등교 일수 적은 순", {"days": 1.0, "gap": 0.05}),
+    "late_start": ("1교시 피하기", {"first_slot": -1.0}),
+    "min_gap": ("공강 시간 적은 순", {"gap": 1.0}),
+    "short_blocks": ("연강 짧은 순", {"longest_block": 1.0}),
+    # 학점/우선순위/등교 일수/공강 시간 중 어느 하나도 더 나은 대안이 없는 시간표만
+    "pareto": ("균형 (파레토)", None),
+}
+
+
+def _rank_objective(s: dict) -> Optional[dict]:
+    """세션의 정렬 기준 -> generate_schedules의 objective"""
+    if s.get("rank") == "custom":
+        weights = s.get("rank_weights", {})
+        return {k: v for k, v in weights.items() if v and math.isfinite(v)} or None
+    return RANK_PRESETS.get(s.get("rank"), RANK_PRESETS["priority"])[1]
+
+
+def _blocked_mask(s: dict) -> int:
+    """세션의 공강 요일/제외 시간대 -> generate_schedules의 blocked_mask"""
+    blocked = []
+    for cell in s.get("blocked_periods", []):
+        day, hour = (int(x) for x in cell.split("-"))
+        start = (hour - 9) * 2 + 1  # 슬롯 1 = 09:00-09:30
+        blocked.append((day, start, start + 2))
+    return algo.time_window_mask(blocked, s.get("free_days", []))
+
+
+def _disconnect_cancel_token(request: Request) -> "algo.SearchCancelToken":
+    """HTTP 클라이언트 연결이 끊기면 취소되는 탐색 토큰.
+    sync 엔드포인트(threadpool)에서 만들면 anyio로, async 엔드포인트에서 만들면 그 이벤트 루프로
+    확인하므로 iter_schedules의 탐색 스레드처럼 다른 스레드에서 poll해도 된다"""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    def disconnected() -> bool:
+        if loop is None:
+            return anyio.from_thread.run(request.is_disconnected)
+        try:
+            asyncio.get_running_loop()
+            return False  # 이벤트 루프 스레드에서 기다리면 멈추므로 확인하지 않음
+        except RuntimeError:
+            pass
+        future = asyncio.run_coroutine_threadsafe(request.is_disconnected(), loop)
+        return future.result(timeout=1.0)
+
+    return algo.SearchCancelToken(poll=disconnected)
+
+
 def _semester_options():
     return [f"{y}-{t}" for y in range(1, 5) for t in (1, 2)]
 
@@ -357,49 +458,18 @@ def _filters_are_default(f: dict) -> bool:
     )
 
 
-def _courses_for_step_and_semester(step: int, semester_token: str):
-    if step == 2:
-        return algo.list_major_required(semester_token)
-    if step == 3:
-        return algo.list_major_elective(semester_token)
-    if step == 4:
-        return algo.list_basic_focus(semester_token)
-    return []
+# step -> algo 커리큘럼 색인 종류
+_STEP_CURRICULUM = {2: "major_required", 3: "major_elective", 4: "basic_focus"}
 
 
 def _semester_options_filtered(step: int, filters: dict):
     # Return only semesters that have at least one course with sections
-    # (필터 적용 여부와 관계없이 강의 데이터가 있는 학기만 반환)
-    out = []
-    try:
-        for sem in _semester_options():
-            courses = _courses_for_step_and_semester(step, sem)
-            if not courses:
-                continue
-            has_any = False
-            for d in courses:
-                if not isinstance(d, dict):
-                    continue
-                cid = str(d.get("학수번호") or "").strip()
-                if not cid:
-                    continue
-                try:
-                    sections = algo.sections_for_course(cid)
-                    # 강의 데이터가 있는지만 확인 (필터 적용하지 않음)
-                    if sections:
-                        has_any = True
-                        break
-                except Exception:
-                    continue
-            if has_any:
-                out.append(sem)
-    except Exception as e:
-        import traceback
-
-        traceback.print_exc()
-        # 오류 발생 시 빈 리스트 반환 (기본 학기 옵션 사용)
+    # (필터 적용 여부와 관계없이 강의 데이터가 있는 학기만 반환, 카탈로그 로드 때 계산됨)
+    kind = _STEP_CURRICULUM.get(step)
+    if kind is None:
         return []
-    return out
+    have = algo.curriculum_semesters(kind)
+    return [sem for sem in _semester_options() if sem in have]
 
 
 @app.get("/recommend", name="recommend_page")
@@ -407,6 +477,7 @@ def recommend_get(
     request: Request,
     step: int = 1,
     semester: str = "1-1",
+    rank: Optional[str] = None,
     db: SASession = Depends(get_db),
 ):
     """planner 상수의 복잡한 추천 로직 (세션 관리 + 필터링)"""
@@ -425,6 +496,22 @@ def recommend_get(
 
     _ensure_session_state(request)
     s = request.session["recommend"]
+    # 요청 하나는 같은 카탈로그 스냅샷만 사용 (도중에 데이터가 다시 로드돼도)
+    catalog = algo.get_catalog()
+    if step == 7 and rank is not None:
+        # 정렬 기준 변경 (custom이면 w_<지표> 쿼리 값이 가중치)
+        s["rank"] = rank if rank in RANK_PRESETS or rank == "custom" else "priority"
+        if rank == "custom":
+            weights = {}
+            for name in algo.SCHEDULE_OBJECTIVES:
+                try:
+                    w = float(request.query_params.get(f"w_{name}") or 0)
+                except ValueError:
+                    w = 0.0
+                # nan/inf는 순위를 정할 수 없으니 가중치 0으로
+                weights[name] = w if math.isfinite(w) else 0.0
+            s["rank_weights"] = weights
+        request.session["recommend"] = s
     ctx = {
         "request": request,
         "user": user,
@@ -432,6 +519,8 @@ def recommend_get(
         "semester": semester,
         "semesters": _semester_options(),
         "state": s,
+        "rank_presets": RANK_PRESETS,
+        "rank_objectives": algo.SCHEDULE_OBJECTIVES,
     }
 
     # Filter semester options for steps 2/3/4 - always filter to show only semesters with courses
@@ -473,19 +562,17 @@ def recommend_get(
     ]:
         courses = []
         for fid in sel.get(pkey, []):
-            p = algo.SUBJECT_DIR / fid
-            if p.exists():
-                sec = algo.load_section(p)
-                if sec:
-                    courses.append(
-                        {
-                            "file_id": fid,  # file_id 추가 (정확한 매칭을 위해)
-                            "course_id": sec.course_id,
-                            "course_name": sec.course_name,
-                            "prof": sec.prof,
-                            "credit": sec.credit,
-                        }
-                    )
+            sec = catalog.by_file.get(fid)
+            if sec:
+                courses.append(
+                    {
+                        "file_id": fid,  # file_id 추가 (정확한 매칭을 위해)
+                        "course_id": sec.course_id,
+                        "course_name": sec.course_name,
+                        "prof": sec.prof,
+                        "credit": sec.credit,
+                    }
+                )
         ctx["selected_courses_by_step"][step_name] = courses
 
     if step == 1:
@@ -507,56 +594,42 @@ def recommend_get(
         byp = {}
         # 카테고리별 파일 ID 매핑 (각 시간표의 카테고리별 학점 계산용)
         category_fid_map = {}
-        total_selected_credits = 0
 
         for pkey, pnum in [("p1", 1), ("p2", 2), ("p3", 3), ("p4", 4), ("p5", 5)]:
             sections = []
             fids = []
             for fid in sel.get(pkey, []):
-                p = algo.SUBJECT_DIR / fid
-                if p.exists():
-                    sec = algo.load_section(p)
-                    if sec:
-                        sections.append(sec)
-                        fids.append(fid)
-                        total_selected_credits += sec.credit
+                sec = catalog.by_file.get(fid)
+                if sec:
+                    sections.append(sec)
+                    fids.append(fid)
             byp[pnum] = sections
             category_fid_map[pnum] = set(fids)
 
-        # 디버깅 정보 출력
-        print(f"[DEBUG] Step 7 - Selected sections by priority:")
-        for pnum, secs in byp.items():
-            print(
-                f"  Priority {pnum}: {len(secs)} sections, total credits: {sum(s.credit for s in secs)}"
-            )
-        print(f"[DEBUG] Total selected credits: {total_selected_credits}")
-        print(f"[DEBUG] Target credits: {s.get('target_credits', 16)}")
-        print(f"[DEBUG] Core credits target: {s.get('core_credits')}")
-
         # 핵교 학점 검증 (Step 7에서도)
         if s.get("core_credits") is not None and s["core_credits"] > 0:
             core_credits_target = s["core_credits"]
             total_core_credits = sum(sec.credit for sec in byp.get(4, []))
-            print(
-                f"[DEBUG] Core credits check: target={core_credits_target}, actual={total_core_credits}"
-            )
             if total_core_credits < core_credits_target:
                 ctx["error_message"] = (
                     f"저장한 학점({core_credits_target}학점) 이상의 핵심교양 과목을 선택해야 합니다. 현재 선택한 핵심교양 학점: {total_core_credits}학점"
                 )
                 ctx["schedules"] = []
-                print(f"[DEBUG] Core credits validation failed")
             else:
-                print(
-                    f"[DEBUG] Calling generate_schedules with byp={byp}, target={s.get('target_credits', 16)}, core={s.get('core_credits')}"
-                )
                 try:
-                    schedules = algo.generate_schedules(
-                        byp, s.get("target_credits", 16), s.get("core_credits")
-                    )
-                    print(
-                        f"[DEBUG] generate_schedules returned {len(schedules)} schedules"
+                    schedules = algo.generate_schedules_cached(
+                        byp,
+                        s.get("target_credits", 16),
+                        s.get("core_credits"),
+                        time_budget=STEP7_TIME_BUDGET,
+                        cancel_token=_disconnect_cancel_token(request),
+                        workers=STEP7_WORKERS,
+                        blocked_mask=_blocked_mask(s),
+                        objective=_rank_objective(s),
+                        pareto=s.get("rank") == "pareto",
+                        catalog_version=catalog.version,
                     )
+                    ctx["schedules_partial"] = schedules.partial
                 except Exception as e:
                     import traceback
 
@@ -609,14 +682,21 @@ def recommend_get(
                         }
                         schedules_with_credits.append(schedule)
                 ctx["schedules"] = schedules_with_credits
-                print(f"[DEBUG] Final schedules count: {len(schedules_with_credits)}")
         else:
-            print(f"[DEBUG] No core credits target, calling generate_schedules")
             try:
-                schedules = algo.generate_schedules(
-                    byp, s.get("target_credits", 16), s.get("core_credits")
+                schedules = algo.generate_schedules_cached(
+                    byp,
+                    s.get("target_credits", 16),
+                    s.get("core_credits"),
+                    time_budget=STEP7_TIME_BUDGET,
+                    cancel_token=_disconnect_cancel_token(request),
+                    workers=STEP7_WORKERS,
+                    blocked_mask=_blocked_mask(s),
+                    objective=_rank_objective(s),
+                    pareto=s.get("rank") == "pareto",
+                    catalog_version=catalog.version,
                 )
-                print(f"[DEBUG] generate_schedules returned {len(schedules)} schedules")
+                ctx["schedules_partial"] = schedules.partial
             except Exception as e:
                 import traceback
 
@@ -667,7 +747,6 @@ def recommend_get(
                     }
                     schedules_with_credits.append(schedule)
             ctx["schedules"] = schedules_with_credits
-            print(f"[DEBUG] Final schedules count: {len(schedules_with_credits)}")
         
         # ============ AI 추천 시간표 생성 ============
         # Step 7에서는 기본 시간표만 표시하고, AI 추천은 사용자가 요청할 때만 생성
@@ -675,8 +754,16 @@ def recommend_get(
         # 명시적으로 빈 리스트로 설정하여 자동 생성 방지
         # ⚠️ 중요: _generate_ai_schedules 함수를 호출하지 않음!
         ctx["ai_schedules"] = []
-        print(f"[DEBUG] Step 7: AI 추천 자동 생성 비활성화 (사용자 요청 시에만 생성)")
-        print(f"[DEBUG] Step 7: ctx['ai_schedules'] = {ctx['ai_schedules']}")
+
+        # 시간표별 요약 (등교 일수, 공강 시간)
+        if ctx.get("schedules"):
+            summary = algo.schedule_metrics(ctx["schedules"])
+            for i, schedule in enumerate(ctx["schedules"]):
+                schedule.__dict__["summary"] = {
+                    "days": int(summary["days"][i]),
+                    # 슬롯 = 30분
+                    "gap_hours": int(summary["gap"][i]) / 2,
+                }
 
     return templates.TemplateResponse("recommend.html", ctx)
 
@@ -740,7 +827,6 @@ def _generate_ai_schedules(request: Request, db: SASession, s: dict, user: Optio
         # AI에게 전달할 때도 학수번호별로 중복 제거
         ai_available_courses = []  # 학수번호별로 하나씩만 저장
         ai_available_course_codes = set()  # 이미 추가된 학수번호 추적
-        core_category_map = algo.core_category_map()  # 핵심교양 카테고리 맵
         
         for priority, category_name, pkey in priority_config:
             selected_fids = sel.get(pkey, [])
@@ -754,19 +840,14 @@ def _generate_ai_schedules(request: Request, db: SASession, s: dict, user: Optio
                 for fid in selected_fids:
                     course_code = fid.split(".")[0] if "." in fid else fid.replace(".json", "")
                     if course_code:
-                        # 어느 카테고리에 속하는지 찾기
-                        for cat_id in range(1, 7):
-                            if course_code in core_category_map.get(cat_id, []):
-                                course_to_category[course_code] = cat_id
-                                break
+                        # 어느 카테고리에 속하는지 찾기 (교양 색인의 학수번호 -> 카테고리)
+                        cat_id = algo.core_category_of(course_code)
+                        if cat_id is not None:
+                            course_to_category[course_code] = cat_id
             
             # 선택된 파일들의 모든 섹션 가져오기
             for fid in selected_fids:
-                p = algo.SUBJECT_DIR / fid
-                if not p.exists():
-                    continue
-                
-                sec = algo.load_section(p)
+                sec = algo.section_by_file_id(fid)
                 if not sec:
                     continue
                 
@@ -777,6 +858,7 @@ def _generate_ai_schedules(request: Request, db: SASession, s: dict, user: Optio
                 is_web = sec.is_web or (sec.time_raw and ("웹강의" in sec.time_raw or "온라인" in sec.time_raw or "온라" in sec.time_raw))
                 
                 course_info = {
+                    "file_id": sec.file_id,
                     "course_id": sec.course_id,
                     "course_name": sec.course_name,
                     "time_raw": sec.time_raw,
@@ -935,6 +1017,123 @@ def _generate_ai_schedules(request: Request, db: SASession, s: dict, user: Optio
         return []
 
 
+def _load_selected_by_priority(s: dict):
+    """세션에 저장된 선택 분반 -> ({priority: [SectionFromFile]}, {priority: {file_id}})"""
+    byp = {}
+    category_fid_map = {}
+    sel = s["selected_sections"]
+    catalog = algo.get_catalog()
+    for pkey, pnum in [("p1", 1), ("p2", 2), ("p3", 3), ("p4", 4), ("p5", 5)]:
+        sections = []
+        fids = []
+        for fid in sel.get(pkey, []):
+            sec = catalog.by_file.get(fid)
+            if sec:
+                sections.append(sec)
+                fids.append(fid)
+        byp[pnum] = sections
+        category_fid_map[pnum] = set(fids)
+    return byp, category_fid_map
+
+
+def _schedule_payload(schedule, category_fid_map: dict) -> dict:
+    """시간표 -> JSON (SSE 전송용)"""
+    category_names = {
+        1: "전공필수",
+        2: "전공선택",
+        3: "기초/중점 교양",
+        4: "핵심교양",
+        5: "일반교양",
+    }
+    credits_by_cat = {name: 0 for name in category_names.values()}
+    for sec in schedule.sections:
+        for pnum, fids_set in category_fid_map.items():
+            if sec.file_id in fids_set:
+                credits_by_cat[category_names[pnum]] += sec.credit
+                break
+    return {
+        "total_credits": schedule.total_credits,
+        "credits_by_category": credits_by_cat,
+        "sections": [
+            {
+                "file_id": sec.file_id,
+                "course_id": sec.course_id,
+                "course_name": sec.course_name,
+                "time_raw": sec.time_raw,
+                "credit": sec.credit,
+                "prof": sec.prof,
+                "meetings": sec.meetings,
+                "is_web": sec.is_web,
+                "alternatives": [
+                    alt.file_id for alt in schedule.alternatives.get(sec.file_id, [])
+                ],
+            }
+            for sec in schedule.sections
+        ],
+    }
+
+
+@app.get("/recommend/stream")
+async def recommend_stream(
+    request: Request,
+    skip: Optional[str] = None,
+    db: SASession = Depends(get_db),
+):
+    """step 7 시간표를 찾는 즉시 Server-Sent Events로 전송
+
+    skip: 페이지에 이미 보이는 시간표들 (정렬한 file_id를 ","로 이은 키를 ";"로 구분).
+    이 시간표들은 보내지 않고 STREAM_LIMIT개에도 세지 않음
+    event: schedule (시간표 1개, JSON) ... event: done ({"count": N})"""
+    user = get_current_user(request, db)
+    if not user:
+        return JSONResponse(
+            status_code=401,
+            content={"success": False, "message": "로그인이 필요합니다."}
+        )
+
+    s = _ensure_session_state(request)
+    byp, category_fid_map = _load_selected_by_priority(s)
+    shown = {key for key in (skip or "").split(";") if key}
+    schedules = algo.iter_schedules(
+        byp,
+        s.get("target_credits", 16),
+        s.get("core_credits"),
+        limit=STREAM_LIMIT + len(shown),
+        time_budget=STREAM_TIME_BUDGET,
+        cancel_token=_disconnect_cancel_token(request),
+        blocked_mask=_blocked_mask(s),
+    )
+
+    async def event_stream():
+        count = 0
+        try:
+            while count < STREAM_LIMIT and not await request.is_disconnected():
+                schedule = await anyio.to_thread.run_sync(next, schedules, None)
+                if schedule is None:
+                    break
+                key = ",".join(sorted(sec.file_id for sec in schedule.sections))
+                if key in shown:
+                    continue
+                count += 1
+                payload = json.dumps(
+                    _schedule_payload(schedule, category_fid_map), ensure_ascii=False
+                )
+                yield f"event: schedule\ndata: {payload}\n\n"
+            yield f"event: done\ndata: {json.dumps({'count': count})}\n\n"
+        finally:
+            try:
+                schedules.close()
+            except ValueError:
+                # 다른 스레드에서 아직 next() 실행 중 -> 탐색 스레드가 연결 끊김을 보고 멈춤
+                pass
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 class AIRecommendRequest(BaseModel):
     feedback: Optional[str] = None
 
@@ -1009,6 +1208,8 @@ async def recommend_post(
     web_choice: Optional[str] = Form(None),
     sort_choice: Optional[str] = Form(None),
     selected_fids: Optional[str] = Form(None),
+    free_days: Optional[str] = Form(None),
+    blocked_periods: Optional[str] = Form(None),
     db: SASession = Depends(get_db),
 ):
     """추천 단계 처리"""
@@ -1065,6 +1266,20 @@ async def recommend_post(
                     status_code=303,
                 )
 
+        if step == 1:
+            # 공강 요일 / 제외 시간대 (전달된 경우에만 갱신)
+            if free_days is not None:
+                s["free_days"] = sorted(
+                    {int(x) for x in free_days.split(",") if x.strip().isdigit() and int(x) < 5}
+                )
+            if blocked_periods is not None:
+                cells = set()
+                for cell in blocked_periods.split(","):
+                    day, _, hour = cell.strip().partition("-")
+                    if day.isdigit() and hour.isdigit() and int(day) < 5 and 9 <= int(hour) < 21:
+                        cells.add(f"{int(day)}-{int(hour)}")
+                s["blocked_periods"] = sorted(cells)
+
         if step in (2, 3, 4, 5, 6):
             s["filters"] = {
                 "eval": eval_choice,
@@ -1168,11 +1383,9 @@ async def recommend_post(
                     core_credits_target = s["core_credits"]
                     total_core_credits = 0
                     for fid in ids:
-                        p = algo.SUBJECT_DIR / fid
-                        if p.exists():
-                            sec = algo.load_section(p)
-                            if sec:
-                                total_core_credits += sec.credit
+                        sec = algo.section_by_file_id(fid)
+                        if sec:
+                            total_core_credits += sec.credit
                     if total_core_credits < core_credits_target:
                         request.session["recommend"] = s
 
@@ -1267,6 +1480,57 @@ async def recommend_sections(
     return JSONResponse({"sections": [sec_to_dict(s) for s in filtered]})
 
 
+@app.post("/recommend/count")
+def recommend_count(
+    request: Request,
+    step: int = Form(...),
+    selected_fids: Optional[str] = Form(None),
+    db: SASession = Depends(get_db),
+):
+    """현재 선택으로 만들 수 있는 시간표 개수 (AJAX, step 2~6에서 선택이 바뀔 때 호출)
+
+    selected_fids: 현재 step에서 고른 분반 (저장 전). 다른 step은 세션의 선택을 사용"""
+    user = get_current_user(request, db)
+    if not user:
+        return JSONResponse(
+            status_code=401,
+            content={"success": False, "message": "로그인이 필요합니다."}
+        )
+    s = _ensure_session_state(request)
+    sel = dict(s["selected_sections"])
+    key = {2: "p1", 3: "p2", 4: "p3", 5: "p4", 6: "p5"}.get(step)
+    if key and selected_fids is not None:
+        sel[key] = [x for x in selected_fids.split(",") if x.strip()]
+    byp, _ = _load_selected_by_priority({"selected_sections": sel})
+    count = algo.count_schedules(
+        byp,
+        s.get("target_credits", 16),
+        s.get("core_credits"),
+        time_budget=COUNT_TIME_BUDGET,
+        cancel_token=_disconnect_cancel_token(request),
+        blocked_mask=_blocked_mask(s),
+    )
+    # count가 None이면 시간 제한 안에 다 세지 못함 (시간표가 매우 많음)
+    return JSONResponse({"count": count, "exact": count is not None})
+
+
+@app.get("/recommend/metrics")
+def recommend_metrics(request: Request, db: SASession = Depends(get_db)):
+    """시간표 탐색 지표 (프로세스 시작 후 누적) + 결과 캐시 적중률"""
+    user = get_current_user(request, db)
+    if not user:
+        return JSONResponse(
+            status_code=401,
+            content={"success": False, "message": "로그인이 필요합니다."}
+        )
+    return JSONResponse(
+        {
+            "search": algo.search_metrics_stats(),
+            "cache": algo.schedule_cache_stats(),
+        }
+    )
+
+
 # --- lecture search page ---
 @app.get("/curriculum")
 def curriculum(request: Request, db: SASession = Depends(get_db)):
@@ -31,6 +31,8 @@ from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from app import algorithm as algo
+
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
@@ -117,6 +119,7 @@ class CourseRecommender:
                 "학수번호": course.get("학수번호", ""),
                 "과목명": course.get("과목명", ""),
                 "시간": course.get("시간", ""),
+                "file_id": course.get("file_id"),
                 "schedule": schedule
             })
         
@@ -124,6 +127,10 @@ class CourseRecommender:
         for i in range(len(course_schedules)):
             for j in range(i + 1, len(course_schedules)):
                 c1, c2 = course_schedules[i], course_schedules[j]
+                # 두 분반 모두 충돌 비트셋에 있으면 비트 조회로 판정 (충돌일 때만 요일/시간 계산)
+                if c1["file_id"] and c2["file_id"]:
+                    if algo.sections_conflict(c1["file_id"], c2["file_id"]) is False:
+                        continue
                 for day in ["월", "화", "수", "목", "금", "토", "일"]:
                     times1 = c1["schedule"].get(day, [])
                     times2 = c2["schedule"].get(day, [])
@@ -178,7 +185,8 @@ class CourseRecommender:
             "학수번호": course.get("course_id", ""),
             "과목명": course.get("course_name", ""),
             "시간": course.get("time_raw", ""),
-            "학점": course.get("credit", 0)
+            "학점": course.get("credit", 0),
+            "file_id": course.get("file_id")
         }
     
     #추천 결과 최종 검증 함수, 모든 검증 함수 호출함
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+카탈로그 번들 생성
+- data/subject_json, depart_json, common_subjects_json을 data/catalog.bundle 하나로 묶음
+  (분반 고정 길이 표 + 문자열 풀 + 오프셋 색인)
+- 서버는 시작할 때 이 파일을 mmap (worker들이 페이지를 공유, 강의 데이터가 바뀌면 다시 실행)
+"""
+from pathlib import Path
+import sys
+import time
+
+# Ensure project root on sys.path
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app import algorithm as algo
+
+
+def main() -> None:
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else algo._BUNDLE_PATH
+    started = time.perf_counter()
+    n = algo.write_catalog_bundle(path)
+    elapsed = time.perf_counter() - started
+    print(f"{path}: 분반 {n}개, {path.stat().st_size:,} bytes ({elapsed:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
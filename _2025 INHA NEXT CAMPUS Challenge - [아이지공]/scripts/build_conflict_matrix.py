@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+분반 쌍 시간 충돌 비트셋 생성
+- data/subject_json 전체 분반 × 분반 충돌 여부를 data/section_conflicts.bin에 저장
+- 서버는 시작할 때 이 파일을 mmap (강의 데이터가 바뀌면 다시 실행)
+"""
+from pathlib import Path
+import sys
+import time
+
+# Ensure project root on sys.path
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app import algorithm as algo
+
+
+def main() -> None:
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else algo._CONFLICT_MATRIX_PATH
+    started = time.perf_counter()
+    n = algo.write_conflict_matrix(path)
+    elapsed = time.perf_counter() - started
+    print(f"{path}: 분반 {n}개, {path.stat().st_size:,} bytes ({elapsed:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
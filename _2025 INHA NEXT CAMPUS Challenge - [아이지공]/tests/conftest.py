@@ -0,0 +1,173 @@
+"""
+planner 테스트 공용 fixture
+- make_problem: 무작위 우선순위별 분반 목록 (시간표 탐색 테스트용)
+- data_dir: 임시 data/ 디렉토리 (subject_json/depart_json/common_subjects_json)로
+  algorithm 모듈의 경로 상수를 바꾸고, 카탈로그/충돌 비트셋/시간표 캐시를 비움
+- brute_force_schedules/expand_alternatives: 탐색 결과를 전수 나열과 비교할 때
+"""
+
+from pathlib import Path
+import itertools
+import json
+import random
+import sys
+
+import pytest
+
+# Ensure project root on sys.path
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app import algorithm as algo
+
+DAYS = "월화수목금"
+
+
+def random_time(rng: random.Random) -> str:
+    """무작위 강의시간 문자열 (예: "화4,5,6목1,2:R101", 10%는 웹강의)"""
+    if rng.random() < 0.1:
+        return "웹강의"
+    parts = []
+    for _ in range(rng.choice([1, 2])):
+        start = rng.randint(1, 18)
+        slots = range(start, start + rng.choice([2, 3]))
+        parts.append(rng.choice(DAYS) + ",".join(str(x) for x in slots))
+    return "".join(parts) + ":R101"
+
+
+def make_section(file_id: str, time_raw: str, credit: int = 3, prof: str = "P"):
+    is_web, meetings = algo._parse_time_slots_planner(time_raw)
+    return algo.SectionFromFile(
+        file_id=file_id,
+        course_id=file_id.split(".")[0],
+        course_name=file_id.split(".")[0],
+        prof=prof,
+        credit=credit,
+        eval_type="상대",
+        assign_pct=0,
+        quiz_pct=0,
+        mid_pct=0,
+        final_pct=0,
+        attend_pct=0,
+        discuss_pct=0,
+        etc_pct=0,
+        time_raw=time_raw,
+        is_web=is_web,
+        meetings=meetings,
+    )
+
+
+def brute_force_schedules(by_priority, target_credits, core_credit_target=None):
+    """과목마다 분반 하나 또는 선택 안 함을 모두 나열한 유효한 시간표들
+    {총 학점: {frozenset(file_id)}} (core_credit_target: priority 4 학점 합)"""
+    courses = {}
+    core_ids = {s.sid for s in by_priority.get(4, [])}
+    for p in sorted(by_priority):
+        for s in by_priority[p]:
+            courses.setdefault(s.course_id, []).append(s)
+    found = {}
+    for choice in itertools.product(*[[None] + secs for secs in courses.values()]):
+        picked = [s for s in choice if s is not None]
+        occ = 0
+        for s in picked:
+            if s.mask & occ:
+                break
+            occ |= s.mask
+        else:
+            if core_credit_target is not None:
+                core = sum(s.credit for s in picked if s.sid in core_ids)
+                if core != core_credit_target:
+                    continue
+            total = sum(s.credit for s in picked)
+            found.setdefault(total, set()).add(frozenset(s.file_id for s in picked))
+    return found
+
+
+def expand_alternatives(schedules):
+    """동치류로 묶인 결과를 대안 분반까지 펼친 {frozenset(file_id)}"""
+    out = set()
+    for sc in schedules:
+        choices = [[s] + sc.alternatives.get(s.file_id, []) for s in sc.sections]
+        for combo in itertools.product(*choices):
+            out.add(frozenset(s.file_id for s in combo))
+    return out
+
+
+@pytest.fixture
+def make_problem():
+    """make_problem(seed, n_courses=8, max_sections=3) -> {우선순위: [분반]}"""
+
+    def make(seed: int, n_courses: int = 8, max_sections: int = 3):
+        rng = random.Random(seed)
+        by_priority = {p: [] for p in range(1, 6)}
+        for c in range(n_courses):
+            priority = rng.randint(1, 5)
+            course_id = f"T{seed:03d}C{c:02d}"
+            credit = rng.choice([1, 2, 3, 3, 3])
+            time_raw = random_time(rng)
+            for k in range(rng.randint(1, max_sections)):
+                if rng.random() < 0.5:
+                    time_raw = random_time(rng)
+                by_priority[priority].append(
+                    make_section(f"{course_id}.{k + 1:03d}.json", time_raw, credit)
+                )
+        return by_priority
+
+    return make
+
+
+def write_json(path: Path, payload) -> None:
+    path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+
+def write_subject(directory: Path, file_id: str, time_raw: str, credit=3, prof="김"):
+    write_json(
+        directory / file_id,
+        {
+            "강의명": file_id.split(".")[0],
+            "교수명": prof,
+            "학점": credit,
+            "강의시간": time_raw,
+            "평가방식": "상대",
+        },
+    )
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """작은 data/ 트리를 만들고 algorithm 경로 상수를 그쪽으로 돌림"""
+    root = tmp_path / "data"
+    subject = root / "subject_json"
+    depart = root / "depart_json"
+    common = root / "common_subjects_json"
+    for d in (subject, depart, common):
+        d.mkdir(parents=True)
+    write_subject(subject, "AIE1001.001.json", "월1,2,3:R101")
+    write_subject(subject, "AIE1001.002.json", "화1,2,3:R101")
+    write_subject(subject, "AIE1002.001.json", "월3,4:R102", credit=2)
+    write_subject(subject, "AIE1003.001.json", "수5,6,7:R103")
+    write_subject(subject, "GEC1001.001.json", "목1,2,3:R201")
+    write_json(
+        depart / "인공지능공학과.json",
+        [
+            {"종 별": "전공필수", "이수시기": "2학년(1학기)", "학수번호": "AIE1001"},
+            {"종 별": "전공선택", "이수시기": "3학년", "학수번호": "AIE1002"},
+        ],
+    )
+    write_json(common / "핵심교양-1.json", [{"학수번호": "GEC1001"}])
+    write_json(common / "창의.json", [{"학수번호": "AIE1003"}])
+
+    monkeypatch.setattr(algo, "_DATA_DIR", root)
+    monkeypatch.setattr(algo, "_SUBJECT_DIR_PLANNER", subject)
+    monkeypatch.setattr(algo, "_DEPART_PATH_PLANNER", depart / "인공지능공학과.json")
+    monkeypatch.setattr(algo, "_COMMON_DIR_PLANNER", common)
+    monkeypatch.setattr(algo, "_BUNDLE_DOC_DIRS", (depart, common))
+    monkeypatch.setattr(algo, "_BUNDLE_PATH", root / "catalog.bundle")
+    monkeypatch.setattr(algo, "_CONFLICT_MATRIX_PATH", root / "section_conflicts.bin")
+    monkeypatch.setattr(algo, "_CATALOG", None)
+    monkeypatch.setattr(algo, "_CONFLICT_MATRIX", None)
+    algo.invalidate_schedule_cache()
+    yield root
+    algo.stop_catalog_watcher()
+    algo.invalidate_schedule_cache()
@@ -0,0 +1,44 @@
+from app import algorithm as algo
+
+
+def assert_valid(schedule, by_priority, core=None):
+    occ = 0
+    for s in schedule.sections:
+        assert not s.mask & occ
+        occ |= s.mask
+    assert sum(s.credit for s in schedule.sections) == schedule.total_credits
+    assert len({s.course_id for s in schedule.sections}) == len(schedule.sections)
+    if core is not None:
+        core_ids = {s.sid for s in by_priority.get(4, [])}
+        assert sum(s.credit for s in schedule.sections if s.sid in core_ids) == core
+
+
+def test_anneal_returns_valid_subset_of_exhaustive(make_problem):
+    problem = make_problem(11, n_courses=12)
+    exact = algo.generate_schedules(problem, 12, limit=10**6, ordering="static")
+    exact_sets = {frozenset(s.sid for s in sc.sections) for sc in exact}
+    found = algo.generate_schedules(
+        problem, 12, limit=10, ordering="anneal", time_budget=0.5
+    )
+    assert found
+    for sc in found:
+        assert_valid(sc, problem)
+        assert frozenset(s.sid for s in sc.sections) in exact_sets
+
+
+def test_anneal_respects_core_target(make_problem):
+    problem = make_problem(12, n_courses=20)
+    found = algo.generate_schedules(
+        problem, 15, 3, limit=10, ordering="anneal", time_budget=0.5
+    )
+    for sc in found:
+        assert_valid(sc, problem, core=3)
+
+
+def test_anneal_is_partial_and_not_cached(data_dir, make_problem):
+    problem = make_problem(13, n_courses=12)
+    found = algo.generate_schedules_cached(
+        problem, 12, limit=10, ordering="anneal", time_budget=0.5
+    )
+    assert found.partial
+    assert algo.schedule_cache_stats()["size"] == 0
@@ -0,0 +1,90 @@
+from app import algorithm as algo
+
+S = algo.Section
+T = algo.make_slot
+
+
+def codes(result):
+    return [(c.code, s.section_id) for c, s in result.picked]
+
+
+def assert_conflict_free(result):
+    sections = [s for _, s in result.picked]
+    for i, a in enumerate(sections):
+        assert all(not a.conflicts_with(b) for b in sections[i + 1 :])
+    assert result.total_credits == sum(c.credits for c, _ in result.picked)
+
+
+def trap():
+    # 선호 교수 분반 A2를 먼저 잡으면 B(월 09:30)가 들어갈 자리가 없음
+    a = algo.Course(
+        "A",
+        "알고",
+        3,
+        "major-required",
+        "2-1",
+        [
+            S("A2", "Kim", [T("Mon", "09:00", "10:15")]),
+            S("A1", "Lee", [T("Tue", "09:00", "10:15")]),
+        ],
+    )
+    b = algo.Course(
+        "B",
+        "자료",
+        3,
+        "major-required",
+        "2-1",
+        [S("B1", "Park", [T("Mon", "09:30", "10:45")])],
+    )
+    c = algo.Course(
+        "C",
+        "선택",
+        3,
+        "major-elective",
+        "2-1",
+        [S("C1", "Choi", [T("Wed", "09:00", "10:15")])],
+    )
+    req = algo.RecommendInput(
+        target_credits=9,
+        major_required=["A", "B"],
+        selected_courses={"e": ["C", "A"]},
+        prefer_instructors=["Kim"],
+    )
+    return [a, b, c], req
+
+
+def test_beam_escapes_greedy_trap():
+    catalog, req = trap()
+    greedy = algo.greedy_recommend(catalog, req)
+    assert codes(greedy) == [("A", "A2"), ("C", "C1")]
+    assert "[FAIL] 필수 '자료'" in greedy.reason
+    best = algo.beam_recommend(catalog, req, k=3)[0]
+    assert codes(best) == [("A", "A1"), ("B", "B1"), ("C", "C1")]
+    assert best.total_credits == 9
+
+
+def test_beam_is_never_worse_than_greedy_on_demo():
+    catalog = algo.demo_catalog()
+    req = algo.RecommendInput(
+        target_credits=16,
+        major_required=["AI101", "CS120"],
+        selected_courses={
+            "major-elective": ["AI200", "CS250"],
+            "lib-core": ["CORE101"],
+            "lib-basic": ["BASIC110"],
+            "lib-gen": ["GEN200"],
+        },
+        prefer_instructors=["Kim"],
+        prefer_dept_only=True,
+    )
+    greedy = algo.greedy_recommend(catalog, req)
+    results = algo.beam_recommend(catalog, req, k=3)
+    assert 1 <= len(results) <= 3
+    for r in results:
+        assert_conflict_free(r)
+    required = lambda r: sum(c.code in req.major_required for c, _ in r.picked)
+    best = results[0]
+    assert (required(best), min(best.total_credits, 16)) >= (
+        required(greedy),
+        min(greedy.total_credits, 16),
+    )
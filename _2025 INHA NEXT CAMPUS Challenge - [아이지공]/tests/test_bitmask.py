@@ -0,0 +1,27 @@
+import random
+
+from app import algorithm as algo
+from conftest import make_section, random_time
+
+
+def meetings_overlap(a, b) -> bool:
+    """주간 비트마스크 없이 meetings 구간끼리 직접 비교"""
+    return any(
+        da == db and sa < eb and sb < ea
+        for da, sa, ea, _ in a.meetings
+        for db, sb, eb, _ in b.meetings
+    )
+
+
+def test_mask_bits_follow_day_and_slot():
+    sec = make_section("X.001.json", "화1,2,3:R101")
+    assert sec.mask == 0b111 << algo._SLOTS_PER_DAY
+    assert make_section("X.002.json", "웹강의").mask == 0
+
+
+def test_mask_conflict_matches_meeting_overlap():
+    rng = random.Random(7)
+    secs = [make_section(f"X{i}.001.json", random_time(rng)) for i in range(120)]
+    for a in secs:
+        for b in secs:
+            assert bool(a.mask & b.mask) == meetings_overlap(a, b)
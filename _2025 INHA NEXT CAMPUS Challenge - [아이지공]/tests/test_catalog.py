@@ -0,0 +1,51 @@
+import pytest
+
+from app import algorithm as algo
+from conftest import write_json, write_subject
+
+
+@pytest.fixture
+def subject(data_dir):
+    subject = data_dir / "subject_json"
+    write_subject(subject, "AIE10011.001.json", "금1,2:R")
+    write_subject(subject, "AIE1001-1.001.json", "금3,4:R")
+    (subject / "BAD.001.json").write_text("{", encoding="utf-8")
+    write_json(subject / "notes.txt", {})
+    return subject
+
+
+def globbed(subject, prefix):
+    # 카탈로그 이전: 요청마다 glob + 파싱
+    found = (
+        algo._parse_section_file(p) for p in sorted(subject.glob(f"{prefix}*.json"))
+    )
+    return [s.file_id for s in found if s]
+
+
+@pytest.mark.parametrize(
+    "prefix", ["AIE1001", "AIE1001-1", "AIE100", "AIE", "GEC1001", "BAD", "NONE", ""]
+)
+def test_prefix_lookup_matches_glob(subject, prefix):
+    found = algo.sections_for_course(prefix)
+    assert [s.file_id for s in found] == globbed(subject, prefix)
+
+
+def test_file_lookup_returns_catalog_objects(subject):
+    catalog = algo.get_catalog()
+    assert algo.get_catalog() is catalog
+    s = algo.section_by_file_id("AIE1001.002.json")
+    assert s.course_id == "AIE1001" and s.credit == 3
+    assert algo.load_section(subject / "AIE1001.002.json") is s
+    assert algo.section_by_file_id("BAD.001.json") is None
+    assert len(catalog) == 7
+
+
+def test_load_catalog_swaps_snapshot(subject):
+    old = algo.get_catalog()
+    write_subject(subject, "AIE1005.001.json", "목5,6:R")
+    assert algo.section_by_file_id("AIE1005.001.json") is None
+    new = algo.load_catalog()
+    assert new is not old and algo.get_catalog() is new
+    assert algo.section_by_file_id("AIE1005.001.json") is not None
+    # 이전 스냅샷을 쓰던 요청은 그대로 끝까지 사용
+    assert "AIE1005.001.json" not in old.by_file
@@ -0,0 +1,73 @@
+import dataclasses
+import os
+
+from app import algorithm as algo
+from conftest import write_json, write_subject
+
+
+def keep_dir_mtime(directory, edit):
+    """edit() 후 디렉토리 mtime을 되돌림 (제자리 수정은 디렉토리 mtime을 안 바꿈)"""
+    st = directory.stat()
+    edit()
+    os.utime(directory, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def test_bundle_matches_json_catalog(data_dir):
+    from_json = algo.load_catalog()
+    assert from_json.bundle is None
+    assert algo.write_catalog_bundle() == len(from_json)
+
+    from_bundle = algo.load_catalog()
+    assert from_bundle.bundle is not None
+    assert from_bundle.version == from_json.version
+    assert list(from_bundle.by_file) == list(from_json.by_file)
+    for fid, sec in from_json.by_file.items():
+        assert dataclasses.astuple(from_bundle.by_file[fid]) == dataclasses.astuple(sec)
+    assert [r["학수번호"] for r in algo.list_major_required("2-1")] == ["AIE1001"]
+    assert algo.core_category_of("GEC1001") == 1
+
+
+def test_bundle_is_stale_after_in_place_subject_edit(data_dir):
+    algo.load_catalog()
+    algo.write_catalog_bundle()
+    assert algo.load_catalog().bundle is not None
+
+    subject = data_dir / "subject_json"
+    keep_dir_mtime(
+        subject, lambda: write_subject(subject, "AIE1001.001.json", "금1,2:R", credit=1)
+    )
+    catalog = algo.load_catalog()
+    assert catalog.bundle is None
+    assert catalog.by_file["AIE1001.001.json"].credit == 1
+
+
+def test_bundle_is_stale_after_same_size_edit(data_dir):
+    algo.load_catalog()
+    algo.write_catalog_bundle()
+    path = data_dir / "subject_json" / "AIE1001.001.json"
+    st = path.stat()
+
+    def edit():
+        path.write_text(path.read_text(encoding="utf-8").replace("월", "금"), "utf-8")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    keep_dir_mtime(path.parent, edit)
+    assert path.stat().st_size == st.st_size
+    catalog = algo.load_catalog()
+    assert catalog.bundle is None
+    assert catalog.by_file["AIE1001.001.json"].time_raw.startswith("금")
+
+
+def test_bundle_is_stale_after_in_place_doc_edit(data_dir):
+    algo.load_catalog()
+    algo.write_catalog_bundle()
+    depart = data_dir / "depart_json"
+    keep_dir_mtime(
+        depart,
+        lambda: write_json(
+            depart / "인공지능공학과.json",
+            [{"종 별": "전공필수", "이수시기": "2학년(1학기)", "학수번호": "AIE1003"}],
+        ),
+    )
+    assert algo.load_catalog().bundle is None
+    assert [r["학수번호"] for r in algo.list_major_required("2-1")] == ["AIE1003"]
@@ -0,0 +1,65 @@
+import unicodedata
+
+import pytest
+
+from app import algorithm as algo
+from conftest import write_json
+
+
+@pytest.fixture
+def common(data_dir):
+    common = data_dir / "common_subjects_json"
+    write_json(
+        common / unicodedata.normalize("NFD", "핵심교양-2.사회.json"),
+        [{"학수번호": "GEC2001"}, {"학수번호": "GEC2001"}, {"code": "GEC2002"}],
+    )
+    write_json(
+        common / "핵심교양 3 자연.json", [{"학수번호": "GEC2002"}, {"학수번호": "nan"}]
+    )
+    write_json(common / "핵심교양-4(공학인증).json", [{"학수번호": "GEC4001"}])
+    write_json(common / "일반교양-1.json", [{"학수번호": "GEN1001"}, {"학수번호": ""}])
+    write_json(common / "일반교양-7.SW·AI.json", [{"course_code": "SWA1001"}])
+    (common / "핵심교양-5.json").write_text("{broken", encoding="utf-8")
+    algo.load_catalog()
+    return common
+
+
+def test_category_map(common):
+    mapping = algo.core_category_map()
+    assert mapping[1] == ["GEC1001"]
+    assert mapping[2] == ["GEC2001", "GEC2002"]
+    assert mapping[3] == ["GEC2002"]
+    assert mapping[4] == mapping[5] == mapping[6] == []
+    assert mapping["창의"] == ["AIE1003"]
+    assert mapping["SW.AI"] == ["SWA1001"]
+    # 호출자가 바꿔도 색인은 그대로
+    mapping[1].append("X")
+    assert algo.core_category_map()[1] == ["GEC1001"]
+
+
+def test_core_category_of_uses_first_category(common):
+    assert algo.core_category_of("GEC1001") == 1
+    assert algo.core_category_of("GEC2002") == 2
+    assert algo.core_category_of("GEC4001") is None
+    assert algo.core_category_of("GEN1001") is None
+
+
+def test_core_and_general_rows(common):
+    core = algo.list_core_common()
+    assert sorted(r.get("학수번호") or r.get("code") for r in core) == [
+        "GEC1001",
+        "GEC2001",
+        "GEC2001",
+        "GEC2002",
+        "GEC2002",
+    ]
+    assert all("_source_file" in r for r in core)
+    general = algo.list_general_common()
+    assert sorted(algo._common_code(r) for r in general) == ["GEN1001", "SWA1001"]
+
+
+def test_registry_is_rebuilt_on_reload(common):
+    write_json(common / "핵심교양-6.json", [{"학수번호": "GEC6001"}])
+    assert algo.core_category_of("GEC6001") is None
+    algo.load_catalog()
+    assert algo.core_category_of("GEC6001") == 6
@@ -0,0 +1,74 @@
+import os
+
+from app import algorithm as algo
+from conftest import write_subject
+
+
+def test_matrix_matches_bitmask_conflicts(data_dir):
+    catalog = algo.load_catalog()
+    assert algo.write_conflict_matrix() == len(catalog)
+    assert algo.load_conflict_matrix()
+    secs = list(catalog.by_file.values())
+    for a in secs:
+        for b in secs:
+            assert algo.sections_conflict(a.file_id, b.file_id) == bool(a.mask & b.mask)
+    assert algo.sections_conflict("AIE1001.001.json", "AIE1002.001.json") is True
+    assert algo.sections_conflict("AIE1001.002.json", "AIE1002.001.json") is False
+    assert algo.sections_conflict("AIE1001.001.json", "NOPE.001.json") is None
+
+
+def edit_in_place(data_dir):
+    # 디렉토리 mtime은 그대로 두고 파일만 고침: 월3,4 -> 화3,4 (AIE1001.002와 겹침)
+    subject = data_dir / "subject_json"
+    st = subject.stat()
+    write_subject(subject, "AIE1002.001.json", "화3,4:R102", credit=2)
+    os.utime(subject, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def test_matrix_rebuilt_after_in_place_edit(data_dir):
+    algo.load_catalog()
+    algo.write_conflict_matrix()
+    assert algo.load_conflict_matrix()
+    old = algo._CONFLICT_MATRIX
+    assert algo.sections_conflict("AIE1001.002.json", "AIE1002.001.json") is False
+
+    edit_in_place(data_dir)
+    catalog = algo.load_catalog()
+    assert algo._CONFLICT_MATRIX is not old
+    assert algo._CONFLICT_MATRIX.version == catalog.version
+    assert algo.sections_conflict("AIE1001.002.json", "AIE1002.001.json") is True
+    # 파일도 새 버전이라 재시작 후에도 그대로 읽힘
+    assert algo.load_conflict_matrix()
+    assert algo.sections_conflict("AIE1001.002.json", "AIE1002.001.json") is True
+
+
+def test_matrix_dropped_when_rebuild_fails(data_dir, monkeypatch):
+    algo.load_catalog()
+    algo.write_conflict_matrix()
+    assert algo.load_conflict_matrix()
+
+    def fail(path, catalog):
+        raise OSError("read-only")
+
+    monkeypatch.setattr(algo, "write_conflict_matrix", fail)
+    edit_in_place(data_dir)
+    algo.load_catalog()
+    assert algo._CONFLICT_MATRIX is None
+    assert algo.sections_conflict("AIE1001.002.json", "AIE1002.001.json") is None
+
+
+def test_unused_matrix_is_not_built_on_reload(data_dir):
+    algo.load_catalog()
+    edit_in_place(data_dir)
+    algo.load_catalog()
+    assert algo._CONFLICT_MATRIX is None
+    assert not algo._CONFLICT_MATRIX_PATH.exists()
+
+
+def test_matrix_kept_when_version_matches(data_dir):
+    algo.load_catalog()
+    algo.write_conflict_matrix()
+    assert algo.load_conflict_matrix()
+    matrix = algo._CONFLICT_MATRIX
+    algo.load_catalog()
+    assert algo._CONFLICT_MATRIX is matrix
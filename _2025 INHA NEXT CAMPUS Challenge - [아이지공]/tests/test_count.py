@@ -0,0 +1,26 @@
+import math
+
+import pytest
+
+from app import algorithm as algo
+from conftest import brute_force_schedules
+
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("core", [None, 3])
+def test_count_matches_brute_force(make_problem, seed, core):
+    problem = make_problem(40 + seed, n_courses=7)
+    expected = len(brute_force_schedules(problem, 9, core).get(9, ()))
+    assert algo.count_schedules(problem, 9, core) == expected
+    assert algo.count_schedules(problem, 9, core, memo_size=0) == expected
+
+
+def test_count_matches_expanded_generate(make_problem):
+    # generate_schedules는 시간이 같은 분반을 alternatives로 묶어 하나로 냄
+    problem = make_problem(50, n_courses=10)
+    found = algo.generate_schedules(problem, 12, limit=10**6, top_k=False)
+    expanded = sum(
+        math.prod(1 + len(sc.alternatives.get(s.file_id, [])) for s in sc.sections)
+        for sc in found
+    )
+    assert algo.count_schedules(problem, 12) == expanded
@@ -0,0 +1,70 @@
+import pytest
+
+from app import algorithm as algo
+from conftest import write_json
+
+ROWS = [
+    {"종 별": "전공필수", "이수시기": "2학년(1학기)", "학수번호": "AIE1001"},
+    {"종 별": " 전공필수 ", "이수시기": "4학년(1,2학기)", "학수번호": "AIE1003"},
+    {"종 별": "전공필수", "이수시기": "2학년(1학기)", "학수번호": "nan"},
+    {"종 별": "전공필수", "이수시기": "", "학수번호": "AIE1001"},
+    {"종 별": "전공선택", "이수시기": "3학년", "학수번호": "AIE1002"},
+    # 개설 분반이 없는 과목
+    {"종 별": "전공선택", "이수시기": "전체", "학수번호": "AIE9999"},
+    {
+        "종 별": "교양",
+        "세부구분": "기초교양",
+        "이수시기": "1학년(2학기)",
+        "학수번호": "GEC1001",
+    },
+]
+
+
+@pytest.fixture
+def curriculum(data_dir):
+    write_json(data_dir / "depart_json" / "인공지능공학과.json", ROWS)
+    algo.load_catalog()
+
+
+def codes(rows):
+    return [r["학수번호"] for r in rows]
+
+
+def test_lookups_by_semester(curriculum):
+    required = {
+        sem: codes(algo.list_major_required(sem)) for sem in algo.SEMESTER_TOKENS
+    }
+    assert {sem: c for sem, c in required.items() if c} == {
+        "2-1": ["AIE1001"],
+        "4-1": ["AIE1003"],
+        "4-2": ["AIE1003"],
+    }
+    assert codes(algo.list_major_elective("3-2")) == ["AIE1002", "AIE9999"]
+    assert codes(algo.list_major_elective("1-1")) == ["AIE9999"]
+    assert codes(algo.list_basic_focus("1-2")) == ["GEC1001"]
+    assert algo.list_basic_focus("1-1") == []
+    # 색인에 없는 학기 토큰은 훑어서 찾음
+    assert codes(algo.list_major_elective("5-1")) == ["AIE9999"]
+
+
+def test_semesters_with_open_sections(curriculum):
+    assert algo.curriculum_semesters("major_required") == ("2-1", "4-1", "4-2")
+    assert algo.curriculum_semesters("major_elective") == ("3-1", "3-2")
+    assert algo.curriculum_semesters("basic_focus") == ("1-2",)
+    assert algo.curriculum_semesters("nope") == ()
+
+
+def test_lookup_returns_a_copy(curriculum):
+    algo.list_major_required("2-1").clear()
+    assert codes(algo.list_major_required("2-1")) == ["AIE1001"]
+
+
+def test_index_is_rebuilt_on_reload(curriculum, data_dir):
+    write_json(
+        data_dir / "depart_json" / "인공지능공학과.json",
+        ROWS + [{"종 별": "전공필수", "이수시기": "1학년", "학수번호": "AIE1002"}],
+    )
+    assert algo.list_major_required("1-1") == []
+    algo.load_catalog()
+    assert codes(algo.list_major_required("1-1")) == ["AIE1002"]
+    assert algo.curriculum_semesters("major_required")[:2] == ("1-1", "1-2")
@@ -0,0 +1,33 @@
+import time
+
+from app import algorithm as algo
+
+
+def test_finished_search_is_not_partial(make_problem):
+    found = algo.generate_schedules(make_problem(130), 9, time_budget=10)
+    assert found
+    assert not found.partial
+
+
+def test_time_budget_returns_best_so_far(make_problem):
+    problem = make_problem(131, n_courses=200, max_sections=4)
+    started = time.monotonic()
+    found = algo.generate_schedules(
+        problem, 24, limit=30, ordering="static", time_budget=0.2
+    )
+    assert time.monotonic() - started < 2
+    assert found.partial
+    for sc in found:
+        assert sc.total_credits == 24
+
+
+def test_cancel_token_stops_search(make_problem):
+    problem = make_problem(131, n_courses=200, max_sections=4)
+    token = algo.SearchCancelToken()
+    token.cancel()
+    started = time.monotonic()
+    found = algo.generate_schedules(
+        problem, 24, limit=30, ordering="static", cancel_token=token
+    )
+    assert time.monotonic() - started < 2
+    assert found.partial
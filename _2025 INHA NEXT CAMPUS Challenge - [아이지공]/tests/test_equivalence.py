@@ -0,0 +1,44 @@
+from app import algorithm as algo
+from conftest import make_section
+
+
+def problem_with_twins():
+    # A 과목은 같은 시간 분반 3개 (교수만 다름), B는 시간이 다른 분반 2개
+    return {
+        1: [
+            make_section("A.001.json", "월1,2,3:R", prof="김"),
+            make_section("A.002.json", "월1,2,3:R", prof="이"),
+            make_section("A.003.json", "월1,2,3:R", prof="박"),
+        ],
+        2: [
+            make_section("B.001.json", "화1,2,3:R"),
+            make_section("B.002.json", "월2,3:R"),
+        ],
+    }
+
+
+def test_time_identical_sections_are_searched_once():
+    found = algo.generate_schedules(problem_with_twins(), 6, limit=100, top_k=False)
+    assert len(found) == 1
+    sc = found[0]
+    assert [s.file_id for s in sc.sections] == ["A.001.json", "B.001.json"]
+    assert [s.file_id for s in sc.alternatives["A.001.json"]] == [
+        "A.002.json",
+        "A.003.json",
+    ]
+    assert "B.001.json" not in sc.alternatives
+
+
+def test_alternatives_share_time_credit_and_course(make_problem):
+    problem = make_problem(110, n_courses=10, max_sections=4)
+    found = algo.generate_schedules(problem, 12, limit=10**6, top_k=False)
+    assert any(sc.alternatives for sc in found)
+    for sc in found:
+        for s in sc.sections:
+            for alt in sc.alternatives.get(s.file_id, []):
+                assert (alt.mask, alt.credit, alt.course_id) == (
+                    s.mask,
+                    s.credit,
+                    s.course_id,
+                )
+        assert set(sc.alternatives) <= {s.file_id for s in sc.sections}
@@ -0,0 +1,36 @@
+import pytest
+
+from app import algorithm as algo
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    algo.reset_search_metrics()
+    yield
+    algo.reset_search_metrics()
+
+
+def test_search_is_silent_and_reports_metrics(make_problem, capsys):
+    problem = make_problem(160, n_courses=10)
+    found = algo.generate_schedules(problem, 12, limit=10)
+    assert capsys.readouterr().out == ""
+    m = found.metrics
+    assert m.nodes > 0 and m.leaves_accepted >= len(found) > 0
+    stats = algo.search_metrics_stats()["generate"]
+    assert stats["calls"] == 1 and stats["partial"] == 0
+    assert stats["totals"]["nodes"] == m.nodes
+    assert stats["max_wall_time"] == m.wall_time
+
+
+def test_metrics_are_kept_per_kind(make_problem):
+    problem = make_problem(161, n_courses=200, max_sections=4)
+    small = make_problem(162)
+    algo.generate_schedules(small, 9)
+    algo.count_schedules(small, 9)
+    algo.generate_schedules(problem, 24, ordering="static", time_budget=0.05)
+    stats = algo.search_metrics_stats()
+    assert stats["generate"]["calls"] == 2
+    assert stats["generate"]["partial"] == 1
+    assert stats["count"]["calls"] == 1
+    algo.reset_search_metrics()
+    assert algo.search_metrics_stats() == {}
@@ -0,0 +1,45 @@
+import pytest
+
+from app import algorithm as algo
+from conftest import make_section
+
+
+def run(problem, ordering, core):
+    return algo.generate_schedules(
+        problem, 15, core, limit=10**6, ordering=ordering, top_k=False
+    )
+
+
+def ids(schedules):
+    return sorted(tuple(s.file_id for s in sc.sections) for sc in schedules)
+
+
+@pytest.mark.parametrize("ordering", ["static", "mrv"])
+@pytest.mark.parametrize("core", [None, 3])
+@pytest.mark.parametrize("table_size", [0, 4])
+def test_nogood_table_does_not_change_results(
+    make_problem, monkeypatch, ordering, core, table_size
+):
+    problem = make_problem(140, n_courses=16, max_sections=3)
+    with_table = run(problem, ordering, core)
+    monkeypatch.setattr(algo, "_NOGOOD_TABLE_SIZE", table_size)
+    assert ids(run(problem, ordering, core)) == ids(with_table)
+
+
+def test_nogood_table_skips_repeated_dead_end():
+    # W1만 고른 상태와 W2만 고른 상태는 (다음 과목, occ, 3학점)으로 같음.
+    # 남은 C1/C2는 서로 겹쳐서 9학점을 못 채우므로 두 번째는 nogood로 건너뜀
+    problem = {
+        1: [
+            make_section("W1.001.json", "웹강의"),
+            make_section("W2.001.json", "웹강의"),
+            make_section("C1.001.json", "월1,2:R"),
+            make_section("C2.001.json", "월2,3:R"),
+        ]
+    }
+    found = algo.generate_schedules(problem, 9, limit=10, ordering="static")
+    assert ids(found) == [
+        ("W1.001.json", "W2.001.json", "C1.001.json"),
+        ("W1.001.json", "W2.001.json", "C2.001.json"),
+    ]
+    assert found.metrics.nogood_hits > 0
@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pytest
+
+from app import algorithm as algo
+
+
+def ids(schedules):
+    return [[s.file_id for s in sc.sections] for sc in schedules]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def shutdown_pool():
+    yield
+    if algo._PLANNER_POOL is not None:
+        algo._PLANNER_POOL.shutdown()
+        algo._PLANNER_POOL = None
+
+
+def rank_keys(schedules, by_priority):
+    counts = algo._priority_counter(by_priority)
+    return [(counts(sc), sc.total_credits) for sc in schedules]
+
+
+@pytest.mark.parametrize("top_k", [True, False])
+def test_parallel_static_matches_sequential(make_problem, top_k):
+    problem = make_problem(21, n_courses=16, max_sections=3)
+    options = dict(limit=15, ordering="static", top_k=top_k)
+    sequential = algo.generate_schedules(problem, 15, **options)
+    parallel = algo.generate_schedules(problem, 15, workers=2, **options)
+    assert not parallel.partial
+    assert ids(parallel) == ids(sequential)
+    assert sorted(algo._PLANNER_FREE_SLOTS) == list(range(algo._PLANNER_CANCEL_SLOTS))
+
+
+def test_pool_workers_do_not_fork_the_server(make_problem, caplog):
+    # 스레드가 떠 있는 서버 프로세스를 fork하지 않음 (forkserver, 없으면 spawn)
+    problem = make_problem(21, n_courses=16, max_sections=3)
+    with caplog.at_level("WARNING", logger=algo._log.name):
+        algo.generate_schedules(problem, 15, limit=15, ordering="static", workers=2)
+    assert "running sequentially" not in caplog.text
+    method = algo._PLANNER_POOL._mp_context.get_start_method()
+    assert method in ("forkserver", "spawn")
+
+
+def test_parallel_mrv_matches_sequential_ranking(make_problem):
+    # MRV는 서브트리 안의 탐색 순서가 달라 동점끼리 순서는 다를 수 있음
+    problem = make_problem(21, n_courses=16, max_sections=3)
+    sequential = algo.generate_schedules(problem, 15, limit=15, ordering="mrv")
+    parallel = algo.generate_schedules(problem, 15, limit=15, ordering="mrv", workers=2)
+    assert rank_keys(parallel, problem) == rank_keys(sequential, problem)
+
+
+def test_parallel_honours_request_deadline(make_problem):
+    problem = make_problem(22, n_courses=70, max_sections=4)
+    started = time.monotonic()
+    result = algo.generate_schedules(
+        problem, 21, limit=30, ordering="mrv", time_budget=0.3, workers=2
+    )
+    assert result.partial
+    assert time.monotonic() - started < 3
+
+
+def test_cancelled_request_stops_running_partitions(make_problem):
+    # 시간 제한 없이 취소만 된 요청. 취소 플래그가 없으면 worker들이 몇 분씩 계속 돌고
+    # 다음 요청이 풀을 기다림
+    problem = make_problem(22, n_courses=200, max_sections=4)
+    started = time.monotonic()
+    token = algo.SearchCancelToken(poll=lambda: time.monotonic() - started > 0.3)
+    result = algo.generate_schedules(
+        problem, 24, limit=30, ordering="static", cancel_token=token, workers=2
+    )
+    assert result.partial
+    small = make_problem(21, n_courses=16, max_sections=3)
+    started = time.monotonic()
+    algo.generate_schedules(small, 15, limit=15, ordering="static", workers=2)
+    assert time.monotonic() - started < 5
+
+
+class _FailingPool:
+    def submit(self, fn, *args):
+        raise RuntimeError("worker died")
+
+
+def test_parallel_failure_falls_back_to_sequential(make_problem, monkeypatch):
+    problem = make_problem(23, n_courses=16, max_sections=3)
+    sequential = algo.generate_schedules(problem, 15, limit=15)
+    monkeypatch.setattr(algo, "_get_planner_pool", lambda workers: _FailingPool())
+    monkeypatch.setattr(algo, "_PLANNER_CANCEL_FLAGS", [-1] * 4)
+    monkeypatch.setattr(algo, "_PLANNER_FREE_SLOTS", [0, 1, 2, 3])
+    fallback = algo.generate_schedules(problem, 15, limit=15, workers=2)
+    assert ids(fallback) == ids(sequential)
+    assert algo._PLANNER_FREE_SLOTS == [0, 1, 2, 3]
+
+
+def test_pool_is_created_once_under_concurrency():
+    pools = []
+    threads = [
+        threading.Thread(target=lambda: pools.append(algo._get_planner_pool(3)))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len({id(p) for p in pools}) == 1
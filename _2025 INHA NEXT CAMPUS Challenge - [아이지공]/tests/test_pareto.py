@@ -0,0 +1,80 @@
+import time
+
+import numpy as np
+import pytest
+
+from app import algorithm as algo
+
+
+def brute_force_skyline(vec):
+    """다른 행에 지배되지 않고, 같은 행 중 가장 앞선 행 번호들"""
+    keep = set()
+    for i, v in enumerate(vec):
+        dominated = any(
+            (w >= v).all() and ((w > v).any() or j < i) for j, w in enumerate(vec)
+        )
+        if not dominated:
+            keep.add(i)
+    return keep
+
+
+@pytest.mark.parametrize("d", [1, 2, 3, 4])
+@pytest.mark.parametrize("seed", range(5))
+def test_skyline_matches_brute_force(d, seed):
+    rng = np.random.default_rng(seed)
+    vec = rng.integers(0, 6, size=(80, d))
+    assert set(algo._skyline(vec)) == brute_force_skyline(vec)
+
+
+@pytest.mark.parametrize("d", [3, 4, 5])
+@pytest.mark.parametrize("seed", range(5))
+def test_skyline_many_ties_and_sizes(d, seed):
+    # 값 범위가 좁으면 중복과 동점이 많아 분할 경계/계단 교체 경우가 모두 나옴
+    rng = np.random.default_rng(100 + seed)
+    for n in (1, 2, 3, 17, 200):
+        vec = rng.integers(0, 3, size=(n, d))
+        assert set(algo._skyline(vec)) == brute_force_skyline(vec)
+
+
+@pytest.mark.parametrize("d", [3, 4])
+def test_skyline_whole_front_is_fast(d):
+    # 모든 점이 skyline인 경우가 예전 창 비교의 최악 (O(n^2))
+    rng = np.random.default_rng(d)
+    x = rng.integers(0, 10**6, size=(20000, d - 1))
+    vec = np.column_stack([x, -x.sum(axis=1)])
+    start = time.perf_counter()
+    front = algo._skyline(vec)
+    assert time.perf_counter() - start < 10
+    assert sorted(front) == list(range(20000))
+    order = np.lexsort(tuple(vec[front, k] for k in reversed(range(d))))[::-1]
+    assert list(order) == list(range(20000))
+
+
+def test_skyline_ignores_constant_columns():
+    # 총 학점처럼 모두 같은 지표가 있어도 2지표 sweep과 같은 결과
+    rng = np.random.default_rng(7)
+    vec = rng.integers(0, 6, size=(80, 2))
+    padded = np.column_stack([np.full(80, 18), vec, np.full(80, -3)])
+    assert algo._skyline(padded) == algo._skyline(vec)
+    assert algo._skyline(np.full((5, 3), 2)) == [0]
+
+
+def test_pareto_front_of_schedules(make_problem):
+    problem = make_problem(60, n_courses=10)
+    found = algo.generate_schedules(problem, 12, limit=10**6, top_k=False)
+    front = algo.pareto_front(found, problem)
+    counts = algo._priority_counter(problem)
+    metrics = algo.schedule_metrics(found)
+    vec = np.array(
+        [
+            [
+                sum(c << (6 * (4 - i)) for i, c in enumerate(counts(sc))),
+                sc.total_credits,
+                -metrics["days"][k],
+                -metrics["gap"][k],
+            ]
+            for k, sc in enumerate(found)
+        ]
+    )
+    assert 0 < len(front) < len(found)
+    assert {id(sc) for sc in front} == {id(found[i]) for i in brute_force_skyline(vec)}
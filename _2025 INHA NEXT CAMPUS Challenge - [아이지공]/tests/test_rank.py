@@ -0,0 +1,33 @@
+import math
+
+import pytest
+
+from app import algorithm as algo
+
+
+@pytest.fixture
+def schedules(make_problem):
+    problem = make_problem(70, n_courses=10)
+    return algo.generate_schedules(problem, 12, limit=10**6, top_k=False)
+
+
+def test_rank_orders_by_weighted_metrics(schedules):
+    weights = {"days": 1.0, "gap": 0.05}
+    ranked = algo.rank_schedules(schedules, weights)
+    metrics = algo.schedule_metrics(ranked)
+    score = [metrics["days"][i] + 0.05 * metrics["gap"][i] for i in range(len(ranked))]
+    assert score == sorted(score)
+    assert sorted(map(id, ranked)) == sorted(map(id, schedules))
+
+
+@pytest.mark.parametrize("w", [math.nan, math.inf, -math.inf])
+def test_rank_rejects_non_finite_weights(schedules, w):
+    with pytest.raises(ValueError):
+        algo.rank_schedules(schedules, {"days": 1.0, "gap": w})
+    with pytest.raises(ValueError):
+        algo.rank_schedules([], {"gap": w})
+
+
+def test_rank_rejects_unknown_objective(schedules):
+    with pytest.raises(ValueError):
+        algo.rank_schedules(schedules, {"nope": 1.0})
@@ -0,0 +1,115 @@
+import os
+
+import pytest
+
+from app import algorithm as algo
+from conftest import write_subject
+
+
+def ids(schedules):
+    return [[s.file_id for s in sc.sections] for sc in schedules]
+
+
+@pytest.fixture
+def problem(data_dir, make_problem):
+    return make_problem(3, n_courses=9)
+
+
+def test_repeat_call_hits_cache(problem):
+    first = algo.generate_schedules_cached(problem, 9, limit=10)
+    assert first.metrics is not None
+    again = algo.generate_schedules_cached(problem, 9, limit=10)
+    assert again.metrics is None
+    assert ids(again) == ids(first)
+    assert algo.schedule_cache_stats()["hits"] >= 1
+    # 사본이라 호출자가 속성을 붙여도 캐시는 그대로
+    assert again[0] is not first[0]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"ordering": "static"},
+        {"ordering": "mrv"},
+        {"top_k": False},
+        {"candidates": 3},
+        {"catalog_version": -1},
+        {"blocked_mask": algo.time_window_mask(free_days=[0])},
+        {"objective": {"days": 1.0}},
+        {"pareto": True},
+    ],
+)
+def test_result_affecting_arguments_are_in_key(problem, options):
+    base = algo._schedule_cache_key(problem, 9, None, 10)
+    fields = ("blocked_mask", "objective", "pareto", "ordering", "top_k")
+    fields += ("candidates", "catalog_version")
+    args = [
+        options.get(name, default)
+        for name, default in zip(fields, (0, None, False, "auto", True, None, None))
+    ]
+    assert algo._schedule_cache_key(problem, 9, None, 10, *args) != base
+
+
+def test_worker_count_is_not_in_key(problem):
+    # 병렬 탐색도 같은 결과이므로 worker 수가 달라도 같은 항목을 재사용
+    algo.generate_schedules_cached(problem, 9, limit=10)
+    hits = algo.schedule_cache_stats()["hits"]
+    algo.generate_schedules_cached(problem, 9, limit=10, workers=2)
+    assert algo.schedule_cache_stats()["hits"] == hits + 1
+
+
+def test_cached_call_matches_uncached_for_each_option(problem):
+    top = algo.generate_schedules_cached(problem, 9, limit=3)
+    first_found = algo.generate_schedules(problem, 9, limit=3, top_k=False)
+    assert ids(first_found) != ids(top)
+    for options in ({"top_k": False}, {"ordering": "static", "top_k": False}):
+        cached = algo.generate_schedules_cached(problem, 9, limit=3, **options)
+        direct = algo.generate_schedules(problem, 9, limit=3, **options)
+        assert ids(cached) == ids(direct)
+
+
+def test_partial_results_are_not_cached(data_dir, make_problem):
+    # 중단 확인은 _STOP_CHECK_EVERY 노드마다라서 그보다 큰 문제로
+    problem = make_problem(4, n_courses=30, max_sections=4)
+    token = algo.SearchCancelToken()
+    token.cancel()
+    result = algo.generate_schedules_cached(problem, 18, limit=10, cancel_token=token)
+    assert result.partial
+    assert algo.schedule_cache_stats()["size"] == 0
+
+
+def test_catalog_reload_invalidates(problem, data_dir):
+    algo.load_catalog()
+    algo.generate_schedules_cached(problem, 9, limit=10)
+    assert algo.schedule_cache_stats()["size"] == 1
+    key = algo._schedule_cache_key(problem, 9, None, 10)
+
+    subject = data_dir / "subject_json"
+    st = subject.stat()
+    write_subject(subject, "AIE1003.001.json", "금1,2:R", credit=1)
+    os.utime(subject, ns=(st.st_atime_ns, st.st_mtime_ns))
+    algo.load_catalog()
+    assert algo.schedule_cache_stats()["size"] == 0
+    assert algo._schedule_cache_key(problem, 9, None, 10) != key
+
+
+def test_snapshot_version_is_used_for_key(problem, data_dir):
+    # by_priority를 만든 뒤 카탈로그가 바뀌면 옛 스냅샷 버전으로 저장돼야 함
+    snapshot = algo.load_catalog()
+    subject = data_dir / "subject_json"
+    st = subject.stat()
+    write_subject(subject, "AIE1003.001.json", "금1,2:R", credit=1)
+    os.utime(subject, ns=(st.st_atime_ns, st.st_mtime_ns))
+    algo.load_catalog()
+    assert algo.get_catalog().version != snapshot.version
+
+    algo.generate_schedules_cached(
+        problem, 9, limit=10, catalog_version=snapshot.version
+    )
+    stale = algo._schedule_cache_key(
+        problem, 9, None, 10, catalog_version=snapshot.version
+    )
+    assert algo._SCHEDULE_CACHE.get(stale) is not None
+    assert (
+        algo._SCHEDULE_CACHE.get(algo._schedule_cache_key(problem, 9, None, 10)) is None
+    )
@@ -0,0 +1,158 @@
+import pytest
+
+from app import algorithm as algo
+from conftest import brute_force_schedules, expand_alternatives, make_section
+
+EVERYTHING = 10**6
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("core", [None, 3])
+def test_exhaustive_search_matches_brute_force(make_problem, seed, core):
+    problem = make_problem(80 + seed, n_courses=8)
+    found = algo.generate_schedules(
+        problem, 12, core, limit=EVERYTHING, ordering="static", top_k=False
+    )
+    expected = brute_force_schedules(problem, 12, core).get(12, set())
+    assert expand_alternatives(found) == expected
+
+
+def test_unreachable_target_uses_nearest_credits():
+    # 학점 조합 (3, 3, 2)로 7학점은 못 만듦 -> 6학점과 8학점 모두
+    problem = {
+        1: [make_section("A.001.json", "월1,2:R", 3)],
+        2: [
+            make_section("B.001.json", "화1,2:R", 3),
+            make_section("C.001.json", "수1,2:R", 2),
+        ],
+    }
+    found = algo.generate_schedules(problem, 7, limit=EVERYTHING, top_k=False)
+    assert sorted(sc.total_credits for sc in found) == [6, 8]
+    found = algo.generate_schedules(problem, 10, limit=EVERYTHING, top_k=False)
+    assert [sc.total_credits for sc in found] == [8]
+
+
+def all_courses_credits(by_priority):
+    credit = {}
+    for secs in by_priority.values():
+        for s in secs:
+            credit[s.course_id] = max(credit.get(s.course_id, 0), s.credit)
+    return sum(credit.values())
+
+
+def test_target_blocked_by_conflicts_falls_back_to_nearest():
+    # 학점 조합으로는 6학점이지만 A와 B가 겹쳐서 만들 수 있는 것은 3학점뿐
+    problem = {
+        1: [
+            make_section("A.001.json", "월1,2:R"),
+            make_section("B.001.json", "월2,3:R"),
+        ]
+    }
+    for ordering in ("static", "mrv"):
+        found = algo.generate_schedules(problem, 6, limit=10, ordering=ordering)
+        assert sorted(sc.sections[0].file_id for sc in found) == [
+            "A.001.json",
+            "B.001.json",
+        ]
+        assert all(sc.total_credits == 3 for sc in found)
+    assert algo.count_schedules(problem, 6) == 2
+    assert len(list(algo.iter_schedules(problem, 6))) == 2
+
+
+@pytest.mark.parametrize("seed", range(8))
+@pytest.mark.parametrize("core", [None, 3])
+def test_fallback_matches_nearest_conflict_free_totals(make_problem, seed, core):
+    problem = make_problem(170 + seed, n_courses=8)
+    by_total = brute_force_schedules(problem, 0, core)
+    target = all_courses_credits(problem) - 2
+    if not by_total:
+        assert algo.generate_schedules(problem, target, core) == []
+        return
+    gap = min(abs(t - target) for t in by_total)
+    expected = set().union(*(v for t, v in by_total.items() if abs(t - target) == gap))
+    for ordering in ("static", "mrv"):
+        found = algo.generate_schedules(
+            problem, target, core, limit=EVERYTHING, ordering=ordering, top_k=False
+        )
+        assert expand_alternatives(found) == expected
+    assert algo.count_schedules(problem, target, core) == len(expected)
+
+
+def test_parallel_search_widens_too(make_problem, monkeypatch):
+    monkeypatch.setattr(algo, "_PARALLEL_MIN_SECTIONS", 0)
+    problem = make_problem(184, n_courses=8)
+    target = all_courses_credits(problem)
+    sequential = algo.generate_schedules(problem, target, limit=EVERYTHING)
+    try:
+        parallel = algo.generate_schedules(
+            problem, target, limit=EVERYTHING, ordering="static", workers=2
+        )
+    finally:
+        if algo._PLANNER_POOL is not None:
+            algo._PLANNER_POOL.shutdown()
+            algo._PLANNER_POOL = None
+    assert sequential and sequential[0].total_credits < target
+    assert expand_alternatives(parallel) == expand_alternatives(sequential)
+
+
+def test_unreachable_core_target_returns_nothing(make_problem):
+    problem = make_problem(91, n_courses=6)
+    core = sum(s.credit for s in problem[4]) + 1
+    assert algo.generate_schedules(problem, 12, core) == []
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("core", [None, 3])
+def test_mrv_finds_the_same_schedules_as_static(make_problem, seed, core):
+    problem = make_problem(100 + seed, n_courses=10)
+    static = algo.generate_schedules(
+        problem, 12, core, limit=EVERYTHING, ordering="static", top_k=False
+    )
+    mrv = algo.generate_schedules(
+        problem, 12, core, limit=EVERYTHING, ordering="mrv", top_k=False
+    )
+    assert expand_alternatives(mrv) == expand_alternatives(static)
+    assert len(mrv) == len(static)
+
+
+def test_mrv_top_k_matches_static_ranking(make_problem):
+    problem = make_problem(106, n_courses=14)
+    counts = algo._priority_counter(problem)
+    ranks = [
+        [
+            (counts(sc), sc.total_credits)
+            for sc in algo.generate_schedules(problem, 15, limit=20, ordering=o)
+        ]
+        for o in ("static", "mrv")
+    ]
+    assert ranks[0] == ranks[1]
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("k", [1, 5, 30])
+def test_top_k_matches_full_sort(make_problem, seed, k):
+    problem = make_problem(120 + seed, n_courses=12)
+    counts = algo._priority_counter(problem)
+    full = algo.generate_schedules(problem, 12, limit=EVERYTHING, top_k=False)
+    top = algo.generate_schedules(problem, 12, limit=k, top_k=True)
+    key = lambda sc: (counts(sc), sc.total_credits)
+    assert [key(sc) for sc in top] == [key(sc) for sc in full[:k]]
+    full_sets = {frozenset(s.file_id for s in sc.sections) for sc in full}
+    assert all(frozenset(s.file_id for s in sc.sections) in full_sets for sc in top)
+
+
+@pytest.mark.parametrize("ordering", ["static", "mrv", "anneal"])
+@pytest.mark.parametrize("limit", [0, -1])
+def test_non_positive_limit_returns_nothing(make_problem, ordering, limit):
+    problem = make_problem(11, n_courses=8)
+    for top_k in (True, False):
+        found = algo.generate_schedules(
+            problem, 12, limit=limit, ordering=ordering, top_k=top_k
+        )
+        assert list(found) == []
+    assert list(algo.iter_schedules(problem, 12, limit=limit)) == []
+    # 탐색기를 직접 써도 빈 힙을 읽지 않음
+    search = algo._build_schedule_search(
+        problem, 12, None, limit, ordering, True, None, None, 0
+    )
+    assert search.run() == []
@@ -0,0 +1,33 @@
+import copy
+
+from app import algorithm as algo
+from conftest import make_section, write_subject
+
+
+def test_section_is_slotted():
+    s = make_section("A.001.json", "월1,2:R")
+    assert not hasattr(s, "__dict__")
+
+
+def test_sid_is_stable_per_file_id():
+    a = make_section("A.001.json", "월1,2:R")
+    b = make_section("A.001.json", "화1,2:R", prof="다른 교수")
+    c = make_section("A.002.json", "월1,2:R")
+    assert a.sid == b.sid == algo.section_id("A.001.json")
+    assert a.sid != c.sid
+    assert a == b and hash(a) == hash(b)
+    assert a != c
+    assert copy.copy(a) == a
+    assert len({a, b, c}) == 2
+
+
+def test_parsed_sections_share_time_data(data_dir):
+    subject = data_dir / "subject_json"
+    write_subject(subject, "AIE1004.001.json", "월1,2,3:R101")
+    a = algo._parse_section_file(subject / "AIE1001.001.json")
+    b = algo._parse_section_file(subject / "AIE1004.001.json")
+    assert a.time_raw is b.time_raw
+    assert a.meetings is b.meetings
+    assert a.mask == b.mask != 0
+    assert a.prof is b.prof
+    assert algo._parse_section_file(subject / "NOPE.001.json") is None
@@ -0,0 +1,45 @@
+import threading
+import time
+
+from app import algorithm as algo
+
+
+def key(schedule):
+    return frozenset(s.file_id for s in schedule.sections)
+
+
+def test_stream_yields_the_same_schedules_as_generate(make_problem):
+    problem = make_problem(31, n_courses=10)
+    streamed = list(algo.iter_schedules(problem, 12, limit=10**6, ordering="static"))
+    generated = algo.generate_schedules(problem, 12, limit=10**6, top_k=False)
+    assert streamed
+    assert len({key(sc) for sc in streamed}) == len(streamed)
+    assert {key(sc) for sc in streamed} == {key(sc) for sc in generated}
+
+
+def test_stream_respects_limit(make_problem):
+    problem = make_problem(31, n_courses=10)
+    assert len(list(algo.iter_schedules(problem, 12, limit=3))) == 3
+
+
+def test_stream_stops_when_token_is_cancelled(make_problem):
+    # 연결 끊김 토큰처럼 poll 콜백으로 취소
+    problem = make_problem(32, n_courses=200, max_sections=4)
+    disconnected = threading.Event()
+    token = algo.SearchCancelToken(poll=disconnected.is_set, poll_interval=0.0)
+    stream = algo.iter_schedules(problem, 24, limit=10**6, cancel_token=token)
+    next(stream)
+    disconnected.set()
+    started = time.monotonic()
+    rest = sum(1 for _ in stream)
+    assert time.monotonic() - started < 5
+    assert rest < 10**6
+
+
+def test_closing_stream_stops_search_thread(make_problem):
+    problem = make_problem(32, n_courses=200, max_sections=4)
+    before = threading.active_count()
+    stream = algo.iter_schedules(problem, 24, limit=10**6)
+    next(stream)
+    stream.close()
+    assert threading.active_count() == before
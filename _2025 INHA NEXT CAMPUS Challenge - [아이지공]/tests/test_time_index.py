@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from app import algorithm as algo
+
+
+def random_section(rng, name):
+    times = []
+    for _ in range(rng.randint(1, 3)):
+        start = rng.randrange(540, 1200, 15)
+        t = algo.TimeSlot(rng.choice(algo.DAYS), start, start + rng.choice([50, 75]))
+        # 한 분반 안의 시간끼리는 겹치지 않음
+        if not any(t.overlaps(u) for u in times):
+            times.append(t)
+    return algo.Section(name, "P", times)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_time_index_matches_pairwise_overlap(seed):
+    rng = random.Random(seed)
+    index = algo.TimeIndex()
+    placed = []
+    for k in range(60):
+        sec = random_section(rng, f"S{k}")
+        expected = not algo.no_conflict(placed, sec)
+        assert index.conflicts(sec) == expected
+        if not expected:
+            index.add(sec)
+            placed.append(sec)
+    # 되돌리면 다시 들어갈 수 있음
+    for sec in placed[::2]:
+        index.remove(sec)
+        assert not index.conflicts(sec)
+    rest = placed[1::2]
+    for k in range(60):
+        sec = random_section(rng, f"R{k}")
+        assert index.conflicts(sec) == (not algo.no_conflict(rest, sec))
+
+
+def test_touching_slots_do_not_overlap():
+    index = algo.TimeIndex()
+    index.add(algo.Section("A", "P", [algo.make_slot("Mon", "09:00", "10:15")]))
+    assert not index.conflicts(
+        algo.Section("B", "P", [algo.make_slot("Mon", "10:15", "11:30")])
+    )
+    assert index.conflicts(
+        algo.Section("C", "P", [algo.make_slot("Mon", "10:00", "10:30")])
+    )
+
+
+def test_add_and_remove_validate_and_copy_is_independent():
+    sec = algo.Section("A", "P", [algo.make_slot("Tue", "09:00", "10:15")])
+    index = algo.TimeIndex()
+    index.add(sec)
+    with pytest.raises(ValueError):
+        index.add(sec)
+    clone = index.copy()
+    index.remove(sec)
+    with pytest.raises(ValueError):
+        index.remove(sec)
+    assert clone.conflicts(sec)
+    assert not index.conflicts(sec)
@@ -0,0 +1,41 @@
+import pytest
+
+from app import algorithm as algo
+from conftest import brute_force_schedules, expand_alternatives, make_section
+
+
+def test_time_window_mask_bits():
+    mask = algo.time_window_mask(blocked=[(1, 3, 5)])
+    assert mask == make_section("A.001.json", "화3,4:R").mask
+    friday = algo.time_window_mask(free_days=[4])
+    assert friday == ((1 << algo._SLOTS_PER_DAY) - 1) << (4 * algo._SLOTS_PER_DAY)
+    assert not friday & make_section("A.001.json", "목1,2,3:R").mask
+    assert friday & make_section("A.001.json", "금18:R").mask
+    assert algo.time_window_mask() == 0
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_blocked_mask_matches_prefiltered_problem(make_problem, seed):
+    problem = make_problem(150 + seed, n_courses=9)
+    blocked = algo.time_window_mask(blocked=[(0, 1, 7)], free_days=[2])
+    allowed = {
+        p: [s for s in secs if not s.mask & blocked] for p, secs in problem.items()
+    }
+    found = algo.generate_schedules(
+        problem, 9, limit=10**6, top_k=False, blocked_mask=blocked
+    )
+    expected = brute_force_schedules(allowed, 9).get(9, set())
+    assert expected and expected != brute_force_schedules(problem, 9)[9]
+    assert expand_alternatives(found) == expected
+    assert algo.count_schedules(problem, 9, blocked_mask=blocked) == len(expected)
+    for sc in found:
+        assert not any(s.mask & blocked for s in sc.sections)
+
+
+def test_web_sections_survive_any_window():
+    problem = {
+        1: [make_section("W.001.json", "웹강의"), make_section("A.001.json", "월1,2:R")]
+    }
+    everything = algo.time_window_mask(free_days=range(5))
+    found = algo.generate_schedules(problem, 3, blocked_mask=everything)
+    assert [[s.file_id for s in sc.sections] for sc in found] == [["W.001.json"]]
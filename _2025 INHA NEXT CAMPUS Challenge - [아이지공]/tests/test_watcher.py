@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from app import algorithm as algo
+from conftest import write_subject
+
+
+def wait_for_new_catalog(old, timeout=5.0):
+    started = time.monotonic()
+    while algo.get_catalog() is old and time.monotonic() - started < timeout:
+        time.sleep(0.02)
+    return algo.get_catalog()
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watcher_reloads_on_new_and_edited_files(data_dir, use_inotify):
+    subject = data_dir / "subject_json"
+    old = algo.load_catalog()
+    watcher = algo.start_catalog_watcher(
+        dirs=[subject], interval=0.05, debounce=0.1, use_inotify=use_inotify
+    )
+    assert algo.start_catalog_watcher() is watcher
+
+    write_subject(subject, "AIE1005.001.json", "목5,6:R")
+    new = wait_for_new_catalog(old)
+    assert new is not old
+    assert algo.section_by_file_id("AIE1005.001.json").credit == 3
+    assert "AIE1005.001.json" not in old.by_file
+
+    # 같은 파일을 제자리에서 고쳐도 다시 읽음
+    write_subject(subject, "AIE1005.001.json", "목5,6:R", credit=2)
+    edited = wait_for_new_catalog(new)
+    assert edited is not new
+    assert algo.section_by_file_id("AIE1005.001.json").credit == 2
+    assert new.by_file["AIE1005.001.json"].credit == 3
+    assert watcher.reloads >= 2
+
+
+def test_watcher_debounces_burst_of_writes(data_dir):
+    subject = data_dir / "subject_json"
+    algo.load_catalog()
+    watcher = algo.start_catalog_watcher(
+        dirs=[subject], interval=0.05, debounce=0.3, use_inotify=False
+    )
+    for k in range(5):
+        write_subject(subject, f"AIE2000.{k + 1:03d}.json", "금1,2:R")
+        time.sleep(0.05)
+    started = time.monotonic()
+    while watcher.reloads == 0 and time.monotonic() - started < 5:
+        time.sleep(0.02)
+    time.sleep(0.5)
+    assert watcher.reloads == 1
+    assert len(algo.sections_for_course("AIE2000")) == 5
+
+
+def test_stopped_watcher_no_longer_reloads(data_dir):
+    subject = data_dir / "subject_json"
+    algo.load_catalog()
+    algo.start_catalog_watcher(dirs=[subject], interval=0.05, debounce=0.05)
+    algo.stop_catalog_watcher()
+    old = algo.get_catalog()
+    write_subject(subject, "AIE1005.001.json", "목5,6:R")
+    time.sleep(0.3)
+    assert algo.get_catalog() is old